@@ -21,6 +21,7 @@ async def websocket_ping(websocket: WebSocket):
         await websocket.close(code=1011)
 
 @app_router.websocket("/ws/transcribe/{lang}")
+@app_router.websocket("/ws/transcribe/{room}/{lang}")
 async def handle_lang_transcription_websocket(
         websocket: WebSocket,
         lang: str,
@@ -37,4 +38,21 @@ async def handle_lang_transcription_websocket(
         logger.error(f"Error handling websocket for language {lang}: {e}")
         await websocket.close(code=1011)  # Code for internal server error
 
+@app_router.websocket("/ws/audio/{room}")
+async def handle_room_audio_websocket(
+        websocket: WebSocket,
+        real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
+) -> None:
+    """Receive audio for a room created with the "stream" source, in the format given at creation."""
+    await websocket.accept()
+    try:
+        while True:
+            chunk = await websocket.receive_bytes()
+            if not real_time_translation.feed_audio(chunk):
+                logger.warning(f"Room {real_time_translation.room} does not accept streamed audio. Closing WebSocket.")
+                await websocket.close(code=1003)
+                return
+    except WebSocketDisconnect:
+        logger.info(f"Audio source of room {real_time_translation.room} disconnected")
+
 app_router.include_router(http_router)
\ No newline at end of file
@@ -1,24 +1,81 @@
 import os
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional
 
+from fastapi import HTTPException
 from starlette.templating import Jinja2Templates
 
 from app.services.realtime_translation import RealTimeTranslation
+from app.services.room_manager import RoomManager, DEFAULT_ROOM
+from app.services.shared_resources import SharedResources
+from app.services.status_bus import StatusBus
 from app.utils import generate_version
 from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
-from app.config import TRANSLATOR_TYPE
+from app.config import TRANSLATOR_TYPE, MAX_ROOMS, MAX_CONCURRENT_TRANSLATIONS, MAX_CONCURRENT_TTS, TTS_CACHE_SIZE, \
+    LATENCY_BUDGET_SECONDS, QUEUE_BUDGET_SECONDS, OVERLOAD_HOLD_SECONDS, MAX_CLIENTS, MAX_CLIENTS_PER_LANGUAGE, \
+    MAX_LANGUAGES_PER_ROOM, TRANSLATION_MEMORY_SIZE, TRANSLATION_MEMORY_THRESHOLD, GLOSSARY_PATH, LOOP_STALL_THRESHOLD
+from app.services.loop_watchdog import LoopWatchdog
+from app.services.overload_controller import OverloadController
 from app.services.tts.text_to_speech import GoogleTextToSpeech
+from app.services.translators.translation_memory import TranslationMemory, glossary_segments, read_glossary
 from app.services.translators.translator_openai import OpenAITranslator
 
 
 def get_open_ai_translator() -> OpenAITranslator:
     return OpenAITranslator()
 
+@lru_cache(maxsize=None)
 def get_text_to_speech() -> GoogleTextToSpeech:
     return GoogleTextToSpeech()
 
-def get_real_time_translation() -> RealTimeTranslation:
-    return RealTimeTranslation(translator_type=TRANSLATOR_TYPE, tts=get_text_to_speech())
+def get_translation_memory() -> Optional[TranslationMemory]:
+    if TRANSLATION_MEMORY_SIZE <= 0 and not GLOSSARY_PATH:
+        return None
+    glossary = read_glossary(GLOSSARY_PATH) if GLOSSARY_PATH else None
+    max_entries = TRANSLATION_MEMORY_SIZE
+    if max_entries <= 0:
+        # The memory is off: it only holds the glossary, every slot is pinned and nothing is learned
+        max_entries = glossary_segments(glossary)
+    translation_memory = TranslationMemory(max_entries=max_entries, threshold=TRANSLATION_MEMORY_THRESHOLD)
+    if glossary is not None:
+        translation_memory.load_glossary(GLOSSARY_PATH, glossary)
+    return translation_memory
+
+@lru_cache(maxsize=None)
+def get_shared_resources() -> SharedResources:
+    return SharedResources(
+        translator_type=TRANSLATOR_TYPE,
+        tts=get_text_to_speech(),
+        max_concurrent_translations=MAX_CONCURRENT_TRANSLATIONS,
+        max_concurrent_tts=MAX_CONCURRENT_TTS,
+        tts_cache_size=TTS_CACHE_SIZE,
+        overload=OverloadController(
+            latency_budget=LATENCY_BUDGET_SECONDS,
+            queue_budget=QUEUE_BUDGET_SECONDS,
+            hold_seconds=OVERLOAD_HOLD_SECONDS,
+            max_clients=MAX_CLIENTS,
+            max_clients_per_language=MAX_CLIENTS_PER_LANGUAGE,
+            max_languages_per_room=MAX_LANGUAGES_PER_ROOM
+        ),
+        translation_memory=get_translation_memory()
+    )
+
+def get_room_manager() -> RoomManager:
+    return RoomManager(resources=get_shared_resources(), max_rooms=MAX_ROOMS)
+
+def get_real_time_translation(room: str = DEFAULT_ROOM) -> RealTimeTranslation:
+    """Room from the ``{room}`` path parameter, the default room on the single-room routes."""
+    real_time_translation = get_room_manager().get_room(room)
+    if real_time_translation is None:
+        raise HTTPException(status_code=404, detail=f"Room {room} not found")
+    return real_time_translation
+
+def get_status_bus() -> StatusBus:
+    return StatusBus()
+
+@lru_cache(maxsize=None)
+def get_loop_watchdog() -> LoopWatchdog:
+    return LoopWatchdog(stall_threshold=LOOP_STALL_THRESHOLD)
 
 def get_ws_broadcast_manager() -> WebSocketBroadcastManager:
     return WebSocketBroadcastManager()
@@ -35,4 +92,4 @@ def get_static_file_versions_for_index_page() -> Dict[str, str]:
 def get_static_file_versions_for_admin_page() -> Dict[str, str]:
     js_file_version = generate_version(os.path.join('/app/static/js/', 'settings.js'))
     css_file_version = generate_version(os.path.join('/app/static/css/', 'styles.css'))
-    return {"js_file_version": js_file_version, "css_file_version": css_file_version}
\ No newline at end of file
+    return {"js_file_version": js_file_version, "css_file_version": css_file_version}
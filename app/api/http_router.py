@@ -1,14 +1,25 @@
-from fastapi import Request, APIRouter, Depends
-from fastapi.responses import HTMLResponse, JSONResponse
+import asyncio
+import json
+from typing import Literal
+
+from fastapi import Request, APIRouter, Depends, Query
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from sse_starlette.sse import EventSourceResponse
 from starlette.templating import Jinja2Templates
 
 from app.services.realtime_translation import RealTimeTranslation
 from app.api.dependencies import get_real_time_translation, get_jinja_template, get_static_file_versions_for_index_page, \
-    get_static_file_versions_for_admin_page, get_ws_broadcast_manager, get_text_to_speech
+    get_static_file_versions_for_admin_page, get_ws_broadcast_manager, get_text_to_speech, get_room_manager, \
+    get_status_bus, get_loop_watchdog
+from app.config import PROFILE_MAX_SECONDS
+from app.services.loop_watchdog import LoopWatchdog, sample_profile
+from app.services.room_manager import RoomManager
+from app.services.status_bus import StatusBus
+from app.services.transcribers.audio_normalizer import AudioFormat
 from app.utils import logger
 
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.services.tts.text_to_speech import GoogleTextToSpeech
 from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
@@ -17,8 +28,21 @@ from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
 class LangRequest(BaseModel):
     lang: str
 
+class RoomRequest(BaseModel):
+    source: Literal["microphone", "stream"] = "stream"
+    sample_rate: int = Field(16000, ge=8000, le=192000)
+    channels: int = Field(1, ge=1, le=8)
+    sample_format: Literal["int16", "float32"] = "int16"
+
+class ReplayRequest(BaseModel):
+    session: str
+    speed: float = 1.0
+
 router = APIRouter()
 
+# One profile at a time, sampling is not free
+profile_lock = asyncio.Lock()
+
 @router.get("/")
 async def render_index_page(
         request: Request,
@@ -51,12 +75,16 @@ async def render_settings_page(
         return HTMLResponse(content="settings.html not found", status_code=404)
 
 @router.post("/api/addLang")
+@router.post("/api/rooms/{room}/addLang")
 async def api_add_language_to_transcription_worker(
     lang_request: LangRequest,
     real_time_translation: RealTimeTranslation = Depends(get_real_time_translation),
     ws_broadcast_manager: WebSocketBroadcastManager = Depends(get_ws_broadcast_manager)
 ) -> JSONResponse:
     lang = lang_request.lang
+    rejection = real_time_translation.language_rejection(lang)
+    if rejection:
+        return JSONResponse(content={"transcriber_status": "error", "message": rejection}, status_code=429)
     if await real_time_translation.add_language(lang, ws_broadcast_manager):
         data = {"transcriber_status": "success", "message": f"Language {lang} added."}
     else:
@@ -65,6 +93,7 @@ async def api_add_language_to_transcription_worker(
     return JSONResponse(content=data, status_code=200)
 
 @router.post("/api/start")
+@router.post("/api/rooms/{room}/start")
 async def api_start_transcription_worker(
     real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
 ) -> JSONResponse:
@@ -73,6 +102,7 @@ async def api_start_transcription_worker(
     return JSONResponse(content=data, status_code=200)
 
 @router.post("/api/stop")
+@router.post("/api/rooms/{room}/stop")
 async def api_stop_transcription_worker(
     real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
 ) -> JSONResponse:
@@ -80,7 +110,27 @@ async def api_stop_transcription_worker(
     data = {"status": "ok", "transcriber_status": "success", "message": f"Worker stopped!"}
     return JSONResponse(content=data, status_code=200)
 
+@router.post("/api/replay")
+@router.post("/api/rooms/{room}/replay")
+async def api_replay_session(
+    replay_request: ReplayRequest,
+    real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
+) -> JSONResponse:
+    try:
+        started = await real_time_translation.replay(replay_request.session, speed=replay_request.speed)
+    except FileNotFoundError:
+        return JSONResponse(content={"status": "error", "message": f"No recording {replay_request.session}."},
+                            status_code=404)
+    except ValueError:
+        return JSONResponse(content={"status": "error", "message": f"{replay_request.session} is not a recording."},
+                            status_code=400)
+    if not started:
+        return JSONResponse(content={"status": "error", "message": "Recording is not configured."}, status_code=400)
+    data = {"status": "ok", "message": f"Replaying {replay_request.session} at {replay_request.speed}x"}
+    return JSONResponse(content=data, status_code=200)
+
 @router.get("/api/state_json")
+@router.get("/api/rooms/{room}/state_json")
 # API Endpoints for system state and worker management
 async def api_get_system_state(
     real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
@@ -90,6 +140,90 @@ async def api_get_system_state(
     return JSONResponse(
         content={"status": "ok", "transcriber_status": transcriber_status["status"], "message": transcriber_status["message"]})
 
+@router.get("/api/stats")
+@router.get("/api/rooms/{room}/stats")
+async def api_get_pipeline_stats(
+    real_time_translation: RealTimeTranslation = Depends(get_real_time_translation)
+) -> JSONResponse:
+    return JSONResponse(content={"status": "ok", **real_time_translation.get_stats()})
+
+@router.get("/api/admin/loop")
+async def api_get_loop_stats(
+    watchdog: LoopWatchdog = Depends(get_loop_watchdog)
+) -> JSONResponse:
+    """Event loop lag and the stacks captured during recent stalls."""
+    return JSONResponse(content={"status": "ok", **watchdog.get_stats()})
+
+@router.get("/api/admin/profile")
+async def api_profile_threads(
+    seconds: float = Query(5, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(5, ge=1, le=1000)
+) -> PlainTextResponse:
+    """
+    Sample the stacks of all threads for ``seconds`` and return collapsed stacks, e.g. for
+    ``flamegraph.pl profile.collapsed > profile.svg`` or speedscope.
+    """
+    if profile_lock.locked():
+        return PlainTextResponse("A profile is already running.", status_code=409)
+    async with profile_lock:
+        collapsed = await asyncio.to_thread(sample_profile, seconds, interval_ms / 1000)
+    return PlainTextResponse(collapsed,
+                             headers={"Content-Disposition": 'attachment; filename="profile.collapsed"'})
+
+@router.get("/api/rooms")
+async def api_list_rooms(
+    room_manager: RoomManager = Depends(get_room_manager)
+) -> JSONResponse:
+    return JSONResponse(content={"status": "ok", "rooms": room_manager.list_rooms(), **room_manager.get_stats()})
+
+@router.post("/api/rooms/{room}")
+async def api_create_room(
+    room: str,
+    room_request: RoomRequest,
+    room_manager: RoomManager = Depends(get_room_manager)
+) -> JSONResponse:
+    input_format = AudioFormat(room_request.sample_rate, room_request.channels, room_request.sample_format)
+    if room_manager.create_room(room, source=room_request.source, input_format=input_format) is None:
+        return JSONResponse(content={"status": "error", "message": f"Room limit reached, room {room} not created."},
+                            status_code=429)
+    return JSONResponse(content={"status": "ok", "message": f"Room {room} ready."}, status_code=200)
+
+@router.delete("/api/rooms/{room}")
+async def api_remove_room(
+    room: str,
+    room_manager: RoomManager = Depends(get_room_manager)
+) -> JSONResponse:
+    if not await room_manager.remove_room(room):
+        return JSONResponse(content={"status": "error", "message": f"Room {room} cannot be removed."},
+                            status_code=404)
+    return JSONResponse(content={"status": "ok", "message": f"Room {room} removed."}, status_code=200)
+
+@router.get("/api/events")
+async def api_status_events(
+    request: Request,
+    status_bus: StatusBus = Depends(get_status_bus),
+    room_manager: RoomManager = Depends(get_room_manager)
+) -> EventSourceResponse:
+    """Push operator status changes as Server-Sent Events, starting with the recent history."""
+    queue = status_bus.subscribe()
+    status_bus.ensure_sampler(room_manager.sample_status)
+
+    async def event_stream():
+        try:
+            last_id = 0
+            for event in status_bus.recent():
+                last_id = event["id"]
+                yield {"id": str(event["id"]), "event": event["kind"], "data": json.dumps(event)}
+            while not await request.is_disconnected():
+                event = await queue.get()
+                if event["id"] <= last_id:  # Already sent with the history
+                    continue
+                yield {"id": str(event["id"]), "event": event["kind"], "data": json.dumps(event)}
+        finally:
+            status_bus.unsubscribe(queue)
+
+    return EventSourceResponse(event_stream())
+
 @router.get("/api/languages")
 def get_languages(
         text_to_speech: GoogleTextToSpeech = Depends(get_text_to_speech)
@@ -6,9 +6,56 @@ from app.services.translators.translator import TranslatorType
 load_dotenv()
 
 ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
+ASSEMBLYAI_BASE_URL = os.getenv("ASSEMBLYAI_BASE_URL")
+ASR_RECONNECT_BASE_DELAY = float(os.getenv("ASR_RECONNECT_BASE_DELAY", 0.5))
+ASR_RECONNECT_MAX_DELAY = float(os.getenv("ASR_RECONNECT_MAX_DELAY", 15))
+ASR_AUDIO_RING_SECONDS = float(os.getenv("ASR_AUDIO_RING_SECONDS", 30))
+
+VAD_ENABLED = os.getenv("VAD_ENABLED", "false").lower() in ("1", "true", "yes")
+VAD_ENERGY_THRESHOLD_DB = float(os.getenv("VAD_ENERGY_THRESHOLD_DB", -45))
+VAD_HANGOVER_SECONDS = float(os.getenv("VAD_HANGOVER_SECONDS", 1.0))
+VAD_PRE_ROLL_SECONDS = float(os.getenv("VAD_PRE_ROLL_SECONDS", 0.3))
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
 OPEN_AI_KEY = os.getenv("OPEN_AI_KEY")
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4-turbo")
+OPENAI_CONTEXT_MAX_TOKENS = int(os.getenv("OPENAI_CONTEXT_MAX_TOKENS", 300))
+OPENAI_CONTEXT_CACHE_FLOOR = os.getenv("OPENAI_CONTEXT_CACHE_FLOOR", "false").lower() in ("1", "true", "yes")
+
+PIPELINE_MAX_IN_FLIGHT = int(os.getenv("PIPELINE_MAX_IN_FLIGHT", 4))
+PIPELINE_UTTERANCE_TIMEOUT = float(os.getenv("PIPELINE_UTTERANCE_TIMEOUT", 15))
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", 20))
+
+SEGMENT_MERGE_WINDOW = float(os.getenv("SEGMENT_MERGE_WINDOW", 1.2))
+SEGMENT_MIN_CHARS = int(os.getenv("SEGMENT_MIN_CHARS", 25))
+SEGMENT_MAX_CHARS = int(os.getenv("SEGMENT_MAX_CHARS", 240))
+
+MAX_ROOMS = int(os.getenv("MAX_ROOMS", 64))
+MAX_CONCURRENT_TRANSLATIONS = int(os.getenv("MAX_CONCURRENT_TRANSLATIONS", 32))
+MAX_CONCURRENT_TTS = int(os.getenv("MAX_CONCURRENT_TTS", 16))
+TTS_CACHE_SIZE = int(os.getenv("TTS_CACHE_SIZE", 1024))
+TRANSLATION_MEMORY_SIZE = int(os.getenv("TRANSLATION_MEMORY_SIZE", 0))  # 0 disables the memory
+TRANSLATION_MEMORY_THRESHOLD = float(os.getenv("TRANSLATION_MEMORY_THRESHOLD", 0.85))
+GLOSSARY_PATH = os.getenv("GLOSSARY_PATH")
+
+LATENCY_BUDGET_SECONDS = float(os.getenv("LATENCY_BUDGET_SECONDS", 4))
+QUEUE_BUDGET_SECONDS = float(os.getenv("QUEUE_BUDGET_SECONDS", 1))
+OVERLOAD_HOLD_SECONDS = float(os.getenv("OVERLOAD_HOLD_SECONDS", 5))
+MAX_CLIENTS = int(os.getenv("MAX_CLIENTS", 5000))
+MAX_CLIENTS_PER_LANGUAGE = int(os.getenv("MAX_CLIENTS_PER_LANGUAGE", 500))
+MAX_LANGUAGES_PER_ROOM = int(os.getenv("MAX_LANGUAGES_PER_ROOM", 8))
+
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", 0.25))
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Hot-path log categories, e.g. "broadcast=0.01,utterance=0.1" (fraction kept)
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "broadcast=0.01,context=0.1")
+# e.g. "ws.connect=20,ws.disconnect=20" (records per second)
+LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "ws.connect=20,ws.disconnect=20,ws.send_error=5,ws.error=5")
+
+RECORDINGS_DIR = os.getenv("RECORDINGS_DIR")
 
 WORK_DIR = os.getenv("WORK_DIR")
 UVICORN_HOST = os.getenv("UVICORN_HOST")
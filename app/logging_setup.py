@@ -0,0 +1,163 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Attributes every LogRecord has; anything else was passed through ``extra`` and is a field
+STANDARD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def parse_settings(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse ``"category=value,category=value"`` settings, e.g. ``"broadcast=0.1,ws.connect=20"``.
+    """
+    settings = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            category, number = item.split("=", 1)
+            settings[category.strip()] = float(number)
+    return settings
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line with the message and the structured fields of the record
+    (room, lang, seq, stage, category, ...).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class CategoryThrottle(logging.Filter):
+    def __init__(self, sampling: Dict[str, float], rate_limits: Dict[str, float]):
+        """
+        Per-category sampling and rate limiting of records logged with ``extra={"category": ...}``.
+
+        Records without a category always pass. The number of records dropped since the last
+        one that passed is attached to it as ``suppressed``.
+
+        :param sampling: Fraction of records kept per category; every n-th record is kept.
+        :param rate_limits: Maximum records per second per category, as a token bucket with
+            a burst of one second.
+        """
+        super().__init__()
+        self.sampling = sampling
+        self.rate_limits = rate_limits
+        self.counters: Dict[str, int] = {}
+        self.tokens: Dict[str, float] = {}
+        self.refilled_at: Dict[str, float] = {}
+        self.suppressed: Dict[str, int] = {}
+        self.mutex = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None or (category not in self.sampling and category not in self.rate_limits):
+            return True
+
+        with self.mutex:
+            keep = self._sample(category) and self._take_token(category)
+            if not keep:
+                self.suppressed[category] = self.suppressed.get(category, 0) + 1
+                return False
+            suppressed = self.suppressed.pop(category, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+    def _sample(self, category: str) -> bool:
+        rate = self.sampling.get(category)
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+        count = self.counters.get(category, 0)
+        self.counters[category] = count + 1
+        return count % round(1 / rate) == 0
+
+    def _take_token(self, category: str) -> bool:
+        limit = self.rate_limits.get(category)
+        if limit is None:
+            return True
+        now = time.monotonic()
+        tokens = self.tokens.get(category, limit)
+        tokens = min(limit, tokens + (now - self.refilled_at.get(category, now)) * limit)
+        self.refilled_at[category] = now
+        if tokens < 1:
+            self.tokens[category] = tokens
+            return False
+        self.tokens[category] = tokens - 1
+        return True
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Hands records to the writer thread; only the message arguments are merged on the
+    calling thread, formatting happens on the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: str = "INFO",
+                  log_format: str = "json",
+                  sampling: Optional[str] = None,
+                  rate_limits: Optional[str] = None) -> None:
+    """
+    Route all logging through a queue to a background thread writing to stderr.
+
+    :param level: Root log level.
+    :param log_format: "json" for one JSON object per line, "text" for the classic format.
+    :param sampling: Per-category sampling, e.g. ``"broadcast=0.1"``.
+    :param rate_limits: Per-category records per second, e.g. ``"ws.disconnect=20"``.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+
+    records: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = BackgroundQueueHandler(records)
+    queue_handler.addFilter(CategoryThrottle(parse_settings(sampling), parse_settings(rate_limits)))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    _listener = QueueListener(records, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -1,13 +1,27 @@
 # main.py
 
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
 from app.api import app_router
+from app.api.dependencies import get_loop_watchdog, get_shared_resources
 from app.config import UVICORN_HOST, UVICORN_PORT, WORK_DIR
 
-app = FastAPI(title="RealTime-transcription", version="1.0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    watchdog = get_loop_watchdog()
+    watchdog.start()
+    overload = get_shared_resources().overload
+    overload.start()
+    yield
+    overload.stop()
+    watchdog.stop()
+
+app = FastAPI(title="RealTime-transcription", version="1.0.1", lifespan=lifespan)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
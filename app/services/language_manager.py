@@ -25,10 +25,19 @@ class LanguageBroadcastManager:
         else:
             logger.info(f"Broadcasting is already running for language {self.lang}")
 
-    async def stop(self):
-        """Method to stop broadcasting messages and cancel the task."""
+    async def stop(self, drain_timeout: float = 0):
+        """
+        Method to stop broadcasting messages and cancel the task.
+
+        :param drain_timeout: Seconds to keep broadcasting until the queued messages are sent.
+        """
         if self.broadcast_task:
+            if drain_timeout and not self.broadcast_task.done():
+                await self.ws_broadcast_manager.drain(drain_timeout)
             await self.ws_broadcast_manager.stop_message_broadcasting()  # Stop broadcasting messages
+            if drain_timeout:
+                # Let the message being sent go out before cancelling
+                await asyncio.wait({self.broadcast_task}, timeout=2)
             self.broadcast_task.cancel()  # Cancel the broadcast task
             logger.info(f"Broadcasting stopped for language {self.lang}")
         else:
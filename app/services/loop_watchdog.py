@@ -0,0 +1,145 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Deque, List, Optional
+
+from app.services.status_bus import StatusBus
+from app.utils import logger
+
+
+class LoopWatchdog:
+    def __init__(self,
+                 interval: float = 0.05,
+                 stall_threshold: float = 0.25,
+                 max_stalls: int = 20):
+        """
+        Measure the event loop lag and capture what blocks the loop.
+
+        A heartbeat task on the loop wakes up every ``interval`` seconds and records how late
+        it was. A watchdog thread checks the heartbeat; once it is older than ``stall_threshold``
+        the stack of the loop thread is taken with ``sys._current_frames()`` while the loop
+        is still blocked, so it shows the blocking call itself.
+
+        :param interval: Heartbeat period in seconds.
+        :param stall_threshold: Loop blocked for longer than this is a stall, in seconds.
+        :param max_stalls: Number of recent stalls (with their stacks) kept.
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+
+        self.lags: Deque[float] = deque(maxlen=1024)
+        self.stalls: Deque[dict] = deque(maxlen=max_stalls)
+        self.beat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.heartbeat_task: Optional[asyncio.Task] = None
+        self.watchdog_thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.status_bus = StatusBus()
+        self.stats = {"stalls": 0, "max_lag_seconds": 0.0, "stalled_seconds": 0.0}
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self.heartbeat_task is not None and not self.heartbeat_task.done():
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.beat = time.monotonic()
+        self.stop_event.clear()
+        self.heartbeat_task = asyncio.create_task(self._heartbeat())
+        self.watchdog_thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.watchdog_thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.heartbeat_task:
+            self.heartbeat_task.cancel()
+        if self.watchdog_thread:
+            self.watchdog_thread.join(timeout=1)
+
+    def get_stats(self) -> dict:
+        lags = sorted(self.lags)
+        return {
+            **self.stats,
+            "lag_p50_seconds": lags[len(lags) // 2] if lags else 0.0,
+            "lag_p99_seconds": lags[int(len(lags) * 0.99)] if lags else 0.0,
+            "recent_stalls": list(self.stalls),
+        }
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(now - expected, 0.0)
+            self.beat = now
+            self.lags.append(lag)
+            if lag > self.stats["max_lag_seconds"]:
+                self.stats["max_lag_seconds"] = lag
+
+    def _watch(self):
+        stall = None
+        while not self.stop_event.wait(self.interval / 2):
+            blocked = time.monotonic() - self.beat - self.interval
+            if blocked > self.stall_threshold:
+                if stall is None:
+                    stall = self._capture(blocked)
+                stall["seconds"] = round(blocked, 3)
+            elif stall is not None:
+                self._stall_ended(stall)
+                stall = None
+
+    def _capture(self, blocked: float) -> dict:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = traceback.format_stack(frame) if frame is not None else []
+        stall = {"time": time.time(), "seconds": round(blocked, 3), "stack": "".join(stack)}
+        self.stalls.append(stall)
+        self.stats["stalls"] += 1
+        logger.warning("Event loop blocked for more than %.2fs in:\n%s", blocked, stall["stack"],
+                       extra={"stage": "loop", "category": "loop.stall"})
+        return stall
+
+    def _stall_ended(self, stall: dict):
+        self.stats["stalled_seconds"] += stall["seconds"]
+        # The leaf frame is enough for the operator view, the full stack is in the stats
+        last_frame = stall["stack"].strip().splitlines()[-2:] if stall["stack"] else []
+        self.status_bus.publish("loop", {"stall_seconds": stall["seconds"],
+                                         "where": " ".join(line.strip() for line in last_frame)})
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f"{code.co_name} ({filename}:{frame.f_lineno})".replace(";", ":")
+
+
+def sample_profile(seconds: float, interval: float = 0.005) -> str:
+    """
+    Sample the stacks of all threads for ``seconds`` and return them in the collapsed-stack
+    format of flame graph tools: one ``thread;outer;...;inner count`` line per distinct stack.
+
+    Blocks the calling thread; run it with ``asyncio.to_thread``.
+
+    :param seconds: Duration of the profile.
+    :param interval: Seconds between two samples.
+    """
+    own_thread = threading.get_ident()
+    counts: Counter = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+            labels: List[str] = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(thread_id, f"thread-{thread_id}").replace(";", ":").replace(" ", "_"))
+            counts[";".join(reversed(labels))] += 1
+        time.sleep(interval)
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Deque, Dict, Optional, Tuple
+
+from app.services.status_bus import StatusBus
+from app.utils import logger
+
+# WebSocket close code "Try Again Later" sent to rejected listeners
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class DegradationLevel(IntEnum):
+    NORMAL = 0
+    SKIP_LATE_TTS = 1  # No speech for utterances that are already late
+    TEXT_ONLY = 2  # No speech at all
+    COALESCE = 3  # Text only, and short finals are merged more aggressively
+
+
+class OverloadController:
+    def __init__(self,
+                 latency_budget: float = 4.0,
+                 queue_budget: float = 1.0,
+                 window: float = 10.0,
+                 hold_seconds: float = 5.0,
+                 recover_ratio: float = 0.5,
+                 coalesce_factor: float = 3.0,
+                 max_clients: int = 5000,
+                 max_clients_per_language: int = 500,
+                 max_languages_per_room: int = 8,
+                 evaluate_interval: float = 1.0):
+        """
+        Process-wide admission control and stepwise degradation under overload.
+
+        End-to-end lag (transcript to broadcast) and the time calls wait for a translation or
+        TTS slot are compared with their budgets over a sliding window. While the 90th
+        percentile of any of them is over budget, the service degrades one level every
+        ``hold_seconds``; once all of them are below ``recover_ratio`` of the budget it
+        recovers one level every ``2 * hold_seconds``. The level is re-evaluated with every
+        observation and, once ``start`` was called, every ``evaluate_interval`` seconds, so
+        the service also recovers when no more observations come in.
+
+        :param latency_budget: Acceptable end-to-end lag in seconds.
+        :param queue_budget: Acceptable wait for a translation or TTS slot in seconds.
+        :param window: Seconds of observations taken into account.
+        :param hold_seconds: Minimum time between two degradation steps.
+        :param recover_ratio: Fraction of the budgets the load must drop below to recover.
+        :param coalesce_factor: Multiplier of the segmenter merge window and minimum length
+            at the COALESCE level.
+        :param max_clients: Listener connections accepted by the process.
+        :param max_clients_per_language: Listener connections accepted per room language.
+        :param max_languages_per_room: Languages one room may translate into.
+        :param evaluate_interval: Seconds between two evaluations of the background task.
+        """
+        self.budgets = {"lag": latency_budget, "translation": queue_budget, "tts": queue_budget}
+        self.window = window
+        self.hold_seconds = hold_seconds
+        self.recover_ratio = recover_ratio
+        self.coalesce = coalesce_factor
+        self.max_clients = max_clients
+        self.max_clients_per_language = max_clients_per_language
+        self.max_languages_per_room = max_languages_per_room
+        self.evaluate_interval = evaluate_interval
+
+        self.samples: Dict[str, Deque[Tuple[float, float]]] = {
+            signal: deque(maxlen=512) for signal in self.budgets
+        }
+        self._level = DegradationLevel.NORMAL
+        self.changed_at = float("-inf")
+        self.pressure = 0.0
+        self.clients = 0
+        self.clients_lock = threading.Lock()
+        self.evaluate_task: Optional[asyncio.Task] = None
+        self.status_bus = StatusBus()
+
+        self.stats = {"degradations": 0, "recoveries": 0, "clients_rejected": 0, "languages_rejected": 0,
+                      "tts_skipped": 0}
+
+    def start(self):
+        """Re-evaluate the level periodically on the running loop."""
+        if self.evaluate_task is None or self.evaluate_task.done():
+            self.evaluate_task = asyncio.create_task(self._evaluate_periodically())
+
+    def stop(self):
+        if self.evaluate_task:
+            self.evaluate_task.cancel()
+            self.evaluate_task = None
+
+    def observe(self, signal: str, seconds: float):
+        """
+        Record one observation of ``signal``: "lag", "translation" or "tts".
+        """
+        self.samples[signal].append((time.monotonic(), seconds))
+        self._evaluate()
+
+    @property
+    def level(self) -> DegradationLevel:
+        return self._level
+
+    def skip_tts(self, age: float) -> bool:
+        """
+        Whether speech should be skipped for an utterance transcribed ``age`` seconds ago.
+        """
+        level = self.level
+        skip = level >= DegradationLevel.TEXT_ONLY or \
+            (level == DegradationLevel.SKIP_LATE_TTS and age > self.budgets["lag"] / 2)
+        if skip:
+            self.stats["tts_skipped"] += 1
+        return skip
+
+    def coalesce_factor(self) -> float:
+        return self.coalesce if self.level >= DegradationLevel.COALESCE else 1.0
+
+    def admit_client(self, language_clients: int) -> Optional[str]:
+        """
+        Check both listener limits and count the new listener in one step.
+
+        :param language_clients: Listeners already connected to the requested language.
+        :return: Reason to reject the listener, None when it is admitted and counted.
+        """
+        with self.clients_lock:
+            reason = None
+            if self.clients >= self.max_clients:
+                reason = f"Server is at its limit of {self.max_clients} listeners."
+            elif language_clients >= self.max_clients_per_language:
+                reason = f"Language is at its limit of {self.max_clients_per_language} listeners."
+            if reason:
+                self.stats["clients_rejected"] += 1
+                return reason
+            self.clients += 1
+            return None
+
+    def language_rejection(self, language_count: int) -> Optional[str]:
+        """
+        Reason to reject a new language for a room, None when it is admitted.
+        """
+        if language_count >= self.max_languages_per_room:
+            self.stats["languages_rejected"] += 1
+            return f"Room is at its limit of {self.max_languages_per_room} languages."
+        return None
+
+    def client_disconnected(self):
+        with self.clients_lock:
+            self.clients -= 1
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "level": self.level.name,
+            "pressure": round(self.pressure, 2),
+            "clients": self.clients,
+            "p90": {signal: round(self._percentile(signal), 3) for signal in self.samples},
+        }
+
+    async def _evaluate_periodically(self):
+        while True:
+            await asyncio.sleep(self.evaluate_interval)
+            self._evaluate()
+
+    def _evaluate(self):
+        now = time.monotonic()
+        for samples in self.samples.values():
+            while samples and samples[0][0] < now - self.window:
+                samples.popleft()
+        self.pressure = max(self._percentile(signal) / budget for signal, budget in self.budgets.items())
+
+        if self.pressure > 1 and self._level < DegradationLevel.COALESCE \
+                and now - self.changed_at >= self.hold_seconds:
+            self._set_level(DegradationLevel(self._level + 1), now)
+            self.stats["degradations"] += 1
+        elif self.pressure < self.recover_ratio and self._level > DegradationLevel.NORMAL \
+                and now - self.changed_at >= 2 * self.hold_seconds:
+            self._set_level(DegradationLevel(self._level - 1), now)
+            self.stats["recoveries"] += 1
+
+    def _set_level(self, level: DegradationLevel, now: float):
+        logger.warning(f"Overload level {self._level.name} -> {level.name} (pressure {self.pressure:.2f})")
+        self._level = level
+        self.changed_at = now
+        self.status_bus.publish("overload", {"level": level.name, "pressure": round(self.pressure, 2)})
+
+    def _percentile(self, signal: str, percentile: float = 0.9) -> float:
+        values = sorted(value for _, value in self.samples[signal])
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(len(values) * percentile))]
@@ -1,14 +1,30 @@
 from dataclasses import dataclass
+from datetime import datetime
 
 from fastapi import WebSocket
 import asyncio
-from typing import Dict
+import os
+import time
+from typing import Dict, Optional, Set
 
+from app.services.overload_controller import CLOSE_TRY_AGAIN_LATER
+from app.services.shared_resources import SharedResources
+from app.services.status_bus import StatusBus
+from app.services.transcribers.audio_normalizer import AudioFormat, AudioNormalizer
+from app.services.transcribers.audio_sources import AudioSourceFactory, QueueAudioSource, microphone_source
 from app.services.transcribers.transcriber import Transcriber
-from app.services.translators.translator import ITranslator, TranslatorFactory, TranslatorType
+from app.services.transcribers.voice_activity_gate import VoiceActivityGate
+from app.config import OPENAI_CONTEXT_MAX_TOKENS, OPENAI_MODEL, PIPELINE_MAX_IN_FLIGHT, PIPELINE_UTTERANCE_TIMEOUT, \
+    OPENAI_CONTEXT_CACHE_FLOOR, SEGMENT_MERGE_WINDOW, SEGMENT_MIN_CHARS, SEGMENT_MAX_CHARS, RECORDINGS_DIR, \
+    DRAIN_TIMEOUT, VAD_ENABLED, VAD_ENERGY_THRESHOLD_DB, VAD_HANGOVER_SECONDS, VAD_PRE_ROLL_SECONDS
+from app.services.recording.session_recorder import SessionRecorder
+from app.services.recording.session_replay import SessionReplay
+from app.services.translators.translator import ITranslator
+from app.services.translators.translation_context import TokenCounter, TranslationContext
 from app.services.language_manager import LanguageBroadcastManager
+from app.services.utterance_pipeline import UtterancePipeline
+from app.services.utterance_segmenter import UtteranceSegmenter
 from app.utils import logger
-from app.services.tts.text_to_speech import GoogleTextToSpeech
 from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
 
 @dataclass
@@ -17,59 +33,134 @@ class LanguageResources:
     translator: ITranslator
 
 class RealTimeTranslation:
-    _instance = None
-
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    MAX_TRACKED_UTTERANCES = 1024
 
     def __init__(self,
-                 translator_type: TranslatorType,
-                 tts: GoogleTextToSpeech
+                 room: str,
+                 resources: SharedResources,
+                 audio_source: Optional[AudioSourceFactory] = None,
+                 input_format: Optional[AudioFormat] = None
     ):
-        # Initialize services
-        if not hasattr(self, 'initialized'):  # Protecting from re-initialization
-            self.transcriber = Transcriber(sample_rate=16000, _handle_transcription=self._handle_transcription)
+        """
+        Translation session of one room: its own audio source, transcriber and languages.
+
+        :param room: Room name.
+        :param resources: Provider clients, caches and limits shared by all rooms.
+        :param audio_source: Audio source factory, the server microphone by default.
+        :param input_format: Format of the audio source when it is not 16 kHz mono PCM16.
+        """
+        self.room = room
+        self.resources = resources
+        self.audio_source = audio_source or microphone_source
 
-            self.translator_type = translator_type
-            self.tts = tts
+        # Short finals are merged and long ones split before they reach the pipeline
+        self.segmenter = UtteranceSegmenter(
+            self._handle_transcription,
+            merge_window=SEGMENT_MERGE_WINDOW,
+            min_chars=SEGMENT_MIN_CHARS,
+            max_chars=SEGMENT_MAX_CHARS,
+            calls_per_segment=lambda: 2 * len(self.lang_resources),  # translation + TTS
+            coalesce_factor=resources.overload.coalesce_factor
+        )
+
+        # Other rates, channel counts and sample formats are converted to what the ASR expects
+        self.normalizer: Optional[AudioNormalizer] = None
+        if input_format and input_format != AudioFormat():
+            self.normalizer = AudioNormalizer(self.audio_source, input_format)
+        transcriber_source = self.normalizer or self.audio_source
 
-            self.lang_resources: Dict[str, LanguageResources] = {}
+        # Optional voice activity gate, silence is not streamed to the ASR
+        self.voice_gate: Optional[VoiceActivityGate] = None
+        if VAD_ENABLED:
+            self.voice_gate = VoiceActivityGate(
+                transcriber_source,
+                energy_threshold_db=VAD_ENERGY_THRESHOLD_DB,
+                hangover_seconds=VAD_HANGOVER_SECONDS,
+                pre_roll_seconds=VAD_PRE_ROLL_SECONDS
+            )
+        self.transcriber = Transcriber(sample_rate=16000, _handle_transcription=self.segmenter.push,
+                                       audio_source=self.voice_gate or transcriber_source, room=room)
 
-            # Mark as initialized
-            self.initialized = True
+        # Source-side context shared by the translators of all languages
+        self.translation_context = TranslationContext(max_tokens=OPENAI_CONTEXT_MAX_TOKENS,
+                                                      token_counter=TokenCounter(OPENAI_MODEL),
+                                                      cache_floor=OPENAI_CONTEXT_CACHE_FLOOR)
+
+        # Utterances are translated concurrently and released per language in speech order
+        self.pipeline = UtterancePipeline(
+            self._translate_and_synthesize,
+            max_in_flight=PIPELINE_MAX_IN_FLIGHT,
+            utterance_timeout=PIPELINE_UTTERANCE_TIMEOUT
+        )
+
+        self.lang_resources: Dict[str, LanguageResources] = {}
+        # When each utterance was handed to the pipeline, to measure end-to-end lag
+        self.submitted_at: Dict[int, float] = {}
+
+        # Session recording, enabled when RECORDINGS_DIR is set
+        self.recorder: Optional[SessionRecorder] = None
+        self.replay_tasks: Set[asyncio.Task] = set()
 
     async def handle_websocket_connection(self, lang: str, websocket: WebSocket) -> bool:
         """
         Handle WebSocket connection for a specific language.
+
+        A listener over the process or language limit is closed with "Try Again Later".
         """
         if lang not in self.lang_resources:
             return False
 
         broadcast_manager = self.__get_broadcast_manager(lang)
-        await broadcast_manager.handle_connection(websocket)
+        overload = self.resources.overload
+        admitted = False
+
+        def admit(language_clients: int) -> Optional[str]:
+            nonlocal admitted
+            rejection = overload.admit_client(language_clients)
+            admitted = rejection is None
+            return rejection
+
+        try:
+            rejection = await broadcast_manager.handle_connection(websocket, admit=admit)
+        finally:
+            if admitted:
+                overload.client_disconnected()
+        if rejection:
+            logger.warning(f"Rejecting listener for language {lang}: {rejection}")
+            await websocket.accept()
+            await websocket.close(code=CLOSE_TRY_AGAIN_LATER, reason=rejection)
         return True
 
+    def language_rejection(self, lang: str) -> Optional[str]:
+        """
+        Reason to refuse adding ``lang``, None when it can be added.
+        """
+        if lang in self.lang_resources:
+            return None
+        return self.resources.overload.language_rejection(len(self.lang_resources))
+
     async def add_language(self, lang: str, ws_broadcast_manager: WebSocketBroadcastManager) -> bool:
         """
         Add a new language for translation and processing.
         """
         if lang not in self.lang_resources:
+            ws_broadcast_manager.log_fields.update(room=self.room, lang=lang)
+            ws_broadcast_manager.on_sent = self._on_sent
             lang_manager = LanguageBroadcastManager(lang, ws_broadcast_manager)
             await lang_manager.start_broadcasting()
 
-            translator_factory = TranslatorFactory()
-            translator_class = translator_factory.get_translator(self.translator_type)
+            translator = self.resources.create_translator()
+            translator.set_context(self.translation_context)
 
             self.lang_resources[lang] = LanguageResources(
                 broadcast_manager=lang_manager,
-                translator=translator_class()
+                translator=translator
             )
-            logger.info(f"Language {lang} added successfully.")
+            self.pipeline.add_language(lang, self._broadcast)
+            logger.info(f"Language {lang} added successfully to room {self.room}.")
             return True
 
-        logger.warning(f"Language {lang} already exists.")
+        logger.warning(f"Language {lang} already exists in room {self.room}.")
         return False
 
     async def start_working_tasks(self):
@@ -77,7 +168,12 @@ class RealTimeTranslation:
         Start all transcription and broadcasting tasks for each language.
         """
         logger.info("\033[33mStarting transcription and broadcasting tasks...\033[0m")
-        self.transcriber.start()
+        if RECORDINGS_DIR and self.recorder is None:
+            self.recorder = SessionRecorder(
+                os.path.join(RECORDINGS_DIR, f"{self.room}-{datetime.now():%Y%m%d-%H%M%S}")
+            )
+            await self.recorder.open()
+        await self.transcriber.start()
         for lang in self.lang_resources:
             language_manager = self.__get_language_manager(lang)
             await language_manager.start_broadcasting()
@@ -85,53 +181,190 @@ class RealTimeTranslation:
     async def stop_working_tasks(self):
         """
         Stop all transcription and broadcasting tasks.
+
+        Draining happens in order: the transcriber stops and hands over its last finals, the
+        segmenter and the pipeline finish what was already transcribed, and only then the
+        broadcast managers send their remaining messages and shut down.
         """
         logger.info("\033[33mStopping transcription and broadcasting tasks...\033[0m")
+        await self.transcriber.stop(drain=self._drain)
+
+        if self.recorder:
+            await self.recorder.close()
+            self.recorder = None
+
+    async def _drain(self):
+        await self.segmenter.flush()
+        try:
+            await asyncio.wait_for(self.pipeline.drain(), DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"Pipeline of room {self.room} did not drain within {DRAIN_TIMEOUT}s.")
+
         for lang in list(self.lang_resources.keys()):
             language_manager = self.__get_language_manager(lang)
-            await language_manager.stop()
+            await language_manager.stop(drain_timeout=DRAIN_TIMEOUT)
+        self.pipeline.clear()
         self.lang_resources.clear()
-        if self.transcriber:
-            self.transcriber.stop()
 
-    async def _handle_transcription(self, transcription_text: str):
+    async def replay(self, session: str, speed: float = 1.0) -> bool:
+        """
+        Replay a recorded session to the listeners of this room in the background.
+
+        The recording is opened before the background task starts, so a missing or invalid
+        one is reported to the caller.
+
+        :param session: Recording name inside RECORDINGS_DIR, without suffix.
+        :param speed: Playback speed, 0 replays as fast as possible.
+        :return: False if recording is not configured.
+        :raises FileNotFoundError: There is no such recording.
+        :raises ValueError: The files are not session recordings.
+        """
+        if not RECORDINGS_DIR:
+            return False
+        path = os.path.join(RECORDINGS_DIR, os.path.basename(session))
+        session_replay = SessionReplay(path)
+        await session_replay.open()
+        task = asyncio.create_task(
+            session_replay.play(self._enqueue, speed=speed, languages=set(self.lang_resources))
+        )
+        self.replay_tasks.add(task)
+        task.add_done_callback(self.replay_tasks.discard)
+        return True
+
+    def feed_audio(self, chunk: bytes) -> bool:
         """
-        Handle transcription and translation for each language.
+        Push PCM audio into the room when it is fed from outside the process.
+
+        :return: False if the room records from the server microphone.
         """
-        tasks = []
+        if not isinstance(self.audio_source, QueueAudioSource):
+            return False
+        self.audio_source.put(chunk)
+        return True
+
+    def get_languages(self):
+        return list(self.lang_resources.keys())
+
+    async def disconnect_clients(self):
+        """
+        Close the WebSocket connections of the listeners of every language.
+        """
+        await asyncio.gather(*(self.__get_broadcast_manager(lang).disconnect_clients()
+                               for lang in list(self.lang_resources)))
+
+    def sample_status(self, status_bus: StatusBus):
+        """
+        Publish queue depths and client counts of every language; only changes reach subscribers.
+        """
+        transcriber_stats = self.transcriber.get_stats()
+        status_bus.publish_if_changed("transcriber", "reconnects", {
+            "reconnects": transcriber_stats["reconnects"],
+            "last_gap_seconds": round(transcriber_stats["last_gap_seconds"], 2),
+        }, room=self.room)
+        pipeline_stats = self.pipeline.get_stats()
+        status_bus.publish_if_changed("pipeline", "in_flight", {"in_flight": pipeline_stats["in_flight"]},
+                                      room=self.room)
         for lang in self.lang_resources:
-            tasks.append(self._translate_and_broadcast(lang, transcription_text))
-        await asyncio.gather(*tasks)
+            broadcast_manager = self.__get_broadcast_manager(lang)
+            status_bus.publish_if_changed("queue", lang, {
+                "broadcast_queue": broadcast_manager.buffer.qsize(),
+                "reorder_buffer": pipeline_stats["reorder_depth"].get(lang, 0),
+            }, room=self.room)
+            status_bus.publish_if_changed("clients", lang, {"clients": len(broadcast_manager.active_clients)},
+                                          room=self.room)
+
+    def get_stats(self) -> dict:
+        """
+        Collect the metrics of the translation stages.
+        """
+        return {
+            "room": self.room,
+            "transcriber": self.transcriber.get_stats(),
+            "normalizer": self.normalizer.get_stats() if self.normalizer else None,
+            "vad": self.voice_gate.get_stats() if self.voice_gate else None,
+            "segmenter": self.segmenter.get_stats(),
+            "pipeline": self.pipeline.get_stats(),
+            "broadcast": {lang: self.__get_broadcast_manager(lang).get_stats() for lang in self.lang_resources},
+            "context": self.translation_context.get_stats(),
+        }
+
+    async def _handle_transcription(self, transcription_text: str):
+        """
+        Hand a final transcript to the pipeline, which translates it for each language.
+        """
+        # submit() assigns next_seq to this utterance before it yields
+        seq = self.pipeline.next_seq
+        if self.recorder:
+            self.recorder.record_utterance(seq, transcription_text)
+        self.submitted_at[seq] = time.monotonic()
+        while len(self.submitted_at) > self.MAX_TRACKED_UTTERANCES:
+            del self.submitted_at[next(iter(self.submitted_at))]
+        logger.info("Utterance %d submitted (%d chars)", seq, len(transcription_text),
+                    extra={"room": self.room, "seq": seq, "stage": "transcript", "category": "utterance"})
+        await self.pipeline.submit(transcription_text, on_complete=self._on_utterance_complete)
 
-    async def _translate_and_broadcast(self, lang: str, transcription_text: str):
+    def _on_utterance_complete(self, seq: int, transcription_text: str):
+        # The sentence becomes context only after every language has translated it; the
+        # pipeline calls this in speech order, so the context reads like the talk
+        self.translation_context.add_sentence(transcription_text)
+        self.translation_context.log_stats()
+
+    async def _translate_and_synthesize(self, lang: str, transcription_text: str, seq: int) -> dict:
         """
-        Translate text and send it through WebSocket.
+        Translate text and synthesize speech, returning the message to broadcast.
         """
         translator = self.__get_translator(lang)
 
-        translated_text = await translator.translate_text(
+        translated_text = await self.resources.translate(
+            translator,
             text=transcription_text,
             language_code=lang
         )
 
-        try:
-            audio_content = await self.tts.text_to_speech(
-                   text=translated_text,
-                   language_code=lang
-             )
-        except Exception as e:
-            audio_content = ""
-
-        message_data = {
+        audio_content = ""
+        if not self.resources.overload.skip_tts(self._age(seq)):
+            try:
+                audio_content = await self.resources.text_to_speech(
+                       text=translated_text,
+                       language_code=lang
+                 )
+            except Exception as e:
+                logger.warning("Speech synthesis failed: %s", e,
+                               extra={"room": self.room, "lang": lang, "seq": seq, "stage": "tts",
+                                      "category": "tts.error"})
+                audio_content = ""
+
+        return {
+            "seq": seq,
             "lang": lang,
             "original_text": transcription_text,
             "translated_text": translated_text,
             "audio_content": audio_content
         }
-        # message_json = json.dumps(message_data, ensure_ascii=False)
 
-        broadcast_manager = self.__get_broadcast_manager(lang)
-        await broadcast_manager.enqueue_message(message_data)
+    async def _broadcast(self, message: dict):
+        """
+        Release a message of the pipeline to the listeners, recording it on the way.
+        """
+        if self.recorder:
+            self.recorder.record_translation(message)
+        await self._enqueue(message)
+
+    def _on_sent(self, message: dict):
+        # Lag is taken once the listeners got the message, time in the broadcast queue included.
+        # Replayed messages have their own seq numbers and no lag.
+        if "replay" not in message:
+            self.resources.overload.observe("lag", self._age(message["seq"]))
+
+    def _age(self, seq: int) -> float:
+        """Seconds since the utterance was handed to the pipeline."""
+        submitted_at = self.submitted_at.get(seq)
+        return time.monotonic() - submitted_at if submitted_at is not None else 0.0
+
+    async def _enqueue(self, message: dict):
+        lang = message["lang"]
+        if lang in self.lang_resources:
+            await self.__get_broadcast_manager(lang).enqueue_message(message)
 
     def __get_broadcast_manager(self, lang: str) -> WebSocketBroadcastManager:
         return self.lang_resources[lang].broadcast_manager.ws_broadcast_manager
@@ -0,0 +1,127 @@
+import hashlib
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+LOG_SUFFIX = ".rtlog"
+BLOB_SUFFIX = ".rtblob"
+LOG_MAGIC = b"RTLOG1\n"
+BLOB_MAGIC = b"RTBLOB1\n"
+
+KIND_UTTERANCE = 1
+KIND_TRANSLATION = 2
+
+# kind, seq, seconds since session start, lang length, text length
+RECORD_HEADER = struct.Struct("<BIdBI")
+# digest, blob length
+BLOB_HEADER = struct.Struct("<16sI")
+DIGEST_SIZE = 16
+NO_AUDIO = bytes(DIGEST_SIZE)
+
+
+def audio_digest(audio: bytes) -> bytes:
+    return hashlib.blake2b(audio, digest_size=DIGEST_SIZE).digest()
+
+
+def encode_record(kind: int, seq: int, t: float, lang: str, text: str, digest: Optional[bytes] = None) -> bytes:
+    """
+    Encode one timeline record. Translation records end with the digest of their audio blob.
+    """
+    lang_bytes = lang.encode("utf-8")
+    text_bytes = text.encode("utf-8")
+    record = RECORD_HEADER.pack(kind, seq, t, len(lang_bytes), len(text_bytes)) + lang_bytes + text_bytes
+    if kind == KIND_TRANSLATION:
+        record += digest or NO_AUDIO
+    return record
+
+
+def encode_blob(digest: bytes, audio: bytes) -> bytes:
+    return BLOB_HEADER.pack(digest, len(audio)) + audio
+
+
+@dataclass
+class SessionRecord:
+    kind: int
+    seq: int
+    t: float
+    lang: str
+    text: str
+    digest: Optional[bytes] = None
+
+
+class SessionLog:
+    def __init__(self, path: str):
+        """
+        Read-only view of a recorded session, memory-mapped.
+
+        :param path: Session path without suffix, ``<path>.rtlog`` and ``<path>.rtblob`` are read.
+        :raises FileNotFoundError: There is no recording at ``path``.
+        :raises ValueError: The files are not session recordings.
+        """
+        if not os.path.exists(path + LOG_SUFFIX):
+            raise FileNotFoundError(f"No session recording at {path}")
+        self.path = path
+        self.log_map = self._map(path + LOG_SUFFIX, LOG_MAGIC)
+        self.blob_map = None
+        try:
+            self.blob_map = self._map(path + BLOB_SUFFIX, BLOB_MAGIC)
+        except ValueError:
+            self.close()
+            raise
+        self.blob_index: Dict[bytes, Tuple[int, int]] = self._index_blobs()
+
+    def records(self) -> Iterator[SessionRecord]:
+        """Iterate over complete records; a torn record at the end of the file is ignored."""
+        if self.log_map is None:
+            return
+        data = self.log_map
+        offset, end = len(LOG_MAGIC), len(data)
+        while offset + RECORD_HEADER.size <= end:
+            kind, seq, t, lang_len, text_len = RECORD_HEADER.unpack_from(data, offset)
+            body = offset + RECORD_HEADER.size
+            record_end = body + lang_len + text_len + (DIGEST_SIZE if kind == KIND_TRANSLATION else 0)
+            if record_end > end:
+                break
+            lang = data[body:body + lang_len].decode("utf-8")
+            text = data[body + lang_len:body + lang_len + text_len].decode("utf-8")
+            digest = data[record_end - DIGEST_SIZE:record_end] if kind == KIND_TRANSLATION else None
+            yield SessionRecord(kind, seq, t, lang, text, digest)
+            offset = record_end
+
+    def audio(self, digest: Optional[bytes]) -> bytes:
+        if not digest or digest == NO_AUDIO or digest not in self.blob_index:
+            return b""
+        offset, length = self.blob_index[digest]
+        return self.blob_map[offset:offset + length]
+
+    def close(self):
+        for mapped in (self.log_map, self.blob_map):
+            if mapped is not None:
+                mapped.close()
+
+    def _index_blobs(self) -> Dict[bytes, Tuple[int, int]]:
+        index = {}
+        if self.blob_map is None:
+            return index
+        offset, end = len(BLOB_MAGIC), len(self.blob_map)
+        while offset + BLOB_HEADER.size <= end:
+            digest, length = BLOB_HEADER.unpack_from(self.blob_map, offset)
+            body = offset + BLOB_HEADER.size
+            if body + length > end:
+                break
+            index[digest] = (body, length)
+            offset = body + length
+        return index
+
+    @staticmethod
+    def _map(file_path: str, magic: bytes) -> Optional[mmap.mmap]:
+        if not os.path.exists(file_path) or os.path.getsize(file_path) <= len(magic):
+            return None
+        with open(file_path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(magic)] != magic:
+            mapped.close()
+            raise ValueError(f"{file_path} is not a session recording")
+        return mapped
@@ -0,0 +1,136 @@
+import asyncio
+import base64
+import os
+import time
+from typing import Optional, Set
+
+from app.services.recording.session_log import (
+    BLOB_MAGIC, BLOB_SUFFIX, KIND_TRANSLATION, KIND_UTTERANCE, LOG_MAGIC, LOG_SUFFIX,
+    audio_digest, encode_blob, encode_record
+)
+from app.utils import logger
+
+
+class SessionRecorder:
+    def __init__(self,
+                 path: str,
+                 flush_interval: float = 1.0,
+                 flush_bytes: int = 1 << 20
+    ):
+        """
+        Append-only recording of one session.
+
+        Records are encoded into in-memory buffers on the event loop and written in bulk by a
+        worker thread every ``flush_interval`` seconds or once ``flush_bytes`` are pending.
+        The timeline goes to ``<path>.rtlog``, audio clips to the content-addressed
+        ``<path>.rtblob`` where every distinct clip is stored once.
+
+        :param path: Session path without suffix.
+        :param flush_interval: Seconds between background flushes.
+        :param flush_bytes: Pending bytes that trigger an early flush.
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+
+        self.started_at = time.monotonic()
+        self.log_buffer = bytearray()
+        self.blob_buffer = bytearray()
+        self.written_digests: Set[bytes] = set()
+
+        self.log_file = None
+        self.blob_file = None
+        self.flush_task: Optional[asyncio.Task] = None
+        self.flush_event = asyncio.Event()
+        self.closing = False
+        self.mutex_files = asyncio.Lock()
+
+    async def open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.log_file, self.blob_file = await asyncio.to_thread(self._open_files)
+        self.flush_task = asyncio.create_task(self._flush_periodically())
+        logger.info(f"Recording session to {self.path}")
+
+    def record_utterance(self, seq: int, text: str):
+        self._append_log(encode_record(KIND_UTTERANCE, seq, self._elapsed(), "", text))
+
+    def record_translation(self, message: dict):
+        """
+        Record a message exactly as it is handed to the broadcast managers.
+        """
+        digest = None
+        audio_content = message.get("audio_content")
+        if audio_content:
+            audio = base64.b64decode(audio_content)
+            digest = audio_digest(audio)
+            if digest not in self.written_digests:
+                self.written_digests.add(digest)
+                self.blob_buffer += encode_blob(digest, audio)
+
+        self._append_log(encode_record(
+            KIND_TRANSLATION, message.get("seq", 0), self._elapsed(),
+            message["lang"], message["translated_text"], digest
+        ))
+
+    async def flush(self):
+        async with self.mutex_files:
+            if not self.log_buffer and not self.blob_buffer:
+                return
+            log_chunk, self.log_buffer = self.log_buffer, bytearray()
+            blob_chunk, self.blob_buffer = self.blob_buffer, bytearray()
+            await asyncio.to_thread(self._write, log_chunk, blob_chunk)
+
+    async def close(self):
+        # Let the background task finish its last flush; cancelling it mid-write would let the
+        # files be closed while the worker thread is still writing to them
+        self.closing = True
+        if self.flush_task:
+            self.flush_event.set()
+            await self.flush_task
+            self.flush_task = None
+        await self.flush()
+        await asyncio.to_thread(self._close_files)
+        logger.info(f"Recording of {self.path} closed")
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def _append_log(self, record: bytes):
+        self.log_buffer += record
+        if len(self.log_buffer) + len(self.blob_buffer) >= self.flush_bytes:
+            self.flush_event.set()
+
+    async def _flush_periodically(self):
+        while not self.closing:
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_event.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Error writing session recording {self.path}: {e}")
+
+    def _open_files(self):
+        log_file = open(self.path + LOG_SUFFIX, "ab")
+        blob_file = open(self.path + BLOB_SUFFIX, "ab")
+        if log_file.tell() == 0:
+            log_file.write(LOG_MAGIC)
+        if blob_file.tell() == 0:
+            blob_file.write(BLOB_MAGIC)
+        return log_file, blob_file
+
+    def _write(self, log_chunk: bytes, blob_chunk: bytes):
+        # Blobs first, so a record never references audio that is not on disk yet
+        if blob_chunk:
+            self.blob_file.write(blob_chunk)
+            self.blob_file.flush()
+        if log_chunk:
+            self.log_file.write(log_chunk)
+            self.log_file.flush()
+
+    def _close_files(self):
+        for f in (self.log_file, self.blob_file):
+            if f:
+                f.close()
@@ -0,0 +1,82 @@
+import asyncio
+import base64
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from app.services.recording.session_log import KIND_TRANSLATION, KIND_UTTERANCE, SessionLog
+from app.utils import logger
+
+
+class SessionReplay:
+    def __init__(self, path: str):
+        """
+        Feed a recorded session back through a broadcast path.
+
+        :param path: Session path without suffix.
+        """
+        self.path = path
+        self.session_log: Optional[SessionLog] = None
+
+    async def open(self):
+        """
+        Map the recording, so a missing or invalid one is reported before playing.
+
+        :raises FileNotFoundError: There is no recording at the path.
+        :raises ValueError: The files are not session recordings.
+        """
+        if self.session_log is None:
+            self.session_log = await asyncio.to_thread(SessionLog, self.path)
+
+    async def play(self,
+                   broadcast_func: Callable[[dict], Awaitable[None]],
+                   speed: float = 1.0,
+                   languages: Optional[Set[str]] = None) -> int:
+        """
+        Replay the translations of the session, keeping the intervals between them; the first
+        replayed message is sent right away. Messages carry the session name in ``replay``,
+        their ``seq`` numbers restart from the recording's and may match live ones.
+
+        :param broadcast_func: Coroutine receiving each message, as ``enqueue_message`` would.
+        :param speed: Playback speed relative to the recording, 0 replays as fast as possible.
+        :param languages: Only replay these languages, all of them when None.
+        :return: Number of replayed messages.
+        """
+        await self.open()
+        session_log = self.session_log
+        session_name = os.path.basename(self.path)
+        originals: Dict[int, str] = {}
+        replayed = 0
+        started_at = time.monotonic()
+        first_t = None
+        try:
+            for record in session_log.records():
+                if record.kind == KIND_UTTERANCE:
+                    originals[record.seq] = record.text
+                    continue
+                if record.kind != KIND_TRANSLATION or (languages is not None and record.lang not in languages):
+                    continue
+
+                if first_t is None:
+                    first_t = record.t
+                if speed > 0:
+                    delay = (record.t - first_t) / speed - (time.monotonic() - started_at)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                audio = session_log.audio(record.digest)
+                await broadcast_func({
+                    "replay": session_name,
+                    "seq": record.seq,
+                    "lang": record.lang,
+                    "original_text": originals.get(record.seq, ""),
+                    "translated_text": record.text,
+                    "audio_content": base64.b64encode(audio).decode("utf-8") if audio else ""
+                })
+                replayed += 1
+        finally:
+            session_log.close()
+            self.session_log = None
+
+        logger.info(f"Replayed {replayed} messages from {self.path}")
+        return replayed
@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+
+from app.services.realtime_translation import RealTimeTranslation
+from app.services.shared_resources import SharedResources
+from app.services.status_bus import StatusBus
+from app.services.transcribers.audio_normalizer import AudioFormat
+from app.services.transcribers.audio_sources import QueueAudioSource
+from app.utils import logger
+
+DEFAULT_ROOM = "default"
+
+
+class RoomManager:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, resources: SharedResources, max_rooms: int = 64):
+        """
+        Registry of the translation rooms of this process.
+
+        :param resources: Provider clients, caches and limits shared by all rooms.
+        :param max_rooms: Maximum number of rooms that may exist at the same time.
+        """
+        if not hasattr(self, 'initialized'):  # Protecting from re-initialization
+            self.resources = resources
+            self.max_rooms = max_rooms
+            self.rooms: Dict[str, RealTimeTranslation] = {}
+
+            # The default room keeps the single-talk endpoints working on the server microphone
+            self.rooms[DEFAULT_ROOM] = RealTimeTranslation(DEFAULT_ROOM, resources)
+
+            # Mark as initialized
+            self.initialized = True
+
+    def get_room(self, room: str) -> Optional[RealTimeTranslation]:
+        return self.rooms.get(room)
+
+    def create_room(self,
+                    room: str,
+                    source: str = "stream",
+                    input_format: Optional[AudioFormat] = None) -> Optional[RealTimeTranslation]:
+        """
+        Create a room unless it already exists.
+
+        :param room: Room name.
+        :param source: "microphone" to record from the server, "stream" to receive audio
+            through the room's audio WebSocket.
+        :param input_format: Format of the streamed audio, 16 kHz mono PCM16 by default.
+        :return: The room, or None when the room limit is reached.
+        """
+        if room in self.rooms:
+            return self.rooms[room]
+        if len(self.rooms) >= self.max_rooms:
+            logger.warning(f"Room limit of {self.max_rooms} reached, not creating room {room}.")
+            return None
+
+        audio_source = QueueAudioSource() if source == "stream" else None
+        self.rooms[room] = RealTimeTranslation(room, self.resources, audio_source=audio_source,
+                                               input_format=input_format if source == "stream" else None)
+        logger.info(f"Room {room} created with {source} audio source.")
+        return self.rooms[room]
+
+    async def remove_room(self, room: str) -> bool:
+        if room == DEFAULT_ROOM:
+            return False
+        real_time_translation = self.rooms.pop(room, None)
+        if real_time_translation is None:
+            return False
+        # Listeners would otherwise stay connected to a room that no longer sends anything
+        await real_time_translation.disconnect_clients()
+        await real_time_translation.stop_working_tasks()
+        logger.info(f"Room {room} removed.")
+        return True
+
+    def list_rooms(self) -> List[dict]:
+        return [
+            {
+                "room": name,
+                "languages": room.get_languages(),
+                "transcriber_status": room.transcriber.get_status()["status"],
+            }
+            for name, room in self.rooms.items()
+        ]
+
+    def sample_status(self, status_bus: StatusBus):
+        status_bus.publish_if_changed("rooms", "rooms", {"rooms": sorted(self.rooms)})
+        for room in list(self.rooms.values()):
+            room.sample_status(status_bus)
+
+    def get_stats(self) -> dict:
+        return {
+            "room_count": len(self.rooms),
+            "shared": self.resources.get_stats(),
+        }
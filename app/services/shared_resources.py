@@ -0,0 +1,118 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from app.services.overload_controller import OverloadController
+from app.services.status_bus import StatusBus
+from app.services.translators.translation_memory import TranslationMemory
+from app.services.translators.translator import ITranslator, TranslatorFactory, TranslatorType
+from app.services.tts.text_to_speech import GoogleTextToSpeech
+
+
+class SharedResources:
+    def __init__(self,
+                 translator_type: TranslatorType,
+                 tts: GoogleTextToSpeech,
+                 translator_factory: Optional[Callable[[], ITranslator]] = None,
+                 max_concurrent_translations: int = 32,
+                 max_concurrent_tts: int = 16,
+                 tts_cache_size: int = 1024,
+                 overload: Optional[OverloadController] = None,
+                 translation_memory: Optional[TranslationMemory] = None
+    ):
+        """
+        Provider clients, caches and concurrency limits shared by every room of the process.
+
+        :param translator_type: Translator used when no ``translator_factory`` is given.
+        :param tts: Text-to-speech client shared by all rooms.
+        :param translator_factory: Callable creating a translator for one room language.
+        :param max_concurrent_translations: Upper bound of translation calls in flight.
+        :param max_concurrent_tts: Upper bound of TTS calls in flight.
+        :param tts_cache_size: Number of synthesized clips kept, keyed by language and text.
+        :param overload: Admission and degradation policy, fed with the time calls wait for a slot.
+        :param translation_memory: Earlier translations and glossary consulted before calling a
+            translator, and glossary terms given to translators that take instructions.
+        """
+        self.translator_type = translator_type
+        self.tts = tts
+        self.translator_factory = translator_factory
+
+        self.translation_limit = asyncio.Semaphore(max_concurrent_translations)
+        self.tts_limit = asyncio.Semaphore(max_concurrent_tts)
+
+        self.tts_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self.tts_cache_size = tts_cache_size
+
+        self.stats = {"translations": 0, "tts_calls": 0, "tts_cache_hits": 0,
+                      "translation_errors": 0, "tts_errors": 0}
+        self.status_bus = StatusBus()
+        self.overload = overload or OverloadController()
+        self.translation_memory = translation_memory
+
+    def create_translator(self) -> ITranslator:
+        if self.translator_factory:
+            translator = self.translator_factory()
+        else:
+            translator_class = TranslatorFactory().get_translator(self.translator_type)
+            translator = translator_class()
+        if self.translation_memory:
+            translator.set_glossary(self.translation_memory)
+        return translator
+
+    async def translate(self, translator: ITranslator, text: str, language_code: str) -> str:
+        if self.translation_memory:
+            translated_text = self.translation_memory.lookup(text, language_code)
+            if translated_text is not None:
+                return translated_text
+
+        queued_at = time.monotonic()
+        async with self.translation_limit:
+            self.overload.observe("translation", time.monotonic() - queued_at)
+            self.stats["translations"] += 1
+            try:
+                translated_text = await translator.translate_text(text=text, language_code=language_code)
+            except Exception as e:
+                self.stats["translation_errors"] += 1
+                self._publish_health("translation", False, str(e))
+                raise
+        self._publish_health("translation", True)
+        if self.translation_memory:
+            self.translation_memory.add(text, language_code, translated_text)
+        return translated_text
+
+    async def text_to_speech(self, text: str, language_code: str) -> str:
+        key = (language_code, text)
+        audio_content = self.tts_cache.get(key)
+        if audio_content is not None:
+            self.tts_cache.move_to_end(key)
+            self.stats["tts_cache_hits"] += 1
+            return audio_content
+
+        queued_at = time.monotonic()
+        async with self.tts_limit:
+            self.overload.observe("tts", time.monotonic() - queued_at)
+            self.stats["tts_calls"] += 1
+            try:
+                audio_content = await self.tts.text_to_speech(text=text, language_code=language_code)
+            except Exception as e:
+                self.stats["tts_errors"] += 1
+                self._publish_health("tts", False, str(e))
+                raise
+        self._publish_health("tts", True)
+
+        self.tts_cache[key] = audio_content
+        if len(self.tts_cache) > self.tts_cache_size:
+            self.tts_cache.popitem(last=False)
+        return audio_content
+
+    def _publish_health(self, provider: str, healthy: bool, error: str = ""):
+        self.status_bus.publish_if_changed("provider", provider, {"healthy": healthy, "error": error})
+
+    def get_stats(self) -> dict:
+        return {
+            **self.stats,
+            "tts_cache_entries": len(self.tts_cache),
+            "overload": self.overload.get_stats(),
+            "translation_memory": self.translation_memory.get_stats() if self.translation_memory else None,
+        }
@@ -0,0 +1,103 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from app.utils import logger
+
+
+class StatusBus:
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, history_size: int = 200, subscriber_queue_size: int = 256):
+        """
+        Process-wide bus of operator status events.
+
+        Events can be published from any thread; they are kept in a bounded ring of recent
+        events and pushed to every subscriber queue on the event loop.
+
+        :param history_size: Number of recent events kept for new subscribers.
+        :param subscriber_queue_size: Events buffered per subscriber before the oldest is dropped.
+        """
+        if not hasattr(self, 'initialized'):  # Protecting from re-initialization
+            self.history: Deque[dict] = deque(maxlen=history_size)
+            self.subscriber_queue_size = subscriber_queue_size
+            self.subscribers: Set[asyncio.Queue] = set()
+            self.last_values: Dict[Tuple[str, Optional[str], str], Any] = {}
+            self.event_ids = itertools.count(1)
+            self.loop: Optional[asyncio.AbstractEventLoop] = None
+            self.sampler_task: Optional[asyncio.Task] = None
+
+            # Mark as initialized
+            self.initialized = True
+
+    def publish(self, kind: str, data: dict, room: Optional[str] = None):
+        """
+        Publish an event.
+
+        :param kind: Event kind, e.g. "transcriber", "queue", "clients", "provider".
+        :param data: Event payload.
+        :param room: Room the event belongs to, if any.
+        """
+        event = {"id": next(self.event_ids), "time": time.time(), "kind": kind, "room": room, "data": data}
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if self.loop is None or running_loop is self.loop:
+            self._dispatch(event)
+        else:
+            self.loop.call_soon_threadsafe(self._dispatch, event)
+
+    def publish_if_changed(self, kind: str, key: str, data: dict, room: Optional[str] = None):
+        """
+        Publish only when ``data`` differs from the last value published for ``(kind, room, key)``,
+        so subscribers receive deltas instead of repeated snapshots.
+        """
+        state_key = (kind, room, key)
+        if self.last_values.get(state_key) == data:
+            return
+        self.last_values[state_key] = data
+        self.publish(kind, {"key": key, **data}, room=room)
+
+    def subscribe(self) -> asyncio.Queue:
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+
+    def recent(self, limit: Optional[int] = None) -> List[dict]:
+        events = list(self.history)
+        return events[-limit:] if limit else events
+
+    def ensure_sampler(self, sample_func: Callable[["StatusBus"], None], interval: float = 1.0):
+        """
+        Run ``sample_func`` every ``interval`` seconds while there are subscribers.
+        """
+        if self.sampler_task is None or self.sampler_task.done():
+            self.sampler_task = asyncio.create_task(self._sample(sample_func, interval))
+
+    async def _sample(self, sample_func: Callable[["StatusBus"], None], interval: float):
+        while self.subscribers:
+            try:
+                sample_func(self)
+            except Exception as e:
+                logger.error(f"Error sampling status: {e}")
+            await asyncio.sleep(interval)
+
+    def _dispatch(self, event: dict):
+        self.history.append(event)
+        for queue in list(self.subscribers):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
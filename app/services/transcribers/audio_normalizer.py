@@ -0,0 +1,225 @@
+import threading
+from dataclasses import dataclass
+from math import gcd
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+from app.services.transcribers.audio_sources import AudioSourceFactory, OpenedStream
+
+SAMPLE_FORMATS = {"int16": np.int16, "float32": np.float32}
+INT16_MAX = 32767.0
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    sample_rate: int = 16_000
+    channels: int = 1
+    sample_format: str = "int16"  # "int16" or "float32", interleaved little endian
+
+    @property
+    def bytes_per_frame(self) -> int:
+        return self.channels * np.dtype(SAMPLE_FORMATS[self.sample_format]).itemsize
+
+
+class PolyphaseResampler:
+    STRIDED_MAX_PHASES = 8
+
+    def __init__(self, input_rate: int, output_rate: int, zero_crossings: int = 16, max_block: int = 4096):
+        """
+        Streaming rational resampler by ``L / M`` with a Kaiser windowed sinc lowpass.
+
+        The filter is split into ``L`` phases of ``K`` taps. Outputs sharing a phase read the
+        input at a fixed stride of ``M``, so for small ``L`` each phase is one matrix-vector
+        product over a strided sliding window view of the input, without copying the windows.
+        For ratios like 44.1 kHz to 16 kHz (``L`` = 160) the windows and phases of a block are
+        gathered into reused buffers and multiplied in one pass instead. Input history and
+        output are kept in preallocated buffers.
+
+        :param input_rate: Input sample rate.
+        :param output_rate: Output sample rate.
+        :param zero_crossings: Sinc zero crossings on each side, trades quality for CPU.
+        :param max_block: Initial capacity in input samples, buffers grow for larger blocks.
+        """
+        divisor = gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+
+        # Lowpass at the upsampled rate, below the Nyquist frequency of the lower rate
+        cutoff = 0.5 / max(self.up, self.down) * 0.95
+        self.taps = int(np.ceil(2 * zero_crossings * max(self.up, self.down) / self.up))
+        length = self.taps * self.up
+        n = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, 8.0) * self.up
+        # phases[p, k] = h[p + k * L], reversed so it lines up with the sliding windows
+        self.phases = np.ascontiguousarray(prototype.reshape(self.taps, self.up).T[:, ::-1], dtype=np.float32)
+
+        self.history = self.taps - 1
+        self.input_position = 0  # Global index of the next input sample
+        self.output_position = 0  # Global index of the next output sample
+        self.samples = np.zeros(0, dtype=np.float32)
+        self.output = np.zeros(0, dtype=np.float32)
+        self._reserve(max_block)
+
+    def _reserve(self, block: int):
+        if self.samples.size >= self.history + block:
+            return
+        samples = np.zeros(self.history + block, dtype=np.float32)
+        samples[:self.history] = self.samples[:self.history] if self.samples.size else 0
+        self.samples = samples
+        outputs = block * self.up // self.down + 2
+        self.output = np.zeros(outputs, dtype=np.float32)
+        if self.up > self.STRIDED_MAX_PHASES:
+            self.output_index = np.arange(outputs, dtype=np.int64)
+            self.positions = np.zeros(outputs, dtype=np.int64)
+            self.phase_index = np.zeros(outputs, dtype=np.int64)
+            self.gathered = np.zeros((outputs, self.taps), dtype=np.float32)
+            self.coefficients = np.zeros((outputs, self.taps), dtype=np.float32)
+
+    def input_buffer(self, count: int) -> np.ndarray:
+        """Writable view for the next ``count`` input samples, right after the kept history."""
+        self._reserve(count)
+        return self.samples[self.history:self.history + count]
+
+    def process(self, count: int) -> np.ndarray:
+        """
+        Resample the ``count`` samples written to ``input_buffer``.
+
+        :return: View of the output buffer, valid until the next call.
+        """
+        start = self.input_position
+        end = start + count
+        # Output n reads the input up to floor(n * M / L); produce those that are available
+        first = self.output_position
+        last = (end * self.up - 1) // self.down + 1
+        produced = last - first
+
+        if produced > 0:
+            windows = np.lib.stride_tricks.sliding_window_view(self.samples[:self.history + count], self.taps)
+            output = self.output[:produced]
+            if self.up <= self.STRIDED_MAX_PHASES:
+                for offset in range(min(self.up, produced)):
+                    n = first + offset
+                    phase = (n * self.down) % self.up
+                    window = (n * self.down) // self.up - start
+                    outputs = output[offset::self.up]
+                    np.matmul(windows[window:window + len(outputs) * self.down:self.down], self.phases[phase],
+                              out=outputs)
+            else:
+                # Many phases with few outputs each: gather windows and phases into reused buffers
+                positions = np.multiply(self.output_index[:produced] + first, self.down, out=self.positions[:produced])
+                phases = np.remainder(positions, self.up, out=self.phase_index[:produced])
+                np.floor_divide(positions, self.up, out=positions)
+                positions -= start
+                gathered = np.take(windows, positions, axis=0, out=self.gathered[:produced])
+                coefficients = np.take(self.phases, phases, axis=0, out=self.coefficients[:produced])
+                np.einsum("ij,ij->i", gathered, coefficients, out=output)
+            self.output_position = last
+        else:
+            output = self.output[:0]
+
+        # Keep the last taps - 1 samples as history of the next block
+        self.samples[:self.history] = self.samples[count:count + self.history]
+        self.input_position = end
+        return output
+
+
+class AudioNormalizer:
+    def __init__(self, audio_source: AudioSourceFactory, input_format: AudioFormat, chunk_ms: int = 100):
+        """
+        Audio source wrapper converting any supported input to mono PCM16 chunks of fixed size.
+
+        Input chunks of any size are viewed with ``np.frombuffer``, downmixed into the
+        resampler's preallocated input buffer, resampled and written into a preallocated
+        chunk buffer. Only complete chunks leave the normalizer, as ``bytes`` since the
+        transcriber keeps them for replay.
+
+        :param audio_source: Wrapped audio source factory producing ``input_format`` audio.
+        :param input_format: Sample rate, channel count and sample format of the source.
+        :param chunk_ms: Duration of the produced chunks.
+        """
+        if input_format.sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format {input_format.sample_format}")
+        self.audio_source = audio_source
+        self.input_format = input_format
+        self.dtype = np.dtype(SAMPLE_FORMATS[input_format.sample_format]).newbyteorder("<")
+        self.scale = INT16_MAX if input_format.sample_format == "float32" else 1.0
+        self.chunk_ms = chunk_ms
+
+        self.resampler: Optional[PolyphaseResampler] = None
+        self.chunk = np.zeros(0, dtype=np.int16)
+        self.chunk_view = memoryview(b"")
+        self.chunk_fill = 0
+        self.remainder = bytearray()  # Bytes of an incomplete input frame
+        self.passthrough = np.zeros(0, dtype=np.float32)
+        self.stats = {"input_bytes": 0, "chunks_out": 0}
+
+    def __call__(self, sample_rate: int) -> Iterable[bytes]:
+        """Act as an audio source factory producing ``sample_rate`` mono PCM16."""
+        self.open(sample_rate)
+        return OpenedStream(self.audio_source(self.input_format.sample_rate), self._normalize)
+
+    def open(self, sample_rate: int):
+        if sample_rate != self.input_format.sample_rate:
+            self.resampler = PolyphaseResampler(self.input_format.sample_rate, sample_rate)
+        else:
+            self.resampler = None
+        self.chunk = np.zeros(sample_rate * self.chunk_ms // 1000, dtype=np.int16)
+        self.chunk_view = memoryview(self.chunk).cast("B")
+        self.chunk_fill = 0
+        self.remainder.clear()
+
+    def _normalize(self, stream: Iterable[bytes], interrupted: threading.Event) -> Iterator[bytes]:
+        for data in stream:
+            if interrupted.is_set():
+                return
+            yield from self.process(data)
+
+    def process(self, data: bytes) -> Iterator[bytes]:
+        """Convert one input chunk, yielding every output chunk it completes."""
+        self.stats["input_bytes"] += len(data)
+        bytes_per_frame = self.input_format.bytes_per_frame
+        if self.remainder or len(data) % bytes_per_frame:
+            # Input split inside a frame, the only case that copies the input
+            self.remainder += data
+            usable = len(self.remainder) - len(self.remainder) % bytes_per_frame
+            data = bytes(self.remainder[:usable])
+            del self.remainder[:usable]
+
+        frames = np.frombuffer(data, dtype=self.dtype).reshape(-1, self.input_format.channels)
+        count = len(frames)
+        if count == 0:
+            return
+
+        if self.resampler:
+            target = self.resampler.input_buffer(count)
+        else:
+            if self.passthrough.size < count:
+                self.passthrough = np.zeros(count, dtype=np.float32)
+            target = self.passthrough[:count]
+
+        if self.input_format.channels == 1:
+            np.multiply(frames[:, 0], self.scale, out=target, casting="unsafe")
+        else:
+            np.mean(frames, axis=1, dtype=np.float32, out=target)
+            if self.scale != 1.0:
+                target *= self.scale
+
+        samples = self.resampler.process(count) if self.resampler else target
+        np.clip(samples, -INT16_MAX - 1, INT16_MAX, out=samples)
+        np.rint(samples, out=samples)
+
+        position = 0
+        while position < len(samples):
+            take = min(len(self.chunk) - self.chunk_fill, len(samples) - position)
+            np.copyto(self.chunk[self.chunk_fill:self.chunk_fill + take], samples[position:position + take],
+                      casting="unsafe")
+            self.chunk_fill += take
+            position += take
+            if self.chunk_fill == len(self.chunk):
+                self.chunk_fill = 0
+                self.stats["chunks_out"] += 1
+                yield self.chunk_view.tobytes()
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "input_format": self.input_format.__dict__}
@@ -0,0 +1,76 @@
+import threading
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Tuple
+
+
+class AudioRingBuffer:
+    def __init__(self, max_bytes: int):
+        """
+        Bounded ring of the most recent PCM chunks, each tagged with a running index and
+        the byte offset of its start in the captured audio.
+
+        Chunks are appended by the streaming thread and read back after a reconnect, so
+        audio captured while the session was down can be replayed to the new session.
+
+        :param max_bytes: Total size of the kept chunks; the oldest chunks are evicted first.
+        """
+        self.max_bytes = max_bytes
+        self.chunks: Deque[Tuple[int, int, bytes]] = deque()
+        self.size = 0
+        self.next_index = 0
+        self.next_offset = 0
+        self.evicted = 0
+        self.mutex = threading.Lock()
+
+    def append(self, chunk: bytes) -> int:
+        """
+        Store a chunk and return its index.
+        """
+        with self.mutex:
+            index = self.next_index
+            self.next_index += 1
+            self.chunks.append((index, self.next_offset, chunk))
+            self.next_offset += len(chunk)
+            self.size += len(chunk)
+            while self.size > self.max_bytes and len(self.chunks) > 1:
+                _, _, evicted = self.chunks.popleft()
+                self.size -= len(evicted)
+                self.evicted += 1
+            return index
+
+    def since(self, index: int) -> List[Tuple[int, int, bytes]]:
+        """
+        ``(index, offset, chunk)`` of the chunks with an index of at least ``index`` that are
+        still kept, oldest first.
+        """
+        with self.mutex:
+            if not self.chunks or index > self.chunks[-1][0]:
+                return []
+            start = max(0, index - self.chunks[0][0])
+            return list(islice(self.chunks, start, None))
+
+    def index_at(self, offset: int) -> int:
+        """
+        Index of the chunk holding byte ``offset`` of the captured audio, whether it is still
+        kept or already evicted; the index of the next chunk when the offset is past the audio.
+        """
+        with self.mutex:
+            for chunk_index, chunk_offset, chunk in reversed(self.chunks):
+                if chunk_offset <= offset:
+                    return chunk_index if offset < chunk_offset + len(chunk) else chunk_index + 1
+            if not self.chunks:
+                return self.next_index
+            # Evicted: counted back from the oldest kept chunk, exact when the chunks have the
+            # same size (a capture device delivers fixed-size chunks), an estimate otherwise
+            oldest_index, oldest_offset, oldest = self.chunks[0]
+            evicted_chunks = (oldest_offset - offset + len(oldest) - 1) // len(oldest)
+            return max(0, oldest_index - evicted_chunks)
+
+    def clear(self):
+        with self.mutex:
+            self.chunks.clear()
+            self.size = 0
+            self.next_index = 0
+            self.next_offset = 0
+            self.evicted = 0
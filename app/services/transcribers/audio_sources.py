@@ -0,0 +1,106 @@
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, Optional
+
+import assemblyai as aai
+
+AudioSourceFactory = Callable[[int], Iterable[bytes]]
+
+
+def microphone_source(sample_rate: int) -> Iterable[bytes]:
+    """Audio from the local microphone of the server."""
+    return aai.extras.MicrophoneStream(sample_rate=sample_rate)
+
+
+class OpenedStream:
+    def __init__(self,
+                 stream: Iterable[bytes],
+                 chunks_func: Callable[[Iterable[bytes], threading.Event], Iterator[bytes]]):
+        """
+        One opening of a wrapping audio source (normalizer, voice activity gate).
+
+        ``interrupt`` and ``close`` only reach the stream this opening wraps, so a transcription
+        thread of a previous run can never stop or close the stream of the next one.
+
+        :param stream: Wrapped stream, opened by the wrapping source.
+        :param chunks_func: Produces the output chunks from the stream; must return once the
+            event is set, even while the wrapped stream keeps producing chunks.
+        """
+        self.stream = stream
+        self.interrupted = threading.Event()
+        self.chunks = chunks_func(stream, self.interrupted)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.chunks
+
+    def interrupt(self):
+        """End the iteration from another thread, at the latest after the next wrapped chunk."""
+        self.interrupted.set()
+        interrupt = getattr(self.stream, "interrupt", None)
+        if interrupt:
+            interrupt()
+
+    def close(self):
+        close = getattr(self.stream, "close", None)
+        if close:
+            close()
+
+
+class QueueAudioSource:
+    def __init__(self, max_chunks: int = 256):
+        """
+        Audio pushed from outside the process, e.g. by a WebSocket ingest endpoint.
+
+        Chunks are put from the event loop and consumed by the transcription thread.
+        When the consumer falls behind, the oldest chunk is dropped.
+
+        :param max_chunks: Number of chunks buffered before dropping.
+        """
+        self.max_chunks = max_chunks
+        self.current: Optional[QueueStream] = None
+
+    def __call__(self, sample_rate: int) -> Iterable[bytes]:
+        """Act as an audio source factory for the transcriber, starting from an empty queue."""
+        self.current = QueueStream(self.max_chunks)
+        return self.current
+
+    def put(self, chunk: Optional[bytes]):
+        if self.current:
+            self.current.put(chunk)
+
+
+class QueueStream:
+    def __init__(self, max_chunks: int):
+        """One opening of a ``QueueAudioSource``, consumed by one transcription thread."""
+        self.chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=max_chunks)
+        self.closed = False
+
+    def put(self, chunk: Optional[bytes]):
+        if self.closed:
+            return
+        while True:
+            try:
+                self.chunks.put_nowait(chunk)
+                return
+            except queue.Full:
+                try:
+                    self.chunks.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def interrupt(self):
+        """Wake up and end the iteration of the consuming transcriber from another thread."""
+        self.put(None)
+
+    def close(self):
+        self.closed = True
+
+    def __iter__(self) -> Iterator[bytes]:
+        while not self.closed:
+            try:
+                chunk = self.chunks.get(timeout=1)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                break
+            yield chunk
@@ -1,23 +1,45 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional, Set
 
 import asyncio
+import random
 import threading
 import time
+from collections import deque
+
 import assemblyai as aai
 from app.utils import logger
-from app.config import ASSEMBLYAI_API_KEY
+from app.config import ASSEMBLYAI_API_KEY, ASSEMBLYAI_BASE_URL, ASR_RECONNECT_BASE_DELAY, \
+    ASR_RECONNECT_MAX_DELAY, ASR_AUDIO_RING_SECONDS
+from app.services.status_bus import StatusBus
+from app.services.transcribers.audio_ring_buffer import AudioRingBuffer
+from app.services.transcribers.audio_sources import AudioSourceFactory, microphone_source
 
 # Load AssemblyAI API key from environment variable for security
 aai.settings.api_key = ASSEMBLYAI_API_KEY
+if ASSEMBLYAI_BASE_URL:
+    aai.settings.base_url = ASSEMBLYAI_BASE_URL
+
+BYTES_PER_SAMPLE = 2  # PCM16 mono
+
+class TranscriberState(str, Enum):
+    STARTING = "starting"
+    RUNNING = "running"
+    RECONNECTING = "reconnecting"
+    DRAINING = "draining"
+    STOPPED = "stopped"
+    ERROR = "error"
 
 class ITranscriber(ABC):
     @abstractmethod
-    def start(self):
+    async def start(self):
         """Start transcription process."""
         pass
 
     @abstractmethod
-    def stop(self):
+    async def stop(self):
         """Stop transcription process."""
         pass
 
@@ -33,100 +55,414 @@ class ITranscriber(ABC):
 
 
 class Transcriber(ITranscriber):
-    def __init__(self, sample_rate=16_000, _handle_transcription=None):
-        """Initialize the Transcriber with a custom handle_transcription function."""
-        self.status = "off"
-        self.status_message = ""
+    def __init__(self, sample_rate=16_000, _handle_transcription=None,
+                 audio_source: AudioSourceFactory = microphone_source, room=None, status_history=50,
+                 stop_timeout=10.0, connect_timeout=10.0,
+                 reconnect_base_delay=ASR_RECONNECT_BASE_DELAY, reconnect_max_delay=ASR_RECONNECT_MAX_DELAY,
+                 ring_seconds=ASR_AUDIO_RING_SECONDS):
+        """
+        Initialize the Transcriber with a custom handle_transcription function and audio source.
+
+        A lost realtime session is reopened with jittered exponential backoff. The last
+        ``ring_seconds`` of audio are kept, and the new session gets everything after the end
+        of the last final transcript, so no audio is lost and none is transcribed twice.
+        """
+        self._status = TranscriberState.STOPPED
+        self.status_messages = deque(maxlen=status_history)  # Bounded ring of recent status messages
+        self.room = room
+        self.status_bus = StatusBus()
         self.sample_rate = sample_rate
+        self.audio_source = audio_source
         self.handle_transcription = _handle_transcription
+        self.stop_timeout = stop_timeout
+        self.connect_timeout = connect_timeout
 
         self.transcriber = None
+        self.audio_stream = None
+        self.loop = None
         self.running = False
         self.transcription_thread = None
+        self.stream_generation = 0  # A streaming thread of an earlier run must not stream into this one
+        self.session_error = None
+        self.lifecycle_lock = asyncio.Lock()
+        # Transcripts handed over to the event loop and not processed yet
+        self.pending_transcripts: Set[Future] = set()
 
-    def start(self):
-        """Start the transcription process in a separate thread."""
-        if self.transcription_thread is None or not self.transcription_thread.is_alive():
-            self.running = True
-            self._create_transcriber()
+        # Reconnect state, shared by the streaming, SDK and reconnect threads
+        self.reconnect_base_delay = reconnect_base_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.ring = AudioRingBuffer(int(ring_seconds * sample_rate * BYTES_PER_SAMPLE))
+        self.session_lock = threading.Lock()
+        self.session_generation = 0  # Callbacks of older sessions are ignored
+        self.session_alive = threading.Event()
+        self.stop_event = threading.Event()
+        self.reconnect_thread = None
+        self.last_sent_index = -1
+        self.lost_at = None
+        # Offset in the captured audio up to which final transcripts were received, and the
+        # offset each session's audio started at (audio_end of a transcript is relative to it)
+        self.finalized_offset = 0
+        self.session_offsets: Dict[int, int] = {}
+
+        self.stats = {
+            "reconnects": 0,
+            "reconnect_attempts": 0,
+            "last_gap_seconds": 0.0,
+            "total_gap_seconds": 0.0,
+            "chunks_replayed": 0,
+            "chunks_lost": 0,
+            "duplicate_finals_dropped": 0,
+        }
+
+    async def start(self):
+        """
+        Connect to the realtime service and start streaming audio in a separate thread.
+        Blocking SDK calls run in worker threads, the event loop is never blocked.
+        """
+        async with self.lifecycle_lock:
+            if self.status in (TranscriberState.STARTING, TranscriberState.RUNNING, TranscriberState.RECONNECTING):
+                return
 
-            self.transcriber.connect()
-            self.transcription_thread = threading.Thread(target=self._transcribe_in_thread, daemon=True)
+            self.status = TranscriberState.STARTING
+            # Transcripts arrive on SDK threads and are handed over to the server event loop
+            self.loop = asyncio.get_running_loop()
+            self.stop_event.clear()
+            self.ring.clear()
+            self.last_sent_index = -1
+            self.lost_at = None
+            self.finalized_offset = 0
+            self.session_offsets.clear()
+
+            if not await asyncio.to_thread(self._open_session):
+                # A session that failed to open may still hold a connection
+                if self.transcriber:
+                    await asyncio.to_thread(self._close_session, self.transcriber)
+                    self.transcriber = None
+                self.status = TranscriberState.ERROR
+                self._set_status_message(f"Could not start transcriber: {self.session_error}")
+                return
+
+            self.running = True
+            self.stream_generation += 1
+            self.transcription_thread = threading.Thread(target=self._transcribe_in_thread,
+                                                         args=(self.stream_generation,), daemon=True)
             self.transcription_thread.start()
+            self.status = TranscriberState.RUNNING
+            self._set_status_message("Transcriber started.")
 
-    def stop(self):
-        """Close the transcriber and stop the microphone stream."""
-        if self.running:
-            self.running = False
-            self.transcriber.close()
-            time.sleep(2)
-            if self.transcription_thread:
-                # Ensure thread has enough time to finish, setting a longer timeout if necessary
-                self.transcription_thread.join(timeout=5)
+    async def stop(self, drain: Optional[Callable[[], Awaitable[None]]] = None):
+        """
+        Stop streaming audio, close the session and wait until every final transcript it
+        produced has been handed to the transcription handler.
+
+        :param drain: Coroutine finishing the downstream work, awaited while still DRAINING.
+        """
+        async with self.lifecycle_lock:
+            if self.status == TranscriberState.STOPPED:
+                if drain:
+                    await drain()
+                return
+
+            self.status = TranscriberState.DRAINING
+            self.running = False  # The streaming thread exits after the current chunk
+            self.stop_event.set()  # Wakes up a pending reconnect
+            interrupt = getattr(self.audio_stream, "interrupt", None)
+            if interrupt:
+                interrupt()
+
+            for thread in (self.transcription_thread, self.reconnect_thread):
+                if thread:
+                    await asyncio.to_thread(thread.join, self.stop_timeout)
+                    if thread.is_alive():
+                        logger.warning(f"Thread {thread.name} did not finish in time.")
             self.transcription_thread = None
+            self.reconnect_thread = None
+
+            # Closing the session flushes the last final transcripts through the callbacks
+            if self.transcriber:
+                await asyncio.to_thread(self._close_session, self.transcriber)
+                self.transcriber = None
+            self.session_alive.clear()
+
+            if self.pending_transcripts:
+                await asyncio.gather(*(asyncio.wrap_future(f) for f in list(self.pending_transcripts)),
+                                     return_exceptions=True)
+            if drain:
+                await drain()
+
+            self.status = TranscriberState.STOPPED
             self._set_status_message("Transcriber stopped.")
 
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        if value != self._status:
+            self._status = value
+            self.status_bus.publish("transcriber", {"status": value.value}, room=self.room)
+
+    @property
+    def status_message(self):
+        return "\n ".join(self.status_messages)
+
     def get_status(self):
-        return {"status": self.status, "message": self.status_message}
+        return {"status": self.status.value, "message": self.status_message}
+
+    def get_stats(self):
+        lost_at = self.lost_at
+        return {
+            **self.stats,
+            "current_gap_seconds": time.monotonic() - lost_at if lost_at is not None else 0.0,
+            "ring_evicted_chunks": self.ring.evicted,
+        }
 
     def set_transcription_handler(self, handler):
         """Set a custom handler for transcription data."""
         self.handle_transcription = handler
 
-    def _create_transcriber(self):
-        """Initialize the RealtimeTranscriber object."""
-        self.transcriber = aai.RealtimeTranscriber(
+    def _create_transcriber(self, generation: int):
+        """Initialize the RealtimeTranscriber object, its callbacks tagged with the session generation."""
+        return aai.RealtimeTranscriber(
             sample_rate=self.sample_rate,
-            on_data=self._realtime_transcriber_on_data,
-            on_error=self._realtime_transcriber_on_error,
-            on_open=self._realtime_transcriber_on_open,
-            on_close=self._realtime_transcriber_on_close,
+            on_data=lambda transcript: self._realtime_transcriber_on_data(generation, transcript),
+            on_error=lambda error: self._realtime_transcriber_on_error(generation, error),
+            on_open=lambda session_opened: self._realtime_transcriber_on_open(generation, session_opened),
+            on_close=lambda: self._realtime_transcriber_on_close(generation),
         )
 
-    def _transcribe_in_thread(self):
+    def _open_session(self) -> bool:
+        """Create and connect a new session and wait until it is open. Runs in a worker thread."""
+        with self.session_lock:
+            self.session_generation += 1
+            generation = self.session_generation
+            self.session_error = None
+            self.session_alive.clear()
+            self.transcriber = self._create_transcriber(generation)
+
+        # The SDK reports connection failures through on_error instead of raising
+        self.transcriber.connect(timeout=self.connect_timeout)
+        if self.session_error:
+            return False
+        return self.session_alive.wait(self.connect_timeout) and self.session_error is None
+
+    @staticmethod
+    def _close_session(session):
+        try:
+            session.close()
+        except Exception as e:
+            logger.warning(f"Error closing AssemblyAI session: {e}")
+
+    def _streaming(self) -> bool:
+        """Whether a streaming thread is running and sending audio."""
+        thread = self.transcription_thread
+        return self.running and thread is not None and thread.is_alive()
+
+    def _session_lost(self, generation: int, reason):
+        """
+        Start reconnecting when the current session ends while audio is being streamed. Without
+        a streaming thread there is nothing to reconnect for; the thread's exit closes the run.
+        """
+        with self.session_lock:
+            if generation != self.session_generation or not self._streaming() or self.stop_event.is_set():
+                return
+            self.session_alive.clear()
+            if self.lost_at is None:
+                self.lost_at = time.monotonic()
+            if self.reconnect_thread and self.reconnect_thread.is_alive():
+                return
+            self.reconnect_thread = threading.Thread(target=self._reconnect_loop, name="asr-reconnect", daemon=True)
+            self.reconnect_thread.start()
+
+        self.status = TranscriberState.RECONNECTING
+        self._set_status_message(f"AssemblyAI session lost ({reason}), reconnecting.")
+
+    def _reconnect_loop(self):
+        """Reopen the session with jittered exponential backoff until it succeeds or the transcriber stops."""
+        attempt = 0
+        while self._streaming() and not self.stop_event.is_set():
+            delay = min(self.reconnect_max_delay, self.reconnect_base_delay * 2 ** attempt)
+            attempt += 1
+            if self.stop_event.wait(random.uniform(delay / 2, delay)):
+                return
+
+            self.stats["reconnect_attempts"] += 1
+            if self.transcriber:
+                self._close_session(self.transcriber)
+            if self.stop_event.is_set():
+                return
+            try:
+                opened = self._open_session()
+            except Exception as e:
+                self.session_error = e
+                opened = False
+            if not opened:
+                self._set_status_message(f"Reconnect attempt {attempt} failed: {self.session_error}")
+                continue
+
+            with self.session_lock:
+                # The run ended while connecting, nobody would close this session
+                abandoned = not self._streaming() or self.stop_event.is_set()
+                if abandoned:
+                    session, self.transcriber = self.transcriber, None
+                    self.session_alive.clear()
+            if abandoned:
+                self._close_session(session)
+                return
+
+            with self.session_lock:
+                gap = time.monotonic() - self.lost_at
+                self.lost_at = None
+            self.stats["reconnects"] += 1
+            self.stats["last_gap_seconds"] = gap
+            self.stats["total_gap_seconds"] += gap
+            self.status = TranscriberState.RUNNING
+            self._set_status_message(f"AssemblyAI session reopened after {gap:.2f}s (attempt {attempt}).")
+            return
+
+    def _transcribe_in_thread(self, generation: int):
         """Internal method to run transcription in a separate thread."""
+        error = None
         try:
-            self._transcribe()
             self._set_status_message("Transcription thread started.")
+            self._transcribe(generation)
         except Exception as e:
-            self._set_status_message(f"Error in transcription thread: {e}")
+            error = e
+            self._set_status_message(f"An error occurred during transcription: {e}")
         finally:
-            self.transcription_thread = None
+            self._end_run(generation, error)
             self._set_status_message("Transcription thread finished.")
 
-    def _transcribe(self):
-        """Start transcription."""
+    def _end_run(self, generation: int, error: Optional[Exception]):
+        """
+        Shut the run down when its audio source ended or failed on its own: stop reconnecting,
+        close the session and report STOPPED, or ERROR after an exception. Nothing is done when
+        ``stop()`` or a newer run already owns the session.
+        """
+        with self.session_lock:
+            if not self.running or generation != self.stream_generation:
+                return
+            self.running = False
+            self.stop_event.set()
+
+        reconnect_thread = self.reconnect_thread
+        if reconnect_thread:
+            reconnect_thread.join(self.stop_timeout)
+        with self.session_lock:
+            session, self.transcriber = self.transcriber, None
+            self.session_alive.clear()
+        # Closing flushes the last final transcripts, the status still lets them through
+        if session:
+            self._close_session(session)
+
+        if error is not None:
+            self.status = TranscriberState.ERROR
+            self._set_status_message("Audio source failed, transcriber stopped.")
+        else:
+            self.status = TranscriberState.STOPPED
+            self._set_status_message("Audio source ended, transcriber stopped.")
+
+    def _transcribe(self, generation: int):
+        """
+        Stream audio chunks until the transcriber is stopped or the source ends.
+
+        Every chunk is kept in the ring buffer. While the session is down chunks are only
+        buffered. A new session first gets the backlog: every chunk after the end of the last
+        final transcript, which the old session may have received but never finalized.
+
+        :param generation: Run this thread belongs to; it stops as soon as another run started.
+        """
+        audio_stream = self.audio_source(self.sample_rate)
+        self.audio_stream = audio_stream
         try:
-            self.status = "on"
-            microphone_stream = aai.extras.MicrophoneStream(sample_rate=self.sample_rate)
-            self.transcriber.stream(microphone_stream)
-        except Exception as e:
-            self._set_status_message(f"An error occurred during transcription: {e}")
-            self.status = "error"
+            for chunk in audio_stream:
+                if not self.running or generation != self.stream_generation:
+                    break
+                index = self.ring.append(chunk)
+                if not self.session_alive.is_set():
+                    continue
+
+                session, session_generation = self.transcriber, self.session_generation
+                if session_generation in self.session_offsets:
+                    session.stream(chunk)
+                else:
+                    # Read once the old session is closed, so its last finals are accounted for
+                    resend_from = min(self.ring.index_at(self.finalized_offset), index)
+                    backlog = self.ring.since(resend_from)
+                    if backlog[0][0] > resend_from:
+                        # The unfinalized audio outlasted the ring buffer
+                        self.stats["chunks_lost"] += backlog[0][0] - resend_from
+                    self.stats["chunks_replayed"] += len(backlog) - 1
+                    with self.session_lock:
+                        self.session_offsets[session_generation] = backlog[0][1]
+                        for old in [g for g in self.session_offsets if g < session_generation - 1]:
+                            del self.session_offsets[old]
+                    for _, _, buffered in backlog:
+                        session.stream(buffered)
+                self.last_sent_index = index
         finally:
-            self.running = False
-            # Explicitly stop transcription and cleanup
-            self.stop()
+            # Only the stream this thread opened, a new run may already have opened its own
+            close = getattr(audio_stream, "close", None)
+            if close:
+                close()
+            if self.audio_stream is audio_stream:
+                self.audio_stream = None
 
-    @staticmethod
-    def _realtime_transcriber_on_open(session_opened: aai.RealtimeSessionOpened):
+    def _realtime_transcriber_on_open(self, generation: int, session_opened: aai.RealtimeSessionOpened):
         """Callback for when the session is opened."""
         logger.info(f"\033[33mAssemblyAI Session started: {session_opened.session_id}\033[0m")
+        if generation == self.session_generation:
+            self.session_alive.set()
 
-    @staticmethod
-    def _realtime_transcriber_on_error(error: aai.RealtimeError):
+    def _realtime_transcriber_on_error(self, generation: int, error: aai.RealtimeError):
         """Callback for handling errors."""
         logger.error(f"An error occurred: {error}")
+        if generation == self.session_generation:
+            self.session_error = error
+            self._session_lost(generation, error)
 
-    @staticmethod
-    def _realtime_transcriber_on_close():
+    def _realtime_transcriber_on_close(self, generation: int):
         """Callback for when the session is closed."""
         logger.info("AssemblyAI session closed.")
+        self._session_lost(generation, "session closed")
 
-    def _realtime_transcriber_on_data(self, transcript: aai.RealtimeTranscript):
+    def _realtime_transcriber_on_data(self, generation: int, transcript: aai.RealtimeTranscript):
         """Callback for processing transcription data."""
-        if self.running and isinstance(transcript, aai.RealtimeFinalTranscript):
-            asyncio.run(self._add_to_buffer(transcript.text))
+        if not isinstance(transcript, aai.RealtimeFinalTranscript) or self._already_finalized(generation, transcript):
+            return
+        if self.status in (TranscriberState.RUNNING, TranscriberState.RECONNECTING, TranscriberState.DRAINING) \
+                and transcript.text:
+            future = asyncio.run_coroutine_threadsafe(self._add_to_buffer(transcript.text), self.loop)
+            self.pending_transcripts.add(future)
+            future.add_done_callback(self.pending_transcripts.discard)
+            future.add_done_callback(self._log_handler_error)
+
+    def _already_finalized(self, generation: int, transcript: aai.RealtimeFinalTranscript) -> bool:
+        """
+        Advance the finalized offset to the end of ``transcript``; True when its audio was already
+        covered by an earlier final, i.e. it transcribes replayed audio a second time.
+        """
+        with self.session_lock:
+            start = self.session_offsets.get(generation)
+            if start is None or transcript.audio_end <= 0:
+                return False
+            end = start + transcript.audio_end * self.sample_rate // 1000 * BYTES_PER_SAMPLE
+            if end <= self.finalized_offset:
+                self.stats["duplicate_finals_dropped"] += 1
+                return True
+            self.finalized_offset = end
+            return False
+
+    @staticmethod
+    def _log_handler_error(future: Future):
+        """Report a failed transcription handler, nothing else waits for these futures."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Transcription handler failed: %r", error, exc_info=error,
+                         extra={"stage": "transcript", "category": "transcript.error"})
 
     async def _add_to_buffer(self, data: str):
         """Async method to handle transcription and send data to the buffer."""
@@ -135,4 +471,5 @@ class Transcriber(ITranscriber):
 
     def _set_status_message(self, message):
         logger.info(message)
-        self.status_message = self.status_message + '\n ' + message
+        self.status_messages.append(message)
+        self.status_bus.publish("transcriber", {"status": self.status.value, "message": message}, room=self.room)
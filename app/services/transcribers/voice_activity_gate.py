@@ -0,0 +1,151 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Iterable, Iterator
+
+import numpy as np
+
+from app.services.transcribers.audio_sources import AudioSourceFactory, OpenedStream
+
+INT16_FULL_SCALE = 32768.0
+
+
+class VoiceActivityGate:
+    def __init__(self,
+                 audio_source: AudioSourceFactory,
+                 frame_ms: int = 20,
+                 energy_threshold_db: float = -45.0,
+                 noise_margin_db: float = 10.0,
+                 fricative_zcr: float = 0.25,
+                 hangover_seconds: float = 1.0,
+                 pre_roll_seconds: float = 0.3,
+                 noise_floor_rise_db: float = 1.0):
+        """
+        Audio source wrapper forwarding only the chunks that contain speech.
+
+        Each PCM16 chunk is viewed as a matrix of ``frame_ms`` analysis frames without copying;
+        energy and zero-crossing rate of all frames are computed in one vectorized pass. A frame
+        is speech when its energy is above the threshold, or a bit below it with the high
+        zero-crossing rate of unvoiced consonants. The threshold follows the noise floor.
+
+        After speech, ``hangover_seconds`` of audio are still forwarded so the ASR sees the
+        pause that ends an utterance; before speech, ``pre_roll_seconds`` of held back audio
+        are sent first so word onsets are not clipped.
+
+        :param audio_source: Wrapped audio source factory producing PCM16 mono chunks.
+        :param frame_ms: Analysis frame length.
+        :param energy_threshold_db: Minimum speech energy in dBFS.
+        :param noise_margin_db: Speech must be this much louder than the noise floor.
+        :param fricative_zcr: Zero-crossings per sample above which quieter frames count as speech.
+        :param hangover_seconds: Audio forwarded after the last speech frame.
+        :param pre_roll_seconds: Audio forwarded before the first speech frame.
+        :param noise_floor_rise_db: How fast the noise floor may rise, in dB per second of audio.
+        """
+        self.audio_source = audio_source
+        self.frame_ms = frame_ms
+        self.energy_threshold_db = energy_threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.fricative_zcr = fricative_zcr
+        self.hangover_seconds = hangover_seconds
+        self.pre_roll_seconds = pre_roll_seconds
+        self.noise_floor_rise_db = noise_floor_rise_db
+
+        self.sample_rate = 16_000
+        self.noise_floor_db = energy_threshold_db - noise_margin_db
+        self.scratch = np.empty(0, dtype=np.float32)
+
+        self.stats = {
+            "chunks_in": 0,
+            "chunks_forwarded": 0,
+            "audio_seconds_in": 0.0,
+            "audio_seconds_suppressed": 0.0,
+            "cpu_seconds": 0.0,
+        }
+
+    def __call__(self, sample_rate: int) -> Iterable[bytes]:
+        """Act as an audio source factory, opening the wrapped source."""
+        self.sample_rate = sample_rate
+        return OpenedStream(self.audio_source(sample_rate), self._gate)
+
+    def _gate(self, stream: Iterable[bytes], interrupted: threading.Event) -> Iterator[bytes]:
+        pre_roll: Deque[bytes] = deque()
+        pre_roll_seconds = 0.0
+        hangover_left = 0.0
+
+        for chunk in stream:
+            # Nothing is yielded during silence, the consumer cannot notice a stop request itself
+            if interrupted.is_set():
+                return
+            started = time.thread_time()
+            duration = len(chunk) / (2 * self.sample_rate)
+            speech = self.is_speech(chunk)
+            self.stats["chunks_in"] += 1
+            self.stats["audio_seconds_in"] += duration
+
+            if speech:
+                hangover_left = self.hangover_seconds
+            elif hangover_left > 0:
+                hangover_left -= duration
+                speech = True
+
+            if not speech:
+                pre_roll.append(chunk)
+                pre_roll_seconds += duration
+                while pre_roll_seconds > self.pre_roll_seconds and pre_roll:
+                    dropped = pre_roll.popleft()
+                    dropped_duration = len(dropped) / (2 * self.sample_rate)
+                    pre_roll_seconds -= dropped_duration
+                    self.stats["audio_seconds_suppressed"] += dropped_duration
+                self.stats["cpu_seconds"] += time.thread_time() - started
+                continue
+
+            self.stats["cpu_seconds"] += time.thread_time() - started
+            while pre_roll:
+                self.stats["chunks_forwarded"] += 1
+                yield pre_roll.popleft()
+            pre_roll_seconds = 0.0
+            self.stats["chunks_forwarded"] += 1
+            yield chunk
+
+    def is_speech(self, chunk: bytes) -> bool:
+        """
+        Classify a chunk; it is speech when any of its analysis frames is.
+        """
+        frame_length = self.sample_rate * self.frame_ms // 1000
+        samples = np.frombuffer(chunk, dtype=np.int16, count=len(chunk) // 2)  # Zero-copy view
+        frame_count = len(samples) // frame_length
+        if frame_count == 0:
+            return False
+        frames = samples[:frame_count * frame_length].reshape(frame_count, frame_length)
+
+        # Scaled copy into a reused buffer, the only pass over the samples that writes memory
+        if self.scratch.size < frames.size:
+            self.scratch = np.empty(frames.size, dtype=np.float32)
+        scaled = self.scratch[:frames.size].reshape(frame_count, frame_length)
+        np.multiply(frames, 1.0 / INT16_FULL_SCALE, out=scaled, casting="unsafe")
+
+        energy = np.einsum("ij,ij->i", scaled, scaled) / frame_length
+        energy_db = 10.0 * np.log10(energy + 1e-12)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frame_length
+
+        threshold = max(self.energy_threshold_db, self.noise_floor_db + self.noise_margin_db)
+        voiced = energy_db > threshold
+        fricative = (energy_db > threshold - self.noise_margin_db / 2) & (zcr > self.fricative_zcr)
+        speech = voiced | fricative
+
+        # Minimum statistics: the floor drops to the quietest frame at once and rises slowly,
+        # so it follows louder background noise without climbing to the level of speech
+        quietest = float(energy_db.min())
+        rise = self.noise_floor_rise_db * frame_count * self.frame_ms / 1000
+        self.noise_floor_db = min(quietest, self.noise_floor_db + rise)
+        return bool(speech.any())
+
+    def get_stats(self) -> dict:
+        audio_seconds = self.stats["audio_seconds_in"]
+        return {
+            **self.stats,
+            "noise_floor_db": round(self.noise_floor_db, 1),
+            "suppressed_fraction": self.stats["audio_seconds_suppressed"] / audio_seconds if audio_seconds else 0.0,
+            "cpu_ms_per_audio_second": 1000 * self.stats["cpu_seconds"] / audio_seconds if audio_seconds else 0.0,
+        }
@@ -0,0 +1,174 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.utils import logger
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, fall back to a character based estimate
+    tiktoken = None
+
+
+SYSTEM_PROMPT = (
+    "You are a professional literary translator working on a live talk. "
+    "You receive the preceding source sentences as context and one new sentence to translate. "
+    "Translate only the new sentence using a fluent, natural, and context-aware style. "
+    "Only return the translated sentence."
+)
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens with tiktoken when it is installed, otherwise estimates them.
+    """
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, model: str = "gpt-4-turbo"):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        return len(text) // self.CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class ContextSentence:
+    text: str
+    tokens: int
+
+
+class TranslationContext:
+    """
+    Source-side context shared by every target language of one session.
+
+    Sentences are measured once when they are added, and the context is kept within
+    ``max_tokens``. When the budget is exceeded the oldest sentences are evicted down to
+    ``trim_to_tokens`` in one step, so the context prefix stays byte-identical across
+    several consecutive utterances and provider-side prompt caching keeps applying.
+
+    OpenAI only caches prompts of at least ``PROMPT_CACHE_MIN_TOKENS``. With ``cache_floor``
+    the trim target never goes below that (instructions included), which pays for a longer
+    prompt on every request so a model with prompt caching can cache it; with a smaller
+    ``max_tokens`` no prompt is ever cached, which is logged. The cached share is reported
+    in ``get_stats``.
+    """
+    PROMPT_CACHE_MIN_TOKENS = 1024
+
+    def __init__(self,
+                 max_tokens: int = 300,
+                 trim_to_tokens: Optional[int] = None,
+                 token_counter: Optional[TokenCounter] = None,
+                 cache_floor: bool = False
+    ):
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter or TokenCounter()
+
+        self.sentences: Deque[ContextSentence] = deque()
+        self.context_tokens = 0
+        self.system_tokens = self.token_counter.count(SYSTEM_PROMPT)
+
+        if trim_to_tokens is None:
+            trim_to_tokens = max_tokens // 2
+            if cache_floor:
+                trim_to_tokens = min(max(trim_to_tokens, self.PROMPT_CACHE_MIN_TOKENS - self.system_tokens),
+                                     max_tokens)
+        self.trim_to_tokens = trim_to_tokens
+        if cache_floor and self.system_tokens + max_tokens < self.PROMPT_CACHE_MIN_TOKENS:
+            logger.warning(f"A context of at most {max_tokens} tokens keeps prompts below the "
+                           f"{self.PROMPT_CACHE_MIN_TOKENS} tokens OpenAI caches, no prompt will be cached.")
+
+        self.stats = {
+            "utterances": 0,
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def add_sentence(self, text: str):
+        """
+        Append a source sentence to the shared context and enforce the token budget.
+
+        :param text: Final source transcript.
+        """
+        sentence = ContextSentence(text=text, tokens=self.token_counter.count(text))
+        self.sentences.append(sentence)
+        self.context_tokens += sentence.tokens
+        self.stats["utterances"] += 1
+
+        if self.context_tokens > self.max_tokens:
+            while self.sentences and self.context_tokens > self.trim_to_tokens:
+                evicted = self.sentences.popleft()
+                self.context_tokens -= evicted.tokens
+
+    def build_messages(self, text: str, language_code: str,
+                       glossary: Optional[Dict[str, str]] = None,
+                       reference: Optional[Tuple[str, str]] = None) -> List[Dict[str, str]]:
+        """
+        Build the chat input for one translation.
+
+        The language-independent part (instructions and context) comes first so it forms
+        a prefix shared by every target language, the target language, glossary terms, a
+        reference translation and the new text last.
+
+        :param text: Text to translate.
+        :param language_code: Target language code.
+        :param glossary: Required translations of terms occurring in the text.
+        :param reference: A similar earlier segment and its translation; it may differ in meaning.
+        """
+        context_text = "\n".join(sentence.text for sentence in self.sentences)
+        terms = ""
+        if glossary:
+            terms = "Glossary (use these translations):\n" + \
+                "\n".join(f"{source} => {target}" for source, target in glossary.items()) + "\n\n"
+        if reference:
+            terms += ("Similar earlier translation, for wording only (its meaning may differ):\n"
+                      f"{reference[0]} => {reference[1]}\n\n")
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Context:\n{context_text}"},
+            {"role": "user", "content": f"Target language: {language_code}\n\n{terms}Text:\n{text}"},
+        ]
+
+    def estimate_prompt_tokens(self, text: str, language_code: str) -> int:
+        return (self.system_tokens + self.context_tokens
+                + self.token_counter.count(text) + self.token_counter.count(language_code))
+
+    def record_usage(self, prompt_tokens: int, cached_tokens: int = 0, completion_tokens: int = 0):
+        """
+        Record the token usage reported by the provider for one request.
+        """
+        self.stats["requests"] += 1
+        self.stats["prompt_tokens"] += prompt_tokens
+        self.stats["cached_tokens"] += cached_tokens
+        self.stats["completion_tokens"] += completion_tokens
+
+    def get_stats(self) -> Dict[str, float]:
+        utterances = self.stats["utterances"] or 1
+        requests = self.stats["requests"] or 1
+        return {
+            **self.stats,
+            "context_sentences": len(self.sentences),
+            "context_tokens": self.context_tokens,
+            "prompt_tokens_per_utterance": self.stats["prompt_tokens"] / utterances,
+            "cached_ratio": self.stats["cached_tokens"] / max(self.stats["prompt_tokens"], 1),
+            "prompt_tokens_per_request": self.stats["prompt_tokens"] / requests,
+        }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(
+            "Translation context: %d sentences / %d tokens, %.0f prompt tokens per utterance, %.0f%% cached",
+            stats['context_sentences'], stats['context_tokens'], stats['prompt_tokens_per_utterance'],
+            stats['cached_ratio'] * 100,
+            extra={"category": "context", "stage": "translation"}
+        )
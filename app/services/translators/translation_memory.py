@@ -0,0 +1,303 @@
+import difflib
+import json
+import re
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils import logger
+
+WORD = re.compile(r"\w+")
+# The only words two segments may differ in for a stored translation to be reused as is.
+# Anything else - a content word, a number, "not", "can't" (split into "can" "t"), "agree" versus
+# "disagree" - can change the meaning, such matches are only given to the translator as a reference.
+FILLER_WORDS = frozenset({"so", "well", "um", "uh", "er", "erm", "ah", "oh", "okay", "ok", "the", "a", "an"})
+# Shingles and hashes are computed on 64-bit integers that wrap around (multiply-shift hashing)
+SHINGLE_BASE = np.uint64(0x100000001B3)
+# Segments whose signature is kept, enough for the utterances translated at the same time
+RECENT_SIGNATURES = 256
+
+
+def read_glossary(path: str) -> dict:
+    """
+    Read a glossary file, see ``TranslationMemory.load_glossary`` for its format.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def glossary_segments(glossary: dict) -> int:
+    return sum(len(entries.get("segments", {})) for entries in glossary.values())
+
+
+def normalize(text: str) -> str:
+    """Lowercase words separated by single spaces, without punctuation."""
+    return " ".join(WORD.findall(text.lower()))
+
+
+def only_filler_differences(key: str, other: str) -> bool:
+    """Whether two normalized segments differ in filler words only."""
+    words, other_words = key.split(), other.split()
+    matcher = difflib.SequenceMatcher(a=words, b=other_words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal" and not FILLER_WORDS.issuperset(words[i1:i2] + other_words[j1:j2]):
+            return False
+    return True
+
+
+class TranslationMemory:
+    def __init__(self,
+                 max_entries: int = 100_000,
+                 threshold: float = 0.85,
+                 reference_threshold: float = 0.7,
+                 shingle_size: int = 3,
+                 num_perm: int = 64,
+                 bands: int = 8,
+                 seed: int = 1):
+        """
+        Translations of earlier source segments, looked up before calling a translator.
+
+        A segment is reduced to the set of its character n-grams and summarized by a MinHash
+        signature of ``num_perm`` values; the share of equal values estimates the Jaccard
+        similarity of two segments. Signatures are split into ``bands`` bands indexed in hash
+        buckets (locality-sensitive hashing), so a lookup only compares the signatures of the
+        few entries sharing a bucket instead of scanning the memory.
+
+        A lookup returns a stored translation for an exact match (ignoring case and punctuation)
+        or for a match reaching ``threshold`` whose differing words are all filler words. Other
+        matches reaching ``reference_threshold`` are only offered to the translator as a
+        reference, since a single word ("not", "disagree") can invert the meaning.
+
+        Glossary segments are kept for the whole process; translations learned at runtime fill
+        the remaining slots and the oldest is replaced when the memory is full.
+
+        :param max_entries: Number of segments kept, glossary included.
+        :param threshold: Minimum estimated similarity to reuse a stored translation.
+        :param reference_threshold: Minimum estimated similarity to offer a stored translation
+            as a reference.
+        :param shingle_size: Length of the character n-grams.
+        :param num_perm: Number of hash functions of a signature.
+        :param bands: Number of LSH bands; ``num_perm`` must be a multiple of it.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.reference_threshold = reference_threshold
+        self.shingle_size = shingle_size
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.increments = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+        self.band_weights = rng.integers(1, 2 ** 63, self.rows, dtype=np.uint64) | np.uint64(1)
+
+        self.signatures = np.zeros((max_entries, num_perm), dtype=np.uint32)
+        self.sources: List[Optional[str]] = [None] * max_entries
+        self.targets: List[Optional[str]] = [None] * max_entries
+        self.languages: List[Optional[str]] = [None] * max_entries
+        self.band_keys: List[Optional[Tuple[int, ...]]] = [None] * max_entries
+        # One bucket table per band: key -> slots; per language, so languages never mix
+        self.buckets: Dict[str, List[Dict[int, List[int]]]] = {}
+        self.exact: Dict[Tuple[str, str], int] = {}
+
+        self.pinned = 0  # Slots [0, pinned) hold glossary segments
+        self.next_slot = 0
+        self.size = 0
+
+        # Glossary terms per language, indexed by their first word
+        self.terms: Dict[str, Dict[str, List[Tuple[List[str], str, str]]]] = {}
+
+        # Signatures of the latest segments: a missed lookup is followed by a reference lookup
+        # and, once translated, by the insertion of the same segment
+        self.recent_signatures: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        self.lookup_seconds: Deque[float] = deque(maxlen=4096)
+        self.stats = {"lookups": 0, "exact_hits": 0, "fuzzy_hits": 0, "misses": 0, "rejected_differences": 0,
+                      "references": 0, "glossary_prompts": 0, "added": 0, "evicted": 0}
+
+    def load_glossary(self, path: str, glossary: Optional[dict] = None):
+        """
+        Load a glossary file and keep its segments for the whole process.
+
+        The file maps a target language to ``terms`` (words and names to translate consistently,
+        injected into the prompt) and ``segments`` (whole phrases whose translation is reused)::
+
+            {"fr": {"terms": {"keynote": "conférence principale"},
+                    "segments": {"As I said earlier,": "Comme je l'ai dit plus tôt,"}}}
+
+        :param path: Glossary file.
+        :param glossary: Content of the file when it was already read with ``read_glossary``.
+        """
+        if glossary is None:
+            glossary = read_glossary(path)
+        segments = 0
+        for lang, entries in glossary.items():
+            for source, target in entries.get("terms", {}).items():
+                self.add_term(source, lang, target)
+            for source, target in entries.get("segments", {}).items():
+                self.add(source, lang, target)
+                segments += 1
+        # Loaded into the empty memory, so the glossary holds the first slots
+        self.pinned = self.size
+        logger.info(f"Glossary {path} loaded: {segments} segments for {len(glossary)} languages.")
+
+    def add_term(self, source: str, lang: str, target: str):
+        words = normalize(source).split()
+        if words:
+            self.terms.setdefault(lang, {}).setdefault(words[0], []).append((words, source, target))
+
+    def terms_in(self, text: str, lang: str) -> Dict[str, str]:
+        """
+        Glossary terms of ``lang`` occurring in ``text``, source term -> translation.
+        """
+        index = self.terms.get(lang)
+        if not index:
+            return {}
+        words = normalize(text).split()
+        found = {}
+        for i, word in enumerate(words):
+            for term_words, source, target in index.get(word, ()):
+                if words[i:i + len(term_words)] == term_words:
+                    found[source] = target
+        if found:
+            self.stats["glossary_prompts"] += 1
+        return found
+
+    def lookup(self, text: str, lang: str) -> Optional[str]:
+        """
+        Stored translation of ``text`` or of a segment differing only in filler words, None on a miss.
+        """
+        started = time.perf_counter()
+        self.stats["lookups"] += 1
+        key = normalize(text)
+        translation = None
+
+        slot = self.exact.get((lang, key))
+        if slot is not None:
+            translation = self.targets[slot]
+            self.stats["exact_hits"] += 1
+        elif lang in self.buckets and key:
+            match = self._best_match(key, lang)
+            if match is not None and match[1] >= self.threshold:
+                if only_filler_differences(key, self.sources[match[0]]):
+                    translation = self.targets[match[0]]
+                    self.stats["fuzzy_hits"] += 1
+                else:
+                    self.stats["rejected_differences"] += 1
+
+        if translation is None:
+            self.stats["misses"] += 1
+        self.lookup_seconds.append(time.perf_counter() - started)
+        return translation
+
+    def reference(self, text: str, lang: str) -> Optional[Tuple[str, str]]:
+        """
+        Most similar stored segment and its translation, to show the translator how a close
+        segment was translated; None when nothing reaches ``reference_threshold``.
+        """
+        key = normalize(text)
+        if lang not in self.buckets or not key:
+            return None
+        match = self._best_match(key, lang)
+        if match is None or match[1] < self.reference_threshold:
+            return None
+        self.stats["references"] += 1
+        return self.sources[match[0]], self.targets[match[0]]
+
+    def add(self, text: str, lang: str, translation: str):
+        """
+        Remember the translation of a segment, replacing the oldest learned one when full.
+        """
+        key = normalize(text)
+        if not key or (lang, key) in self.exact or self.pinned >= self.max_entries:
+            return
+
+        slot = self.next_slot
+        if self.sources[slot] is not None:
+            self._evict(slot)
+        self.next_slot = slot + 1 if slot + 1 < self.max_entries else self.pinned
+
+        signature = self._signature(key)
+        band_keys = self._band_keys(signature)
+        self.signatures[slot] = signature
+        self.sources[slot] = key
+        self.targets[slot] = translation
+        self.languages[slot] = lang
+        self.band_keys[slot] = band_keys
+        self.exact[(lang, key)] = slot
+
+        tables = self.buckets.get(lang)
+        if tables is None:
+            tables = self.buckets[lang] = [{} for _ in range(self.bands)]
+        for table, band_key in zip(tables, band_keys):
+            table.setdefault(band_key, []).append(slot)
+        self.size += 1
+        self.stats["added"] += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.stats["lookups"] or 1
+        latencies = sorted(self.lookup_seconds)
+        return {
+            **self.stats,
+            "entries": self.size,
+            "glossary_entries": self.pinned,
+            "hit_rate": (self.stats["exact_hits"] + self.stats["fuzzy_hits"]) / lookups,
+            "lookup_p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+            "lookup_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        }
+
+    def _best_match(self, key: str, lang: str) -> Optional[Tuple[int, float]]:
+        """Slot of the most similar segment among the LSH candidates and its estimated similarity."""
+        signature = self._signature(key)
+        candidates = set()
+        for table, band_key in zip(self.buckets[lang], self._band_keys(signature)):
+            slots = table.get(band_key)
+            if slots:
+                candidates.update(slots)
+        if not candidates:
+            return None
+
+        slots = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        similarity = (self.signatures[slots] == signature).mean(axis=1)
+        best = int(np.argmax(similarity))
+        return int(slots[best]), float(similarity[best])
+
+    def _signature(self, key: str) -> np.ndarray:
+        signature = self.recent_signatures.get(key)
+        if signature is not None:
+            self.recent_signatures.move_to_end(key)
+            return signature
+        signature = self._compute_signature(key)
+        self.recent_signatures[key] = signature
+        if len(self.recent_signatures) > RECENT_SIGNATURES:
+            self.recent_signatures.popitem(last=False)
+        return signature
+
+    def _compute_signature(self, key: str) -> np.ndarray:
+        codes = np.frombuffer(f" {key} ".encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        count = max(len(codes) - self.shingle_size + 1, 1)
+        shingles = codes[:count].copy()
+        for offset in range(1, min(self.shingle_size, len(codes))):
+            shingles = shingles * SHINGLE_BASE + codes[offset:offset + count]
+        hashes = np.outer(self.multipliers, np.unique(shingles)) + self.increments[:, None]
+        return (hashes >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> Tuple[int, ...]:
+        bands = signature.astype(np.uint64).reshape(self.bands, self.rows)
+        return tuple((bands * self.band_weights).sum(axis=1).tolist())
+
+    def _evict(self, slot: int):
+        lang, key = self.languages[slot], self.sources[slot]
+        for table, band_key in zip(self.buckets[lang], self.band_keys[slot]):
+            slots = table[band_key]
+            slots.remove(slot)
+            if not slots:
+                del table[band_key]
+        del self.exact[(lang, key)]
+        self.sources[slot] = self.targets[slot] = self.languages[slot] = self.band_keys[slot] = None
+        self.size -= 1
+        self.stats["evicted"] += 1
@@ -18,6 +18,24 @@ class ITranslator(ABC):
         """
         pass
 
+    def set_context(self, context) -> None:
+        """
+        Attach the source-side context shared by all target languages.
+        Translators that do not use context ignore it.
+
+        :param context: TranslationContext of the current session.
+        """
+        pass
+
+    def set_glossary(self, glossary) -> None:
+        """
+        Attach the glossary whose terms should be used in translations.
+        Translators that cannot be instructed ignore it.
+
+        :param glossary: TranslationMemory shared by all rooms.
+        """
+        pass
+
 class TranslatorFactory:
 
     def get_translator(self, translator_type: TranslatorType) -> Type[ITranslator]:
@@ -1,57 +1,60 @@
-from collections import deque
+from functools import lru_cache
+from typing import Optional
 
 from openai import AsyncOpenAI
 
-from app.config import OPEN_AI_KEY
+from app.config import OPEN_AI_KEY, OPENAI_MODEL
 from app.services.translators.translator import ITranslator
+from app.services.translators.translation_context import TranslationContext
+from app.services.translators.translation_memory import TranslationMemory
 
 
 def openai_api_key():
     return OPEN_AI_KEY
 
+@lru_cache(maxsize=None)
+def get_openai_client(api_key: str) -> AsyncOpenAI:
+    """One client (and connection pool) per API key, shared by all translators."""
+    return AsyncOpenAI(api_key=api_key)
+
 class OpenAITranslator(ITranslator):
     def __init__(self,
-                 api_key: str = openai_api_key()
+                 api_key: str = openai_api_key(),
+                 context: Optional[TranslationContext] = None,
+                 model: str = OPENAI_MODEL
                  ):
         self.api_key = api_key
-        self.context = deque(maxlen=5)
-
-    async def translate_text(self, text: str, language_code: str):
-
-        translated_text = ""
-        context_text = "\n".join(self.context)
-        self.context.append(text)
+        self.model = model
+        self.context = context or TranslationContext()
+        self.glossary: Optional[TranslationMemory] = None
 
-        openai = AsyncOpenAI(
-            # This is the default and can be omitted
-            api_key=self.api_key,
-        )
+    def set_context(self, context: TranslationContext):
+        self.context = context
 
-        chat_history = []
-        chat_history.append({
-                    "role": "system",
-                    "content": f"You are a professional literary translator. "
-                               f"Translate the following text into {language_code} using a fluent, natural, and contex-aware style."
-                               f"Only return the translated sentence"
-                    })
-        chat_history.append(
-            {"role": "user",
-             "content": (
-                 f"Context:\n{context_text}\n\n"
-                 f"Text:\n{text}\n\n"
-             )
-            }
-        )
+    def set_glossary(self, glossary: TranslationMemory):
+        self.glossary = glossary
 
-        # async with httpx.AsyncClient() as client:
-        #     response = await client.get("https://example.com")
+    async def translate_text(self, text: str, language_code: str):
+        openai = get_openai_client(self.api_key)
+        terms, reference = None, None
+        if self.glossary:
+            terms = self.glossary.terms_in(text, language_code)
+            reference = self.glossary.reference(text, language_code)
 
-        # gpt - 4 - turbo
         response = await openai.responses.create(
-            model="gpt-4-turbo",
-            input=chat_history,
+            model=self.model,
+            input=self.context.build_messages(text, language_code, terms, reference),
         )
 
-        translated_text = response.output_text
-
-        return translated_text
\ No newline at end of file
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            details = getattr(usage, "input_tokens_details", None)
+            self.context.record_usage(
+                prompt_tokens=usage.input_tokens,
+                cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+                completion_tokens=usage.output_tokens
+            )
+        else:
+            self.context.record_usage(prompt_tokens=self.context.estimate_prompt_tokens(text, language_code))
+
+        return response.output_text
@@ -31,8 +31,8 @@ class GoogleTextToSpeech:
         return sorted(list(language_codes))
 
     async def text_to_speech(self, text: str, language_code: str):
-        audio_content = self.synthesize_speech(text, language_code)
-        await asyncio.sleep(1)
+        # The Google client is blocking, keep it off the event loop so utterances overlap
+        audio_content = await asyncio.to_thread(self.synthesize_speech, text, language_code)
         return base64.b64encode(audio_content).decode('utf-8')
 
     def synthesize_speech(self,
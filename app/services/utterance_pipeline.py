@@ -0,0 +1,158 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from app.utils import logger
+
+ProcessFunc = Callable[[str, str, int], Awaitable[dict]]
+ReleaseFunc = Callable[[dict], Awaitable[None]]
+
+
+class ReorderBuffer:
+    def __init__(self, lang: str, release_func: ReleaseFunc, next_seq: int = 0):
+        """
+        Hold finished messages of one language until every earlier utterance is released.
+
+        :param lang: Language code the buffer belongs to.
+        :param release_func: Coroutine receiving messages in speech order.
+        :param next_seq: First sequence number this buffer expects.
+        """
+        self.lang = lang
+        self.release_func = release_func
+        self.next_seq = next_seq
+        self.pending: Dict[int, Optional[dict]] = {}
+        self.mutex = asyncio.Lock()
+
+    async def push(self, seq: int, message: Optional[dict]):
+        """
+        Store the result of utterance ``seq`` and release everything that is now in order.
+
+        :param seq: Sequence number of the utterance.
+        :param message: Message to broadcast, or None if the utterance was dropped.
+        """
+        async with self.mutex:
+            if seq < self.next_seq:
+                return
+            self.pending[seq] = message
+
+            while self.next_seq in self.pending:
+                ready = self.pending.pop(self.next_seq)
+                self.next_seq += 1
+                if ready is not None:
+                    await self.release_func(ready)
+
+    def skip(self, seq: int) -> Awaitable[None]:
+        """Mark utterance ``seq`` as dropped so later utterances are not held back."""
+        return self.push(seq, None)
+
+    def depth(self) -> int:
+        return len(self.pending)
+
+
+class UtterancePipeline:
+    def __init__(self,
+                 process_func: ProcessFunc,
+                 max_in_flight: int = 4,
+                 utterance_timeout: float = 15.0
+    ):
+        """
+        Process several utterances concurrently and release them per language in speech order.
+
+        :param process_func: Coroutine ``(lang, text, seq) -> message`` doing translation and TTS.
+        :param max_in_flight: Maximum number of utterances processed at the same time.
+        :param utterance_timeout: Seconds one language may spend on one utterance before it is
+            skipped, so a stuck call cannot block the stream.
+        """
+        self.process_func = process_func
+        self.max_in_flight = max_in_flight
+        self.utterance_timeout = utterance_timeout
+
+        self.next_seq = 0
+        self.buffers: Dict[str, ReorderBuffer] = {}
+        # Finished utterances, released in speech order to their on_complete callbacks
+        self.completed = ReorderBuffer("", self._release_completed)
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.tasks: Set[asyncio.Task] = set()
+
+        self.stats = {"submitted": 0, "completed": 0, "timeouts": 0, "errors": 0}
+
+    def add_language(self, lang: str, release_func: ReleaseFunc):
+        """
+        Start releasing messages for ``lang``. Utterances submitted before this call are
+        not translated into the new language.
+        """
+        if lang not in self.buffers:
+            self.buffers[lang] = ReorderBuffer(lang, release_func, next_seq=self.next_seq)
+
+    def remove_language(self, lang: str):
+        self.buffers.pop(lang, None)
+
+    def clear(self):
+        self.buffers.clear()
+
+    async def submit(self, text: str,
+                     on_complete: Optional[Callable[[int, str], None]] = None) -> int:
+        """
+        Assign the next sequence number to ``text`` and schedule it.
+
+        Waits only while ``max_in_flight`` utterances are already being processed.
+
+        :param on_complete: Called with ``(seq, text)`` once every language has processed the
+            utterance, in speech order: never before the callbacks of earlier utterances.
+
+        :return: The sequence number of the utterance.
+        """
+        seq = self.next_seq
+        self.next_seq += 1
+        self.stats["submitted"] += 1
+        languages = list(self.buffers.keys())
+
+        await self.in_flight.acquire()
+        task = asyncio.create_task(self._process_utterance(seq, text, languages, on_complete))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return seq
+
+    async def drain(self):
+        """Wait until every submitted utterance has been released or skipped."""
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks), return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            **self.stats,
+            "in_flight": len(self.tasks),
+            "reorder_depth": {lang: buffer.depth() for lang, buffer in self.buffers.items()},
+        }
+
+    async def _process_utterance(self, seq: int, text: str, languages: List[str],
+                                 on_complete: Optional[Callable[[int, str], None]]):
+        completion = None
+        try:
+            await asyncio.gather(*(self._process_language(lang, seq, text) for lang in languages))
+            self.stats["completed"] += 1
+            completion = {"seq": seq, "text": text, "on_complete": on_complete}
+        finally:
+            self.in_flight.release()
+            await self.completed.push(seq, completion)
+
+    @staticmethod
+    async def _release_completed(completion: dict):
+        if completion["on_complete"]:
+            completion["on_complete"](completion["seq"], completion["text"])
+
+    async def _process_language(self, lang: str, seq: int, text: str):
+        message = None
+        try:
+            message = await asyncio.wait_for(self.process_func(lang, text, seq), self.utterance_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            logger.warning("Utterance %d timed out for language %s, skipping it.", seq, lang,
+                           extra={"lang": lang, "seq": seq, "stage": "pipeline", "category": "pipeline.timeout"})
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error("Error processing utterance %d for language %s: %s", seq, lang, e,
+                         extra={"lang": lang, "seq": seq, "stage": "pipeline", "category": "pipeline.error"})
+
+        buffer = self.buffers.get(lang)
+        if buffer:
+            await buffer.push(seq, message)
@@ -0,0 +1,151 @@
+import asyncio
+import re
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.utils import logger
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?…])\s+")
+CLAUSE_BOUNDARY = re.compile(r"(?<=[,;:])\s+")
+WORD_BOUNDARY = re.compile(r"\s+")
+
+
+class UtteranceSegmenter:
+    def __init__(self,
+                 emit_func: Callable[[str], Awaitable[None]],
+                 merge_window: float = 1.2,
+                 min_chars: int = 25,
+                 max_chars: int = 240,
+                 calls_per_segment: Optional[Callable[[], int]] = None,
+                 coalesce_factor: Optional[Callable[[], float]] = None
+    ):
+        """
+        Re-segment final transcripts before they are translated.
+
+        Short finals are held for up to ``merge_window`` seconds and merged with the ones that
+        follow, overly long finals are split at sentence, then clause, then word boundaries.
+
+        :param emit_func: Coroutine receiving each resulting segment.
+        :param merge_window: Seconds a short final waits for the next one.
+        :param min_chars: Segments shorter than this are merged with the next final.
+        :param max_chars: Segments longer than this are split.
+        :param calls_per_segment: Returns the number of upstream calls (translation and TTS
+            over all languages) one segment costs, used for the saved-calls metric.
+        :param coalesce_factor: Returns the current multiplier of ``merge_window`` and
+            ``min_chars``, raised under overload to make fewer, longer segments.
+        """
+        self.emit_func = emit_func
+        self.merge_window = merge_window
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.calls_per_segment = calls_per_segment or (lambda: 1)
+        self.coalesce_factor = coalesce_factor or (lambda: 1.0)
+
+        self.pending: List[str] = []
+        self.flush_task: Optional[asyncio.Task] = None
+        self.mutex = asyncio.Lock()
+
+        self.stats = {
+            "finals_received": 0,
+            "segments_emitted": 0,
+            "finals_merged": 0,
+            "finals_split": 0,
+            "upstream_calls_saved": 0,
+            "upstream_calls_added": 0,
+        }
+
+    async def push(self, text: str):
+        """
+        Accept one final transcript from the transcriber.
+
+        :param text: Final transcript text.
+        """
+        text = text.strip()
+        if not text:
+            return
+
+        async with self.mutex:
+            self.stats["finals_received"] += 1
+            self._cancel_flush()
+            self.pending.append(text)
+
+            if len(" ".join(self.pending)) >= min(self.min_chars * self.coalesce_factor(), self.max_chars):
+                await self._emit_pending()
+            else:
+                self.flush_task = asyncio.create_task(self._flush_after_window())
+
+    async def flush(self):
+        """Emit whatever is pending right away, e.g. before the session stops."""
+        async with self.mutex:
+            self._cancel_flush()
+            await self._emit_pending()
+
+    def get_stats(self) -> Dict[str, int]:
+        return dict(self.stats)
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(self.merge_window * self.coalesce_factor())
+        async with self.mutex:
+            self.flush_task = None
+            await self._emit_pending()
+
+    def _cancel_flush(self):
+        if self.flush_task and not self.flush_task.done() and self.flush_task is not asyncio.current_task():
+            self.flush_task.cancel()
+        self.flush_task = None
+
+    async def _emit_pending(self):
+        if not self.pending:
+            return
+
+        finals = self.pending
+        self.pending = []
+        segments = self.split(" ".join(finals))
+
+        calls = self.calls_per_segment()
+        if len(finals) > 1:
+            self.stats["finals_merged"] += len(finals)
+            self.stats["upstream_calls_saved"] += (len(finals) - 1) * calls
+        if len(segments) > 1:
+            self.stats["finals_split"] += 1
+            self.stats["upstream_calls_added"] += (len(segments) - 1) * calls
+
+        for segment in segments:
+            self.stats["segments_emitted"] += 1
+            try:
+                await self.emit_func(segment)
+            except Exception as e:
+                logger.error(f"Error emitting segment: {e}")
+
+    def split(self, text: str) -> List[str]:
+        """
+        Split ``text`` into segments of at most ``max_chars``, preferring sentence boundaries,
+        then clause boundaries and finally whitespace.
+        """
+        if len(text) <= self.max_chars:
+            return [text]
+        return self._pack(text, [SENTENCE_BOUNDARY, CLAUSE_BOUNDARY, WORD_BOUNDARY])
+
+    def _pack(self, text: str, boundaries: List[re.Pattern]) -> List[str]:
+        if len(text) <= self.max_chars:
+            return [text]
+        if not boundaries:
+            return [text[i:i + self.max_chars] for i in range(0, len(text), self.max_chars)]
+
+        segments: List[str] = []
+        current = ""
+        for piece in boundaries[0].split(text):
+            if len(piece) > self.max_chars:
+                if current:
+                    segments.append(current)
+                    current = ""
+                segments.extend(self._pack(piece, boundaries[1:]))
+            elif not current:
+                current = piece
+            elif len(current) + 1 + len(piece) <= self.max_chars:
+                current = f"{current} {piece}"
+            else:
+                segments.append(current)
+                current = piece
+        if current:
+            segments.append(current)
+        return segments
@@ -1,26 +1,38 @@
 import asyncio
+import json
+import threading
+import time
+from typing import Callable, Optional, Set
+
 from fastapi import WebSocket
 from app.utils import logger
 from app.services.web_socket_connection import WebSocketConnection
 
-BOLD = "\033[1m"
-RESET = "\033[0m"
-
 
 class WebSocketBroadcastManager:
     def __init__(self):
         """
         Initialize WebSocketBroadcastManager to manage client connections.
+
+        Connections remove themselves from ``active_clients`` when they close, so sending a
+        message never has to scan for dead clients. All access happens on the event loop.
         """
-        self.active_clients = set()
-        self.mutex_active_clients = asyncio.Lock()  # Mutex for managing active clients
+        self.active_clients: Set[WebSocketConnection] = set()
+        # Admission checks the client count and adds the client under this lock
+        self.clients_lock = threading.Lock()
+        # Structured log fields (room, lang) shared with every connection
+        self.log_fields: dict = {}
+        # Called with every message once it has been sent, e.g. to measure end-to-end lag
+        self.on_sent: Optional[Callable[[dict], None]] = None
 
         self.buffer = asyncio.Queue(maxsize=512)  # Queue for messages
-        self.mutex_buffer = asyncio.Lock()
 
         self.stop_sending_event = asyncio.Event()
         self.stop_sending_event.clear()
 
+        self.stats = {"messages": 0, "deliveries": 0, "clients_removed": 0, "last_fanout_seconds": 0.0,
+                      "max_fanout_seconds": 0.0}
+
     def has_active_clients(self) -> bool:
         """
         Method to check if there are any active clients.
@@ -32,62 +44,83 @@ class WebSocketBroadcastManager:
 
     async def start_message_broadcasting(self):
         """
-        Broadcast messages to all connected clients.
+        Broadcast messages to all connected clients as soon as they are queued.
         """
         self.stop_sending_event.clear()
 
         while not self.stop_sending_event.is_set():
-            await asyncio.sleep(1)
-            await self._broadcast_messages_logic()
-
-    async def _broadcast_messages_logic(self):
-        message_data = await self._get_message_from_queue()
+            try:
+                # Wake up regularly to notice the stop event
+                message_data = await asyncio.wait_for(self.buffer.get(), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            await self.broadcast(message_data)
+            if self.on_sent:
+                self.on_sent(message_data)
 
-        if not message_data:
+    async def broadcast(self, message_data: dict):
+        """
+        Send one message to every connected client, serializing it once.
+        """
+        if not self.active_clients:
             return
 
-        # Remove clients with is_open == False
-        async with self.mutex_active_clients:
-            self.active_clients = set(client for client in self.active_clients if client.is_open)
-
-        # Prepare tasks for sending messages to all clients
-        text = message_data['translated_text']
-        logger.info(f"Broadcasting data to clients: {text}")
-        tasks = []
-        async with self.mutex_active_clients:
-            for client in self.active_clients:
-                tasks.append(client.send_message(message_data))
+        started = time.perf_counter()
+        text = json.dumps(message_data, ensure_ascii=False)
+        # Snapshot, clients may connect or go away while the sends are awaited
+        clients = tuple(self.active_clients)
+        await asyncio.gather(*(client.send_text(text) for client in clients))
 
-        if tasks:
-            await asyncio.gather(*tasks)
+        fanout_seconds = time.perf_counter() - started
+        self.stats["messages"] += 1
+        self.stats["deliveries"] += len(clients)
+        self.stats["last_fanout_seconds"] = fanout_seconds
+        self.stats["max_fanout_seconds"] = max(self.stats["max_fanout_seconds"], fanout_seconds)
+        logger.info("Broadcast message to %d clients in %.1f ms", len(clients), fanout_seconds * 1000,
+                    extra={**self.log_fields, "seq": message_data.get("seq"), "stage": "broadcast",
+                           "category": "broadcast"})
 
-    async def _get_message_from_queue(self):
-        async with self.mutex_buffer:
-            if not self.buffer.empty():
-                return await self.buffer.get()
-        return ""
-
-    async def handle_connection(self, websocket: WebSocket):
+    async def handle_connection(self, websocket: WebSocket,
+                                admit: Optional[Callable[[int], Optional[str]]] = None) -> Optional[str]:
         """
         Handle WebSocket connections and manage clients.
 
         :param websocket: WebSocket instance representing the client connection.
-        """
-        connection = WebSocketConnection(websocket, disconnect_func=self.disconnect_client)
-
-        async with self.mutex_active_clients:
-            self.active_clients.add(connection)  # Add client to the active clients list
+        :param admit: Called with the number of connected clients, under the same lock as
+            adding the new one; a returned reason rejects the connection.
+        :return: The rejection reason, None once an admitted connection has closed.
+        """
+        connection = WebSocketConnection(websocket, disconnect_func=self.remove_client, log_fields=self.log_fields)
+        with self.clients_lock:
+            rejection = admit(len(self.active_clients)) if admit else None
+            if rejection is None:
+                self.active_clients.add(connection)  # Add client to the active clients list
+        if rejection:
+            return rejection
 
         await connection.accept()
+        return None
 
-    async def enqueue_message(self, text: str):
+    async def enqueue_message(self, message: dict):
         """
         Add a message to the queue for broadcasting.
 
-        :param text: The message to be added to the queue.
+        :param message: The message to be added to the queue.
+        """
+        await self.buffer.put(message)
+
+    async def drain(self, timeout: float, poll_interval: float = 0.1) -> bool:
+        """
+        Wait until every queued message has been broadcast.
+
+        :param timeout: Maximum number of seconds to wait.
+        :return: True if the queue is empty.
         """
-        async with self.mutex_buffer:
-            await self.buffer.put(text)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.buffer.empty() and loop.time() < deadline:
+            await asyncio.sleep(poll_interval)
+        return self.buffer.empty()
 
     async def stop_message_broadcasting(self):
         """
@@ -95,25 +128,31 @@ class WebSocketBroadcastManager:
         """
         self.stop_sending_event.set()
 
+    def remove_client(self, connection: WebSocketConnection):
+        """
+        Forget a connection that has closed; called by the connection itself.
+        """
+        with self.clients_lock:
+            if connection in self.active_clients:
+                self.active_clients.discard(connection)
+                self.stats["clients_removed"] += 1
+
     async def disconnect_client(self, connection: WebSocketConnection):
         """
         Disconnect a client and remove them from the active clients.
 
         :param connection: WebSocketConnection instance of the client to disconnect.
         """
-        async with self.mutex_active_clients:
-            self.active_clients.remove(connection)
-
+        self.remove_client(connection)
         await connection.close()
 
     async def disconnect_clients(self):
         """
         Disconnect all active clients and close their WebSocket connections.
         """
-        async with self.mutex_active_clients:
-            tasks = []
-            for client in self.active_clients:
-                tasks.append(self.disconnect_client(client))
-            await asyncio.gather(*tasks)
+        await asyncio.gather(*(self.disconnect_client(client) for client in tuple(self.active_clients)))
 
         logger.info("All clients have been disconnected.")
+
+    def get_stats(self) -> dict:
+        return {**self.stats, "clients": len(self.active_clients), "queue": self.buffer.qsize()}
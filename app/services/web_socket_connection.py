@@ -3,17 +3,22 @@ from fastapi import WebSocket, WebSocketDisconnect
 from app.utils import logger
 from typing import Callable, Optional
 
-BOLD = "\033[1m"
-RESET = "\033[0m"
-
 class WebSocketConnection:
+    # Thousands of listeners per language, keep the per-connection state compact
+    __slots__ = ("websocket", "is_open", "client_ip", "client_port", "disconnect_func", "on_message_func",
+                 "log_fields")
+
     def __init__(self,
                  websocket: WebSocket,
                  disconnect_func: Optional[Callable[['WebSocketConnection'], None]] = None,
-                 on_message_func: Optional[Callable[[str], None]] = None
+                 on_message_func: Optional[Callable[[str], None]] = None,
+                 log_fields: Optional[dict] = None
     ):
         """
         Initialize the WebSocket connection for a specific client.
+
+        :param disconnect_func: Called once when the connection closes, for whatever reason.
+        :param log_fields: Structured log fields (room, lang) shared by all connections of a language.
         """
         self.websocket = websocket
         self.is_open = True
@@ -21,6 +26,7 @@ class WebSocketConnection:
 
         self.disconnect_func = disconnect_func
         self.on_message_func = on_message_func
+        self.log_fields = log_fields if log_fields is not None else {}
 
     async def accept(self):
         """
@@ -29,29 +35,38 @@ class WebSocketConnection:
         try:
             await self.websocket.accept()  # Accept the WebSocket connection
             self.is_open = True
-            logger.info(f"{BOLD}WebSocket connection accepted for {self.client_ip}:{self.client_port}{RESET}")
+            logger.info("WebSocket connection accepted for %s:%s", self.client_ip, self.client_port,
+                        extra=self._log_extra("ws.connect"))
             await self.__process_messages()
         except WebSocketDisconnect:
             self.is_open = False
-            logger.info("Client disconnected.")
+            logger.info("Client %s:%s disconnected.", self.client_ip, self.client_port,
+                        extra=self._log_extra("ws.disconnect"))
         except Exception as e:
             self.is_open = False
-            logger.error(f"Error accepting WebSocket connection: {e}")
+            logger.error("Error accepting WebSocket connection: %s", e, extra=self._log_extra("ws.error"))
         finally:
             await self.close()
 
-    async def send_message(self, message: str):
+    async def send_message(self, message: dict):
         """
         Method for sending messages to the client.
         """
+        await self.send_text(json.dumps(message, ensure_ascii=False))
+
+    async def send_text(self, text: str):
+        """
+        Send an already serialized message, so a broadcast serializes it once for all clients.
+        """
         try:
             if self.is_open:
-                await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+                await self.websocket.send_text(text)
         except Exception as e:
-            # Error while sending - closing the connection
+            # Error while sending - the client is gone, stop broadcasting to it
             self.is_open = False
-            # Logging the error (could be replaced with a more advanced logger)
-            logger.info(f"Error sending message: {e}")
+            logger.info("Error sending message to %s:%s: %s", self.client_ip, self.client_port, e,
+                        extra=self._log_extra("ws.send_error"))
+            self._notify_disconnect()
 
     async def receive_message(self):
         """
@@ -69,13 +84,22 @@ class WebSocketConnection:
         Close the WebSocket connection with the client.
         """
         if self.is_open:
+            self.is_open = False
             try:
                 await self.websocket.close()
-                self.is_open = False
-                logger.info(f"Client {self.client_ip} port {self.client_port} disconnected.")
+                logger.info("Client %s:%s disconnected.", self.client_ip, self.client_port,
+                            extra=self._log_extra("ws.disconnect"))
             except Exception as e:
-                logger.error(f"Error closing WebSocket connection: {e}")
-            self.disconnect_func(self)
+                logger.error("Error closing WebSocket connection: %s", e, extra=self._log_extra("ws.error"))
+        self._notify_disconnect()
+
+    def _log_extra(self, category: str) -> dict:
+        return {**self.log_fields, "category": category, "stage": "listener"}
+
+    def _notify_disconnect(self):
+        disconnect_func, self.disconnect_func = self.disconnect_func, None
+        if disconnect_func:
+            disconnect_func(self)
 
     async def __process_messages(self):
         """
@@ -87,4 +111,4 @@ class WebSocketConnection:
                 if message and self.on_message_func:
                     self.on_message_func(message)
         except WebSocketDisconnect:
-            self.is_open = False
\ No newline at end of file
+            self.is_open = False
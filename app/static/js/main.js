@@ -11,7 +11,6 @@ function initializeTranslationApp(serverUrl) {
     let socket = null;
     let reconnectInterval = null;
     let isPaused = false;
-    let isPlaying = false;
     let wakeLock = null;
 
     // ------------------ THEME ------------------
@@ -27,42 +26,135 @@ function initializeTranslationApp(serverUrl) {
     }
 
     // ------------------ AUDIO ------------------
-    function playAudio(base64, onEnd) {
-        if (isPlaying) return console.log("Audio already playing.");
-        isPlaying = true;
+    // Clips are decoded as they arrive and scheduled back-to-back on the AudioContext timeline.
+    // Every stream (the live talk, each replayed recording) numbers its clips from 0, so a clip is
+    // identified by stream and seq, and playback follows one stream at a time.
+    const LIVE = 'live';
+    const MAX_BEHIND_LIVE_SECONDS = 10;  // Live clips that would start later than this are dropped
+    const SCHEDULE_LEAD_SECONDS = 0.05;
+    const DECODE_AHEAD = 3;
+    const AudioContextClass = window.AudioContext || window.webkitAudioContext;
+    const audioContext = AudioContextClass ? new AudioContextClass() : null;
+    const clips = new Map();  // "stream/seq" -> {key, stream, seq, base64, decoded, $el, arrivedAt}, not yet played
+    const scheduled = new Map();  // AudioBufferSourceNode -> clip
+    let lastSeq = -1;  // Of the live stream
+    let playbackStream = LIVE;
+    let playbackSeq = null;  // Next clip of playbackStream to schedule, null while stopped
+    let playbackStartedAt = 0;
+    let playbackEnd = 0;  // audioContext time at which the last scheduled clip ends
+    let pumping = false;
+
+    function base64ToArrayBuffer(base64) {
+        const binary = atob(base64);
+        const bytes = new Uint8Array(binary.length);
+        for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+        return bytes.buffer;
+    }
 
-        const audioBlob = new Blob(
-            [new Uint8Array(atob(base64).split('').map(c => c.charCodeAt(0)))],
-            {type: 'audio/mp3'}
-        );
+    function decodeClip(clip) {
+        if (!clip.decoded) {
+            clip.decoded = audioContext.decodeAudioData(base64ToArrayBuffer(clip.base64))
+                .catch(err => {
+                    console.error("Audio decode error:", err);
+                    return null;
+                });
+            clip.base64 = null;
+        }
+        return clip.decoded;
+    }
 
-        const audio = new Audio(URL.createObjectURL(audioBlob));
-        audio.play().catch(console.error);
-        audio.onended = () => {
-            isPlaying = false;
-            onEnd?.();
-        };
+    function clipKey(stream, seq) {
+        return `${stream}/${seq}`;
     }
 
-    async function getNextAudioElement($el) {
-        const $next = $el.next();
-        if ($next.length) return $next;
-        await new Promise(r => setTimeout(r, 500));
-        return getNextAudioElement($el);
+    function pendingClips(stream, fromSeq) {
+        return [...clips.values()]
+            .filter(clip => clip.stream === stream && clip.seq >= fromSeq)
+            .sort((a, b) => a.seq - b.seq);
+    }
+
+    function markClip(clip, icon) {
+        clip.$el.children('span').removeClass('opacity-50 pointer-events-none').text(icon);
+    }
+
+    function addClip(stream, seq, base64, $el) {
+        if (!audioContext) return;
+        const key = clipKey(stream, seq);
+        const clip = {key, stream, seq, base64, decoded: null, $el, arrivedAt: performance.now()};
+        clips.set(key, clip);
+        if (playbackSeq !== null && stream === playbackStream) {
+            decodeClip(clip);
+            pump();
+        }
     }
 
-    async function playAudioFromElement($el) {
-        const audioContent = $el.attr('data-audio-content');
-        if (!audioContent) return;
+    async function pump() {
+        if (pumping) return;
+        pumping = true;
+        try {
+            while (playbackSeq !== null) {
+                const [clip, ...following] = pendingClips(playbackStream, playbackSeq);
+                if (!clip) break;
+                following.slice(0, DECODE_AHEAD).forEach(decodeClip);
+
+                const buffer = await decodeClip(clip);
+                // Playback may have been stopped, restarted elsewhere or cleared meanwhile
+                if (playbackSeq === null || clip.stream !== playbackStream || clip.seq < playbackSeq
+                    || clips.get(clip.key) !== clip) continue;
+                clips.delete(clip.key);
+                playbackSeq = clip.seq + 1;
+                if (!buffer) {
+                    markClip(clip, '✖');
+                    continue;
+                }
 
-        const $icon = $el.children('span');
-        $icon.addClass('opacity-50 pointer-events-none');
+                const now = audioContext.currentTime;
+                const startAt = Math.max(playbackEnd, now + SCHEDULE_LEAD_SECONDS);
+                const behindLive = startAt - now + (performance.now() - clip.arrivedAt) / 1000;
+                if (clip.stream === LIVE && clip.arrivedAt >= playbackStartedAt
+                    && behindLive > MAX_BEHIND_LIVE_SECONDS) {
+                    markClip(clip, '⏭');  // Too late to be useful, catch up with live
+                    continue;
+                }
+
+                const source = audioContext.createBufferSource();
+                source.buffer = buffer;
+                source.connect(audioContext.destination);
+                source.onended = () => {
+                    scheduled.delete(source);
+                    markClip(clip, '✔');
+                };
+                source.start(startAt);
+                scheduled.set(source, clip);
+                playbackEnd = startAt + buffer.duration;
+                clip.$el.children('span').addClass('opacity-50 pointer-events-none');
+            }
+        } finally {
+            pumping = false;
+        }
+    }
 
-        playAudio(audioContent, async () => {
-            $el.removeAttr('data-audio-content');
-            $icon.text('✔');
-            await playAudioFromElement(await getNextAudioElement($el));
+    function stopPlayback() {
+        playbackSeq = null;
+        scheduled.forEach((clip, source) => {
+            source.onended = null;
+            source.stop();
+            // Not heard yet, keep it playable
+            clips.set(clip.key, clip);
+            markClip(clip, '🔊');
         });
+        scheduled.clear();
+        playbackEnd = 0;
+    }
+
+    function playFrom(stream, seq) {
+        if (!audioContext) return console.log("Web Audio is not supported.");
+        stopPlayback();
+        audioContext.resume().catch(console.error);
+        playbackStream = stream;
+        playbackSeq = seq;
+        playbackStartedAt = performance.now();
+        pump();
     }
 
     // ------------------ SOCKET ------------------
@@ -94,8 +186,9 @@ function initializeTranslationApp(serverUrl) {
             reconnecting = false;
         };
 
-        socket.onclose = () => {
-            $serviceMessageOutput.text('Disconnected');
+        socket.onclose = event => {
+            // 1013: the server is at its listener limit, retry later
+            $serviceMessageOutput.text(event.code === 1013 ? `Server busy: ${event.reason}` : 'Disconnected');
             $serviceMessageOutputIcon?.removeClass('blinking');
             reconnecting = false;
 
@@ -117,6 +210,7 @@ function initializeTranslationApp(serverUrl) {
             try {
                 const msg = JSON.parse(data);
                 if (msg.translated_text) addText(msg);
+                if (!msg.replay) lastSeq = Math.max(lastSeq, msg.seq ?? lastSeq);
             } catch (err) {
                 console.error("Invalid message data", err);
             }
@@ -124,10 +218,11 @@ function initializeTranslationApp(serverUrl) {
     }
 
     // ------------------ UI HELPERS ------------------
-    function addText({original_text, translated_text, audio_content}) {
+    function addText({seq, original_text, translated_text, audio_content, replay}) {
         if (isPaused) return;
+        const stream = replay ? `replay:${replay}` : LIVE;
 
-        $('<div class="flex items-center w-full">')
+        const $message = $('<div class="flex items-center w-full">')
             .append(
                 $('<div class="message bg-blue-100 dark:bg-blue-800 text-blue-900 dark:text-blue-100 rounded-lg px-4 py-2 flex-1">')
                     .text(translated_text)
@@ -135,10 +230,10 @@ function initializeTranslationApp(serverUrl) {
             )
             .append(
                 $('<span class="message-audio-icon ml-2 cursor-pointer w-1/12 text-center">🔊</span>')
-                    .on('click', () => playAudioFromElement($(event.currentTarget).parent()))
+                    .on('click', () => playFrom(stream, seq))
             )
-            .attr('data-audio-content', audio_content || null)
             .appendTo($textDisplay);
+        if (audio_content) addClip(stream, seq, audio_content, $message);
 
         setTimeout(() => {
             $textDisplay.scrollTop($textDisplay[0].scrollHeight);
@@ -146,6 +241,8 @@ function initializeTranslationApp(serverUrl) {
     }
 
     function clearText() {
+        stopPlayback();
+        clips.clear();
         $textDisplay.empty();
     }
 
@@ -178,7 +275,9 @@ function initializeTranslationApp(serverUrl) {
             getButton('', '/static/img/refresh-cw-alt-1-svgrepo-com.svg', 'clear', clearText),
             $pauseBtn,
             getButton('', '/static/img/audio.svg', 'audio', () => {
-                $textDisplay.children().each((_, el) => playAudioFromElement($(el)));
+                // From the oldest live clip not heard yet, or from the next one to arrive
+                const [first] = pendingClips(LIVE, -Infinity);
+                playFrom(LIVE, first ? first.seq : lastSeq + 1);
             }),
             getButton('', '/static/img/settings-cog-svgrepo-com.svg', 'settings', () => window.location.href = "/settings")
         );
@@ -193,7 +292,10 @@ function initializeTranslationApp(serverUrl) {
                 headers: {"Content-Type": "application/json"},
                 body: JSON.stringify({lang})
             });
-            if (!res.ok) throw new Error((await res.json()).detail);
+            if (!res.ok) {
+                const body = await res.json();
+                throw new Error(body.detail || body.message);
+            }
             socket?.close(1000, 'Lang switch');
             connectWebSocket(lang);
         } catch (err) {
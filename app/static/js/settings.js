@@ -101,8 +101,69 @@
         }
     });
 
+    // ------------------ STATUS EVENTS ------------------
+    const statusEventKinds = ['transcriber', 'queue', 'clients', 'provider', 'pipeline', 'rooms', 'overload', 'loop'];
+    const maxStatusLines = 200;
+
+    function describeStatusEvent(event) {
+        const room = event.room ? `[${event.room}] ` : '';
+        const data = event.data;
+        switch (event.kind) {
+            case 'transcriber':
+                if (data.key === 'reconnects') {
+                    return `${room}transcriber reconnected ${data.reconnects} times, last gap ${data.last_gap_seconds}s`;
+                }
+                return `${room}transcriber ${data.status}${data.message ? ': ' + data.message : ''}`;
+            case 'queue':
+                return `${room}${data.key}: broadcast queue ${data.broadcast_queue}, reorder buffer ${data.reorder_buffer}`;
+            case 'clients':
+                return `${room}${data.key}: ${data.clients} clients`;
+            case 'provider':
+                return `${data.key} ${data.healthy ? 'healthy' : 'failing: ' + data.error}`;
+            case 'pipeline':
+                return `${room}${data.in_flight} utterances in flight`;
+            case 'rooms':
+                return `rooms: ${data.rooms.join(', ')}`;
+            case 'overload':
+                return `overload level ${data.level} (pressure ${data.pressure})`;
+            case 'loop':
+                return `event loop blocked ${data.stall_seconds}s at ${data.where}`;
+            default:
+                return JSON.stringify(data);
+        }
+    }
+
+    function renderStatusEvent(event) {
+        const $output = $('#service-status-output');
+        const time = new Date(event.time * 1000).toLocaleTimeString();
+        $('<p>').text(`${time} ${describeStatusEvent(event)}`).appendTo($output);
+
+        // Keep the page bounded like the server-side ring
+        const $lines = $output.children();
+        if ($lines.length > maxStatusLines) {
+            $lines.slice(0, $lines.length - maxStatusLines).remove();
+        }
+        if (event.kind === 'transcriber' && event.data.status && (!event.room || event.room === 'default')) {
+            $('#service-message-output').text(`Transcriber: ${event.data.status || ''}`);
+        }
+    }
+
+    function subscribeToStatusEvents() {
+        const source = new EventSource('/api/events');
+        statusEventKinds.forEach(kind => source.addEventListener(kind, ({data}) => {
+            try {
+                renderStatusEvent(JSON.parse(data));
+            } catch (err) {
+                console.error("Invalid status event", err);
+            }
+        }));
+        source.onerror = () => $('#service-message-output').text('Status stream disconnected, retrying...');
+        source.onopen = () => $('#service-message-output').text('Status stream connected');
+    }
+
     // Function to load the current state when the page loads
     window.onload = async function () {
+        subscribeToStatusEvents();
         try {
             // Send a GET request to the /api/state_json endpoint to fetch the current state
             const response_json = await sendRequest('/api/state_json', 'GET');
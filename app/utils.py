@@ -2,9 +2,12 @@ import logging
 import hashlib
 import os
 
+from app.config import LOG_FORMAT, LOG_LEVEL, LOG_RATE_LIMITS, LOG_SAMPLING
+from app.logging_setup import setup_logging
+
 # Logging configuration
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
+setup_logging(LOG_LEVEL, LOG_FORMAT, LOG_SAMPLING, LOG_RATE_LIMITS)
 
 def generate_version(file_path: str) -> str:
     with open(os.getcwd() + file_path, "rb") as f:
@@ -0,0 +1,104 @@
+"""
+Local stand-in for the AssemblyAI realtime service that drops connections.
+
+Speaks enough of the realtime protocol for ``aai.RealtimeTranscriber``: it sends
+``SessionBegins``, answers ``terminate_session`` with ``SessionTerminated`` and emits a
+``FinalTranscript`` every ``final_every`` audio chunks. Each chunk is expected to start with
+its frame number (uint32, little endian), and the transcript text lists the received frame
+numbers, so a client can check what reached the service. ``audio_start`` and ``audio_end`` are
+the milliseconds of session audio the transcript covers, like in the real service. Every ``drop_after`` seconds the
+connection is closed with code 1011, losing the frames not yet finalized.
+
+    ASSEMBLYAI_BASE_URL=ws://127.0.0.1:8765 ...
+    python -m benchmarks.fake_realtime_asr --port 8765 --drop-after 5
+"""
+import argparse
+import asyncio
+import json
+import struct
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import uvicorn
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+FRAME_HEADER = struct.Struct("<I")
+
+
+def create_app(drop_after: float = 5.0, final_every: int = 10) -> FastAPI:
+    app = FastAPI()
+    app.state.sessions = 0
+    app.state.drops = 0
+
+    @app.websocket("/v2/realtime/ws")
+    async def realtime(websocket: WebSocket):
+        await websocket.accept()
+        app.state.sessions += 1
+        await websocket.send_text(json.dumps({
+            "message_type": "SessionBegins",
+            "session_id": str(uuid.uuid4()),
+            "expires_at": (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),
+        }))
+
+        bytes_per_ms = int(websocket.query_params.get("sample_rate", 16_000)) * 2 / 1000
+        frames: List[int] = []
+        received = finalized = 0
+        deadline = time.monotonic() + drop_after if drop_after > 0 else None
+        try:
+            while True:
+                timeout = max(0.0, deadline - time.monotonic()) if deadline else None
+                try:
+                    message = await asyncio.wait_for(websocket.receive(), timeout)
+                except asyncio.TimeoutError:
+                    app.state.drops += 1
+                    await websocket.close(code=1011, reason="Simulated connection loss")
+                    return
+
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("text"):
+                    if json.loads(message["text"]).get("terminate_session"):
+                        await _send_final(websocket, frames, finalized / bytes_per_ms, received / bytes_per_ms)
+                        await websocket.send_text(json.dumps({"message_type": "SessionTerminated"}))
+                        await websocket.close()
+                        return
+                    continue
+
+                frames.append(FRAME_HEADER.unpack_from(message["bytes"])[0])
+                received += len(message["bytes"])
+                if len(frames) >= final_every:
+                    await _send_final(websocket, frames, finalized / bytes_per_ms, received / bytes_per_ms)
+                    frames = []
+                    finalized = received
+        except WebSocketDisconnect:
+            return
+
+    return app
+
+
+async def _send_final(websocket: WebSocket, frames: List[int], audio_start: float, audio_end: float):
+    if not frames:
+        return
+    await websocket.send_text(json.dumps({
+        "message_type": "FinalTranscript",
+        "text": " ".join(map(str, frames)),
+        "audio_start": round(audio_start),
+        "audio_end": round(audio_end),
+        "confidence": 1.0,
+        "words": [],
+        "created": datetime.now(timezone.utc).isoformat(),
+        "punctuated": True,
+        "text_formatted": True,
+    }))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--drop-after", type=float, default=5.0)
+    parser.add_argument("--final-every", type=int, default=10)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.drop_after, args.final_every), host=args.host, port=args.port)
@@ -0,0 +1,140 @@
+"""
+Memory per listener connection and fanout time per message for one language.
+
+Connects ``--clients`` fake listener sockets to a ``WebSocketBroadcastManager`` through
+``handle_connection``, like the ``/ws/transcribe`` endpoint does, and reports:
+
+- memory per connection: everything allocated for it (connection object, handler task and
+  its coroutine frames, set entry), measured with tracemalloc; the fake socket is excluded;
+- the size of the connection object itself, with ``__slots__`` and as a plain ``__dict__`` object;
+- fanout time per message (p50/p95 over ``--messages`` broadcasts of a ``--payload-kb`` message);
+- how clients that disconnect are removed, without any scan on the send path.
+
+    python -m benchmarks.fanout_benchmark --clients 1000 2000 5000 10000
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from starlette.websockets import WebSocketDisconnect
+
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from app.services.web_socket_connection import WebSocketConnection
+
+
+class FakeListenerSocket:
+    __slots__ = ("client", "received", "disconnected")
+
+    def __init__(self, index: int):
+        self.client = ("10.0.0.1", index)
+        self.received = 0
+        self.disconnected = asyncio.get_running_loop().create_future()
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        # Listeners never send anything, they only go away
+        await self.disconnected
+        raise WebSocketDisconnect(1000)
+
+    async def send_text(self, text: str):
+        self.received += 1
+
+    async def close(self):
+        if not self.disconnected.done():
+            self.disconnected.set_result(None)
+
+
+class DictConnection:
+    """WebSocketConnection state without __slots__, for comparison."""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.is_open = True
+        self.client_ip, self.client_port = websocket.client
+        self.disconnect_func = None
+        self.on_message_func = None
+
+
+def object_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+async def run(client_count: int, args) -> dict:
+    manager = WebSocketBroadcastManager()
+    sockets = [FakeListenerSocket(i) for i in range(client_count)]
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tasks = [asyncio.create_task(manager.handle_connection(socket)) for socket in sockets]
+    await asyncio.sleep(0)  # Let every handler accept and wait for messages
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    memory = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+    message = {"seq": 0, "lang": "fr", "original_text": "Bonjour " * 8, "translated_text": "Hello " * 8,
+               "audio_content": "A" * (args.payload_kb * 1024)}
+    fanouts = []
+    for seq in range(args.messages):
+        message["seq"] = seq
+        started = time.perf_counter()
+        await manager.broadcast(message)
+        fanouts.append(time.perf_counter() - started)
+    fanouts.sort()
+
+    # A tenth of the listeners leave, they must be gone before the next broadcast
+    leaving = sockets[::10]
+    for socket in leaving:
+        await socket.close()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    remaining = len(manager.active_clients)
+
+    await manager.disconnect_clients()
+    await asyncio.gather(*tasks)
+    delivered = sum(socket.received for socket in sockets)
+
+    return {
+        "clients": client_count,
+        "memory_per_connection": memory / client_count,
+        "p50": statistics.median(fanouts),
+        "p95": fanouts[int(len(fanouts) * 0.95)],
+        "delivered": delivered / (client_count * args.messages),
+        "removed_on_disconnect": client_count - remaining == len(leaving),
+    }
+
+
+async def main(args):
+    loop_socket = FakeListenerSocket(0)
+    print(f"connection object: {object_size(WebSocketConnection(loop_socket))} bytes with __slots__, "
+          f"{object_size(DictConnection(loop_socket))} bytes with __dict__")
+    print(f"{'clients':>8} {'bytes/conn':>11} {'fanout p50 ms':>14} {'fanout p95 ms':>14} "
+          f"{'us/client':>10} {'delivered':>10} {'removed on disconnect':>22}")
+    for client_count in args.clients:
+        result = await run(client_count, args)
+        print(f"{result['clients']:>8} {result['memory_per_connection']:>11.0f} {result['p50'] * 1000:>14.2f} "
+              f"{result['p95'] * 1000:>14.2f} {result['p50'] / client_count * 1e6:>10.2f} "
+              f"{result['delivered']:>10.1%} {'yes' if result['removed_on_disconnect'] else 'no':>22}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1000, 2000, 5000, 10000])
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--payload-kb", type=int, default=32, help="size of the audio field of a message")
+    logging.disable(logging.INFO)
+    asyncio.run(main(parser.parse_args()))
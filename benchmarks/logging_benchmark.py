@@ -0,0 +1,76 @@
+"""
+Time a log call takes on the calling thread, queued to a writer thread versus written inline.
+
+Logs ``--records`` hot-path records (a broadcast line with room, lang, seq and stage fields)
+through the queue handler installed by ``setup_logging`` and through a plain ``StreamHandler``
+writing the same JSON, and reports the per-call p50/p99/max on the calling thread. The output
+goes to ``--output`` (``/dev/null`` by default) so the terminal does not slow the writer down.
+
+    python -m benchmarks.logging_benchmark --records 50000
+"""
+import argparse
+import logging
+import os
+import queue
+import statistics
+import time
+from logging.handlers import QueueListener
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.logging_setup import BackgroundQueueHandler, CategoryThrottle, JsonFormatter, parse_settings
+
+
+def measure(logger: logging.Logger, records: int) -> list:
+    durations = []
+    for seq in range(records):
+        started = time.perf_counter()
+        logger.info("Broadcast message to %d clients in %.1f ms", 500, 3.2,
+                    extra={"room": "bench", "lang": "fr", "seq": seq, "stage": "broadcast",
+                           "category": "broadcast"})
+        durations.append(time.perf_counter() - started)
+    durations.sort()
+    return durations
+
+
+def report(label: str, durations: list):
+    print(f"{label:>26} {statistics.median(durations) * 1e6:>8.1f} "
+          f"{durations[int(len(durations) * 0.99)] * 1e6:>8.1f} {durations[-1] * 1e6:>9.1f}")
+
+
+def main(args):
+    output = open(args.output, "w")
+    logger = logging.getLogger("benchmark")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    print(f"{'handler':>26} {'p50 us':>8} {'p99 us':>8} {'max us':>9}")
+
+    inline = logging.StreamHandler(output)
+    inline.setFormatter(JsonFormatter())
+    logger.handlers[:] = [inline]
+    report("inline json", measure(logger, args.records))
+
+    throttled = logging.StreamHandler(output)
+    throttled.setFormatter(JsonFormatter())
+    throttled.addFilter(CategoryThrottle(parse_settings(args.sampling), {}))
+    logger.handlers[:] = [throttled]
+    report("inline json, sampled", measure(logger, args.records))
+
+    # The handler setup_logging installs, with the writer thread writing to the same output
+    records = queue.SimpleQueue()
+    queued = BackgroundQueueHandler(records)
+    listener = QueueListener(records, inline)
+    listener.start()
+    logger.handlers[:] = [queued]
+    report("queued json", measure(logger, args.records))
+    queued.addFilter(CategoryThrottle(parse_settings(args.sampling), {}))
+    report("queued json, sampled", measure(logger, args.records))
+    listener.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50_000)
+    parser.add_argument("--sampling", default="broadcast=0.01")
+    parser.add_argument("--output", default=os.devnull)
+    main(parser.parse_args())
@@ -0,0 +1,71 @@
+"""
+Check that the loop watchdog catches a blocking call and that the profiler sees busy threads.
+
+Blocks the event loop with ``time.sleep`` inside ``blocking_call_under_test`` while the
+``LoopWatchdog`` runs, then samples all threads with ``sample_profile`` while a worker thread
+spins in ``busy_worker_under_test``. Prints the captured stall and the hottest collapsed stacks,
+and exits with status 1 unless the stall stack and the profile both name the right function.
+
+    python -m benchmarks.loop_stall_check --block 0.6 --profile-seconds 1
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.loop_watchdog import LoopWatchdog, sample_profile
+
+
+def blocking_call_under_test(seconds: float):
+    time.sleep(seconds)
+
+
+def busy_worker_under_test(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+async def main(args) -> int:
+    watchdog = LoopWatchdog(stall_threshold=args.threshold)
+    watchdog.start()
+    await asyncio.sleep(0.5)
+    blocking_call_under_test(args.block)
+    await asyncio.sleep(0.5)
+    watchdog.stop()
+
+    stats = watchdog.get_stats()
+    stall = stats["recent_stalls"][0] if stats["recent_stalls"] else None
+    print(f"stalls {stats['stalls']}, max lag {stats['max_lag_seconds']:.3f}s, "
+          f"lag p50 {stats['lag_p50_seconds'] * 1000:.1f} ms")
+    if stall:
+        print(f"stall of {stall['seconds']}s, innermost frames:\n" +
+              "\n".join(stall["stack"].strip().splitlines()[-4:]))
+    stall_found = stall is not None and "blocking_call_under_test" in stall["stack"]
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_worker_under_test, args=(stop,), name="busy-worker")
+    worker.start()
+    collapsed = await asyncio.to_thread(sample_profile, args.profile_seconds)
+    stop.set()
+    worker.join()
+    lines = collapsed.splitlines()
+    print(f"{len(lines)} distinct stacks, hottest:")
+    for line in lines[:3]:
+        print("  " + line[-160:])
+    profile_found = any(line.startswith("busy-worker;") and "busy_worker_under_test" in line for line in lines)
+
+    return 0 if stall_found and profile_found else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--block", type=float, default=0.6)
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--profile-seconds", type=float, default=1.0)
+    logging.disable(logging.WARNING)
+    sys.exit(asyncio.run(main(parser.parse_args())))
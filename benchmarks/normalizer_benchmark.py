@@ -0,0 +1,61 @@
+"""
+Throughput of the input normalization stage in seconds of audio per CPU-second.
+
+Feeds ``--seconds`` of a two-tone signal through ``AudioNormalizer`` for common input formats,
+in blocks of ``--block-ms`` like a browser or a network source would send them, and reports
+how many seconds of audio are normalized per CPU-second and the level of the output tone.
+
+    python -m benchmarks.normalizer_benchmark --seconds 60 --block-ms 20
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.transcribers.audio_normalizer import AudioFormat, AudioNormalizer
+
+FORMATS = [
+    AudioFormat(48_000, 2, "float32"),
+    AudioFormat(48_000, 1, "int16"),
+    AudioFormat(44_100, 2, "int16"),
+    AudioFormat(32_000, 1, "float32"),
+    AudioFormat(16_000, 1, "int16"),
+    AudioFormat(8_000, 1, "int16"),
+]
+
+
+def test_signal(audio_format: AudioFormat, seconds: float, block_ms: int):
+    t = np.arange(int(audio_format.sample_rate * seconds)) / audio_format.sample_rate
+    mono = 0.3 * np.sin(2 * np.pi * 440 * t) + 0.2 * np.sin(2 * np.pi * 1800 * t)
+    frames = np.repeat(mono[:, None], audio_format.channels, axis=1)
+    if audio_format.sample_format == "int16":
+        frames = frames * 32767
+    data = frames.astype(audio_format.sample_format).tobytes()
+    block = audio_format.sample_rate * block_ms // 1000 * audio_format.bytes_per_frame
+    return [data[i:i + block] for i in range(0, len(data), block)]
+
+
+def main(args):
+    print(f"{'input':>24} {'audio s / cpu s':>16} {'output rms':>11}")
+    for audio_format in FORMATS:
+        blocks = test_signal(audio_format, args.seconds, args.block_ms)
+        normalizer = AudioNormalizer(lambda sample_rate: iter(blocks), audio_format)
+        started = time.process_time()
+        chunks = list(normalizer(args.output_rate))
+        cpu_seconds = time.process_time() - started
+
+        output = np.frombuffer(b"".join(chunks), dtype=np.int16)[args.output_rate:].astype(np.float64) / 32767
+        rms = np.sqrt(np.mean(output ** 2))
+        label = f"{audio_format.sample_rate} Hz {audio_format.channels} ch {audio_format.sample_format}"
+        print(f"{label:>24} {args.seconds / cpu_seconds:>16.0f} {rms:>11.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--block-ms", type=int, default=20)
+    parser.add_argument("--output-rate", type=int, default=16_000)
+    main(parser.parse_args())
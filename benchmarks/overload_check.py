@@ -0,0 +1,89 @@
+"""
+Check that the overload controller degrades under load and recovers afterwards.
+
+One room with slow fake providers (TTS calls share ``--tts-slots`` slots) receives a final
+transcript every ``--interval`` seconds for ``--load-time`` seconds, then nothing. The script
+prints the degradation level and the p90 end-to-end lag every second and exits with status 1
+unless the level rose above NORMAL under load and came back to NORMAL afterwards, driven by the
+controller's own periodic evaluation (reading the level does not re-evaluate it).
+
+    python -m benchmarks.overload_check --load-time 30 --recover-time 40
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.overload_controller import DegradationLevel, OverloadController
+from app.services.room_manager import RoomManager
+from app.services.shared_resources import SharedResources
+from app.services.translators.translator import TranslatorType
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from benchmarks.rooms_benchmark import FakeTextToSpeech, FakeTranslator
+
+
+async def report(controller: OverloadController, stop: asyncio.Event, levels: list):
+    started = time.monotonic()
+    while not stop.is_set():
+        stats = controller.get_stats()
+        levels.append(controller.level)
+        print(f"{time.monotonic() - started:5.0f}s level {stats['level']:<13} pressure {stats['pressure']:5.2f} "
+              f"lag p90 {stats['p90']['lag']:5.2f}s tts wait p90 {stats['p90']['tts']:5.2f}s "
+              f"tts skipped {stats['tts_skipped']}")
+        await asyncio.sleep(1)
+
+
+async def main(args) -> int:
+    controller = OverloadController(latency_budget=args.budget, queue_budget=args.budget / 4,
+                                    hold_seconds=args.hold)
+    controller.start()
+    resources = SharedResources(
+        translator_type=TranslatorType.OPENAI,
+        tts=FakeTextToSpeech(args.tts_latency),
+        translator_factory=lambda: FakeTranslator(0.2),
+        max_concurrent_tts=args.tts_slots,
+        tts_cache_size=0,
+        overload=controller
+    )
+    room = RoomManager(resources=resources).create_room("overload-check")
+    for lang in ("fr", "de", "es"):
+        await room.add_language(lang, WebSocketBroadcastManager())
+
+    levels = []
+    stop = asyncio.Event()
+    reporter = asyncio.create_task(report(controller, stop, levels))
+
+    deadline = time.monotonic() + args.load_time
+    utterance = 0
+    while time.monotonic() < deadline:
+        utterance += 1
+        await room.segmenter.push(f"This is utterance number {utterance} of the overload check.")
+        await asyncio.sleep(args.interval)
+    under_load = max(levels, default=DegradationLevel.NORMAL)
+
+    await asyncio.sleep(args.recover_time)
+    stop.set()
+    await reporter
+    await room.pipeline.drain()
+
+    recovered = controller.level == DegradationLevel.NORMAL
+    controller.stop()
+    print(f"highest level under load: {under_load.name}, level after load: {controller.level.name}")
+    return 0 if under_load > DegradationLevel.NORMAL and recovered else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--load-time", type=float, default=30)
+    parser.add_argument("--recover-time", type=float, default=40)
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=1.0)
+    parser.add_argument("--tts-slots", type=int, default=2)
+    parser.add_argument("--budget", type=float, default=2.0)
+    parser.add_argument("--hold", type=float, default=3.0)
+    logging.disable(logging.WARNING)
+    sys.exit(asyncio.run(main(parser.parse_args())))
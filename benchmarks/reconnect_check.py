@@ -0,0 +1,98 @@
+"""
+Check that the transcriber survives dropped realtime sessions without losing audio.
+
+Starts the fake realtime service from ``benchmarks.fake_realtime_asr``, which closes every
+session after ``--drop-after`` seconds, and streams numbered 100 ms frames through a
+``Transcriber`` for ``--run-time`` seconds. The transcripts list the frames the service
+finalized; the script reports reconnects, gap durations, replayed and duplicated frames, and
+exits with status 1 when any frame sent before the stop never got transcribed or got
+transcribed twice.
+
+    python -m benchmarks.reconnect_check --run-time 20 --drop-after 3
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+import assemblyai as aai
+import uvicorn
+
+from app.services.transcribers.transcriber import Transcriber
+from benchmarks.fake_realtime_asr import FRAME_HEADER, create_app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def numbered_audio_source(frame_interval: float):
+    def source(sample_rate: int):
+        padding = bytes(int(sample_rate * 0.1) * 2 - FRAME_HEADER.size)
+        frame = 0
+        while True:
+            time.sleep(frame_interval)
+            yield FRAME_HEADER.pack(frame) + padding
+            frame += 1
+    return source
+
+
+async def main(args) -> int:
+    port = free_port()
+    app = create_app(drop_after=args.drop_after, final_every=args.final_every)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+    aai.settings.base_url = f"ws://127.0.0.1:{port}"
+    aai.settings.api_key = aai.settings.api_key or "fake-key"
+
+    received = Counter()
+
+    async def handle_transcription(text: str):
+        received.update(int(frame) for frame in text.split())
+
+    transcriber = Transcriber(
+        _handle_transcription=handle_transcription,
+        audio_source=numbered_audio_source(args.frame_interval),
+        reconnect_base_delay=args.base_delay,
+        reconnect_max_delay=args.max_delay,
+    )
+    await transcriber.start()
+    await asyncio.sleep(args.run_time)
+    await transcriber.stop()
+    server.should_exit = True
+
+    stats = transcriber.get_stats()
+    # Ring buffer indices match frame numbers, the last frame read from the source may not have been sent
+    frames_sent = range(transcriber.last_sent_index + 1)
+    missing = sorted(set(frames_sent) - set(received))
+    duplicates = sum(count - 1 for count in received.values())
+    print(f"sessions opened: {app.state.sessions}, connections dropped: {app.state.drops}")
+    print(f"reconnects: {stats['reconnects']} in {stats['reconnect_attempts']} attempts, "
+          f"last gap {stats['last_gap_seconds'] * 1000:.0f} ms, total gap {stats['total_gap_seconds'] * 1000:.0f} ms")
+    print(f"frames sent: {len(frames_sent)}, transcribed: {len(received)}, replayed: {stats['chunks_replayed']}, "
+          f"duplicates: {duplicates}, missing: {len(missing)} {missing[:20]}, "
+          f"duplicate finals dropped: {stats['duplicate_finals_dropped']}")
+    return 0 if not missing and not duplicates and stats["reconnects"] >= app.state.drops > 0 else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run-time", type=float, default=20.0)
+    parser.add_argument("--drop-after", type=float, default=3.0)
+    parser.add_argument("--final-every", type=int, default=10)
+    parser.add_argument("--frame-interval", type=float, default=0.1)
+    parser.add_argument("--base-delay", type=float, default=0.2)
+    parser.add_argument("--max-delay", type=float, default=2.0)
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main(parser.parse_args())))
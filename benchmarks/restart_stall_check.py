@@ -0,0 +1,102 @@
+"""
+Check that starting and stopping a room never stalls the event loop.
+
+The AssemblyAI client is replaced by a fake whose connect and close block like the real
+ones over a slow network, the audio source delivers 100 ms chunks in real time. While the
+room is restarted several times a ticker measures event loop lag; the script exits with
+status 1 when the worst lag exceeds ``--max-lag``.
+
+    python -m benchmarks.restart_stall_check --cycles 3 --max-lag 0.05
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+import uuid
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+import assemblyai as aai
+
+from app.services.room_manager import RoomManager
+from app.services.shared_resources import SharedResources
+from app.services.translators.translator import TranslatorType
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from benchmarks.rooms_benchmark import FakeTextToSpeech, FakeTranslator, measure_loop_lag
+
+
+class BlockingRealtimeTranscriber:
+    connect_delay = 1.0
+    close_delay = 2.0
+
+    def __init__(self, sample_rate, on_data, on_error, on_open, on_close, **kwargs):
+        self.on_data = on_data
+        self.on_open = on_open
+        self.on_close = on_close
+        self.chunks = 0
+
+    def connect(self, timeout=10.0):
+        time.sleep(self.connect_delay)
+        self.on_open(aai.RealtimeSessionOpened(session_id=uuid.uuid4(), expires_at="2024-01-01T00:00:00"))
+
+    def stream(self, data):
+        self.chunks += 1
+        if self.chunks % 20 == 0:
+            self.on_data(aai.RealtimeFinalTranscript(
+                message_type=aai.RealtimeMessageTypes.final_transcript, text=f"Final transcript number {self.chunks}.",
+                audio_start=0, audio_end=0, confidence=1.0, words=[], created="2024-01-01T00:00:00",
+                punctuated=True, text_formatted=True
+            ))
+
+    def close(self):
+        time.sleep(self.close_delay)
+        self.on_close()
+
+
+def realtime_audio_source(sample_rate: int):
+    chunk = bytes(int(sample_rate * 0.1) * 2)
+    while True:
+        time.sleep(0.1)
+        yield chunk
+
+
+async def main(args) -> int:
+    aai.RealtimeTranscriber = BlockingRealtimeTranscriber
+    resources = SharedResources(
+        translator_type=TranslatorType.OPENAI,
+        tts=FakeTextToSpeech(0.2),
+        translator_factory=lambda: FakeTranslator(0.3)
+    )
+    manager = RoomManager(resources=resources)
+    room = manager.create_room("stall-check")
+    room.transcriber.audio_source = realtime_audio_source
+
+    lags = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lags, stop))
+
+    for cycle in range(args.cycles):
+        await room.add_language("fr", WebSocketBroadcastManager())
+        started = time.perf_counter()
+        await room.start_working_tasks()
+        await asyncio.sleep(args.run_time)
+        await room.stop_working_tasks()
+        print(f"cycle {cycle + 1}: restart took {time.perf_counter() - started - args.run_time:.2f}s, "
+              f"state {room.transcriber.get_status()['status']}")
+
+    stop.set()
+    await lag_task
+    worst = max(lags)
+    print(f"worst event loop lag during restarts: {worst * 1000:.1f} ms (limit {args.max_lag * 1000:.0f} ms)")
+    return 0 if worst <= args.max_lag else 1
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=3)
+    parser.add_argument("--run-time", type=float, default=3.0)
+    parser.add_argument("--max-lag", type=float, default=0.05)
+    logging.disable(logging.INFO)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,141 @@
+"""
+How many rooms can one process sustain?
+
+Runs rooms with fake translation and TTS providers (fixed latency) and fake listeners,
+feeds each room one final transcript every ``--interval`` seconds and reports end-to-end
+latency and event loop lag for an increasing number of rooms.
+
+    python -m benchmarks.rooms_benchmark --rooms 1 2 4 8 16 32 64 --languages 3 --clients 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.room_manager import RoomManager
+from app.services.shared_resources import SharedResources
+from app.services.translators.translator import ITranslator, TranslatorType
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from app.services.web_socket_connection import WebSocketConnection
+
+
+class FakeTranslator(ITranslator):
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def translate_text(self, text: str, language_code: str) -> str:
+        await asyncio.sleep(self.latency)
+        return f"[{language_code}] {text}"
+
+
+class FakeTextToSpeech:
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def text_to_speech(self, text: str, language_code: str) -> str:
+        await asyncio.sleep(self.latency)
+        return "QUJD"
+
+
+class FakeWebSocket:
+    def __init__(self, latencies: list, index: int):
+        self.client = ("127.0.0.1", index)
+        self.latencies = latencies
+
+    async def send_text(self, text: str):
+        sent_at = float(text.rsplit("@", 1)[1].split('"', 1)[0])
+        self.latencies.append(time.perf_counter() - sent_at)
+
+    async def close(self):
+        pass
+
+
+async def measure_loop_lag(lags: list, stop: asyncio.Event, interval: float = 0.01):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run(room_count: int, args) -> dict:
+    RoomManager._instance = None
+    resources = SharedResources(
+        translator_type=TranslatorType.OPENAI,
+        tts=FakeTextToSpeech(args.tts_latency),
+        translator_factory=lambda: FakeTranslator(args.translation_latency),
+        tts_cache_size=0
+    )
+    manager = RoomManager(resources=resources, max_rooms=room_count + 1)
+
+    latencies, lags = [], []
+    pushed = 0
+    rooms = [manager.create_room(f"room-{i}") for i in range(room_count)]
+    for room in rooms:
+        for lang_index in range(args.languages):
+            ws_broadcast_manager = WebSocketBroadcastManager()
+            await room.add_language(f"l{lang_index}", ws_broadcast_manager)
+            for client_index in range(args.clients):
+                connection = WebSocketConnection(FakeWebSocket(latencies, client_index),
+                                                 disconnect_func=ws_broadcast_manager.remove_client)
+                ws_broadcast_manager.active_clients.add(connection)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lags, stop))
+
+    async def feed(room, offset: float):
+        nonlocal pushed
+        await asyncio.sleep(offset)
+        deadline = time.perf_counter() + args.duration
+        while time.perf_counter() < deadline:
+            # The send time travels inside the text so listeners can measure end-to-end latency
+            await room.segmenter.push(f"A sentence long enough to pass the segmenter @{time.perf_counter()}")
+            pushed += 1
+            await asyncio.sleep(args.interval)
+
+    await asyncio.gather(*(feed(room, args.interval * i / room_count) for i, room in enumerate(rooms)))
+    for room in rooms:
+        await room.pipeline.drain()
+    await asyncio.sleep(args.settle)
+
+    stop.set()
+    await lag_task
+    for room in rooms:
+        await room.stop_working_tasks()
+
+    expected = pushed * args.languages * args.clients
+    latencies.sort()
+    return {
+        "rooms": room_count,
+        "delivered": len(latencies) / max(expected, 1),
+        "p50": statistics.median(latencies) if latencies else float("nan"),
+        "p95": latencies[int(len(latencies) * 0.95)] if latencies else float("nan"),
+        "loop_lag_max": max(lags) if lags else 0.0,
+    }
+
+
+async def main(args):
+    print(f"{'rooms':>6} {'delivered':>10} {'p50 s':>8} {'p95 s':>8} {'loop lag max s':>15}  sustained")
+    for room_count in args.rooms:
+        result = await run(room_count, args)
+        sustained = result["delivered"] >= 0.99 and result["p95"] <= args.budget
+        print(f"{result['rooms']:>6} {result['delivered']:>10.1%} {result['p50']:>8.2f} {result['p95']:>8.2f} "
+              f"{result['loop_lag_max']:>15.3f}  {'yes' if sustained else 'no'}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rooms", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--languages", type=int, default=3)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between finals per room")
+    parser.add_argument("--settle", type=float, default=3.0, help="seconds to wait for queued broadcasts")
+    parser.add_argument("--translation-latency", type=float, default=0.4)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--budget", type=float, default=3.0, help="p95 latency budget in seconds")
+    logging.disable(logging.INFO)
+    asyncio.run(main(parser.parse_args()))
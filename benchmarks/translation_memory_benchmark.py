@@ -0,0 +1,131 @@
+"""
+Hit rates and lookup latency of the translation memory with ``--entries`` stored segments.
+
+Fills a ``TranslationMemory`` with synthetic sentences (words built from common English
+syllables, so character n-grams overlap like in real text), then looks up several kinds of
+queries and reports the share answered from memory, the share for which a reference translation
+would be given to the translator, and the lookup latency:
+
+- repeat: a stored sentence with different case and punctuation (should hit);
+- filler: a stored sentence with a filler word ("so", "um", ...) added (should hit);
+- content: a stored sentence with one word inserted, dropped or replaced (must miss, a hit here
+  is a wrong translation; should mostly get a reference);
+- negation: a stored sentence with "not" added (must miss);
+- number: a stored sentence with a number changed (must miss);
+- new: an unrelated sentence (must miss).
+
+    python -m benchmarks.translation_memory_benchmark --entries 100000 --threshold 0.85
+"""
+import argparse
+import gc
+import logging
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.translators.translation_memory import TranslationMemory
+
+SYLLABLES = ["ta", "ri", "on", "en", "er", "an", "in", "st", "pro", "con", "ment", "tion", "ing", "the", "re",
+             "de", "com", "pla", "ver", "sa", "lo", "mi", "ca", "ter", "al", "ous", "ble", "sh", "ch", "qu"]
+
+
+def make_vocabulary(rng: random.Random, size: int) -> list:
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 4))))
+    return sorted(words)
+
+
+def make_sentence(rng: random.Random, vocabulary: list) -> list:
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(8, 16))]
+    words.insert(rng.randrange(len(words)), str(rng.randint(2, 99)))
+    return words
+
+
+def vary(rng: random.Random, words: list, vocabulary: list) -> list:
+    words = list(words)
+    edit = rng.choice(("insert", "drop", "replace"))
+    position = rng.randrange(len(words))
+    if words[position].isdigit():
+        position = (position + 1) % len(words)
+    if edit == "insert":
+        words.insert(position, rng.choice(vocabulary))
+    elif edit == "drop":
+        del words[position]
+    else:
+        words[position] = rng.choice(vocabulary)
+    return words
+
+
+def add_filler(rng: random.Random, words: list) -> list:
+    return [rng.choice(("so", "um", "well"))] + words
+
+
+def negate(rng: random.Random, words: list) -> list:
+    words = list(words)
+    words.insert(rng.randrange(1, len(words)), "not")
+    return words
+
+
+def change_number(words: list) -> list:
+    return [str(int(word) + 1) if word.isdigit() else word for word in words]
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    sentences = [make_sentence(rng, vocabulary) for _ in range(args.entries)]
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    memory = TranslationMemory(max_entries=args.entries, threshold=args.threshold, num_perm=args.num_perm,
+                               bands=args.bands)
+    for words in sentences:
+        memory.add(" ".join(words), "fr", "[fr] " + " ".join(words))
+    build_seconds = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{args.entries} entries added in {build_seconds:.1f}s "
+          f"({build_seconds / args.entries * 1e6:.0f} us each), {allocated / args.entries:.0f} bytes per entry")
+    print(f"{'query':>10} {'hit rate':>9} {'reference':>10} {'p50 us':>8} {'p99 us':>8}")
+
+    stored = rng.sample(sentences, args.queries)
+    queries = {
+        "repeat": [" ".join(words).upper() + "." for words in stored],
+        "filler": [" ".join(add_filler(rng, words)) for words in stored],
+        "content": [" ".join(vary(rng, words, vocabulary)) for words in stored],
+        "negation": [" ".join(negate(rng, words)) for words in stored],
+        "number": [" ".join(change_number(words)) for words in stored],
+        "new": [" ".join(make_sentence(rng, vocabulary)) for _ in range(args.queries)],
+    }
+    for kind, texts in queries.items():
+        hits, references, durations = 0, 0, []
+        for text in texts:
+            lookup_started = time.perf_counter()
+            hit = memory.lookup(text, "fr") is not None
+            durations.append(time.perf_counter() - lookup_started)
+            hits += hit
+            references += not hit and memory.reference(text, "fr") is not None
+        durations.sort()
+        print(f"{kind:>10} {hits / len(texts):>9.1%} {references / len(texts):>10.1%} "
+              f"{statistics.median(durations) * 1e6:>8.0f} {durations[int(len(durations) * 0.99)] * 1e6:>8.0f}")
+    print(f"matches rejected for differing words: {memory.stats['rejected_differences']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=8)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    logging.disable(logging.INFO)
+    main(parser.parse_args())
@@ -0,0 +1,72 @@
+"""
+How much audio does the voice activity gate keep from the ASR, and what does it cost?
+
+Generates a synthetic talk: bursts of voiced sound (harmonics with vibrato and a syllable
+rhythm) separated by pauses of background noise, in 100 ms PCM16 chunks like the microphone
+source. Reports the
+fraction of audio suppressed, how many speech chunks were forwarded, and the CPU time the
+gate spends per second of audio.
+
+    python -m benchmarks.vad_benchmark --minutes 10 --speech-ratio 0.5
+"""
+import argparse
+import os
+
+import numpy as np
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.transcribers.voice_activity_gate import VoiceActivityGate
+
+CHUNK_SECONDS = 0.1
+
+
+def synthetic_talk(sample_rate: int, minutes: float, speech_ratio: float, noise_db: float, seed: int = 1):
+    """Chunks of the talk and, for each chunk, whether it contains speech."""
+    rng = np.random.default_rng(seed)
+    chunk_samples = int(sample_rate * CHUNK_SECONDS)
+    total_chunks = int(minutes * 60 / CHUNK_SECONDS)
+    noise_amplitude = 10 ** (noise_db / 20)
+
+    labels = []
+    while len(labels) < total_chunks:
+        speech = rng.random() < speech_ratio
+        labels.extend([speech] * int(rng.integers(5, 40)))  # 0.5 to 4 s segments
+    labels = labels[:total_chunks]
+
+    t = np.arange(chunk_samples) / sample_rate
+    chunks = []
+    for index, speech in enumerate(labels):
+        signal = rng.normal(0, noise_amplitude, chunk_samples)
+        if speech:
+            pitch = 120 + 30 * np.sin(index / 3)
+            absolute_t = t + index * CHUNK_SECONDS
+            syllables = 0.2 + 0.8 * np.abs(np.sin(2 * np.pi * 2.5 * absolute_t))
+            for harmonic in range(1, 6):
+                signal += 0.3 / harmonic * syllables * np.sin(2 * np.pi * pitch * harmonic * absolute_t)
+        chunks.append((np.clip(signal, -1, 1) * 32767).astype(np.int16).tobytes())
+    return chunks, labels
+
+
+def main(args):
+    chunks, labels = synthetic_talk(args.sample_rate, args.minutes, args.speech_ratio, args.noise_db)
+    gate = VoiceActivityGate(lambda sample_rate: iter(chunks))
+    forwarded = {id(chunk) for chunk in gate(args.sample_rate)}
+
+    speech_chunks = [chunk for chunk, speech in zip(chunks, labels) if speech]
+    kept_speech = sum(id(chunk) in forwarded for chunk in speech_chunks)
+    stats = gate.get_stats()
+    print(f"audio: {stats['audio_seconds_in']:.0f} s, speech: {len(speech_chunks) * CHUNK_SECONDS:.0f} s")
+    print(f"suppressed: {stats['suppressed_fraction']:.1%} of the audio, "
+          f"speech chunks forwarded: {kept_speech}/{len(speech_chunks)}")
+    print(f"cpu cost: {stats['cpu_ms_per_audio_second']:.3f} ms per second of audio, "
+          f"noise floor {stats['noise_floor_db']} dBFS")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--speech-ratio", type=float, default=0.5)
+    parser.add_argument("--noise-db", type=float, default=-60.0)
+    parser.add_argument("--sample-rate", type=int, default=16_000)
+    main(parser.parse_args())
@@ -0,0 +1,45 @@
+"""
+Chunk indices of the audio ring buffer, for audio still kept and audio already evicted.
+"""
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.transcribers.audio_ring_buffer import AudioRingBuffer
+
+CHUNK = 100
+
+
+def filled_ring(kept_chunks: int, appended: int) -> AudioRingBuffer:
+    ring = AudioRingBuffer(kept_chunks * CHUNK)
+    for i in range(appended):
+        ring.append(bytes([i]) * CHUNK)
+    return ring
+
+
+def test_index_at_kept_audio():
+    ring = filled_ring(5, 20)
+
+    assert ring.index_at(17 * CHUNK) == 17
+    assert ring.index_at(17 * CHUNK + 50) == 17
+    assert ring.index_at(20 * CHUNK) == 20
+    assert [index for index, _, _ in ring.since(18)] == [18, 19]
+
+
+def test_index_at_evicted_audio_is_the_real_index():
+    ring = filled_ring(5, 20)
+
+    assert ring.index_at(2 * CHUNK) == 2
+    assert ring.index_at(2 * CHUNK + 50) == 2
+    assert ring.index_at(0) == 0
+    # The backlog starts at the oldest kept chunk, the 13 chunks before it are lost
+    assert ring.since(2)[0][0] - 2 == 13
+
+
+def test_offsets_restart_after_clear():
+    ring = filled_ring(5, 3)
+    ring.clear()
+    ring.append(bytes(CHUNK))
+
+    assert ring.since(0) == [(0, 0, bytes(CHUNK))]
+    assert ring.index_at(0) == 0
@@ -0,0 +1,53 @@
+"""
+Removing a room closes the connections of its listeners.
+"""
+import asyncio
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.room_manager import RoomManager
+from app.services.shared_resources import SharedResources
+from app.services.translators.translator import TranslatorType
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from app.services.web_socket_connection import WebSocketConnection
+from benchmarks.rooms_benchmark import FakeTextToSpeech, FakeTranslator, FakeWebSocket
+
+
+class ClosingWebSocket(FakeWebSocket):
+    closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def test_remove_room_disconnects_the_listeners_of_every_language():
+    async def run():
+        RoomManager._instance = None
+        resources = SharedResources(
+            translator_type=TranslatorType.OPENAI,
+            tts=FakeTextToSpeech(0.0),
+            translator_factory=lambda: FakeTranslator(0.0)
+        )
+        manager = RoomManager(resources=resources)
+        room = manager.create_room("removed")
+        websockets, broadcast_managers = [], []
+        for lang in ("fr", "de"):
+            ws_broadcast_manager = WebSocketBroadcastManager()
+            await room.add_language(lang, ws_broadcast_manager)
+            for index in range(2):
+                websocket = ClosingWebSocket([], index)
+                ws_broadcast_manager.active_clients.add(
+                    WebSocketConnection(websocket, disconnect_func=ws_broadcast_manager.remove_client))
+                websockets.append(websocket)
+            broadcast_managers.append(ws_broadcast_manager)
+
+        removed = await manager.remove_room("removed")
+        RoomManager._instance = None
+        return removed, websockets, broadcast_managers
+
+    removed, websockets, broadcast_managers = asyncio.run(run())
+
+    assert removed
+    assert all(websocket.closed for websocket in websockets)
+    assert not any(manager.active_clients for manager in broadcast_managers)
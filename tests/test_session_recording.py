@@ -0,0 +1,48 @@
+import asyncio
+import base64
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+import pytest
+
+from app.services.recording.session_log import LOG_SUFFIX
+from app.services.recording.session_recorder import SessionRecorder
+from app.services.recording.session_replay import SessionReplay
+
+AUDIO = base64.b64encode(b"\x01\x02" * 100).decode("utf-8")
+
+
+def test_recorded_session_replays_with_text_and_audio(tmp_path):
+    path = str(tmp_path / "room-session")
+
+    async def run():
+        recorder = SessionRecorder(path, flush_interval=0.01)
+        await recorder.open()
+        recorder.record_utterance(0, "hello")
+        recorder.record_translation({"seq": 0, "lang": "fr", "translated_text": "bonjour", "audio_content": AUDIO})
+        recorder.record_translation({"seq": 0, "lang": "de", "translated_text": "hallo", "audio_content": AUDIO})
+        await recorder.close()
+
+        replayed = []
+
+        async def broadcast(message: dict):
+            replayed.append(message)
+
+        count = await SessionReplay(path).play(broadcast, speed=0, languages={"fr"})
+        return count, replayed
+
+    count, replayed = asyncio.run(run())
+
+    assert count == 1
+    assert replayed == [{"replay": "room-session", "seq": 0, "lang": "fr", "original_text": "hello",
+                         "translated_text": "bonjour", "audio_content": AUDIO}]
+
+
+def test_missing_and_invalid_recordings_are_reported_on_open(tmp_path):
+    (tmp_path / ("invalid" + LOG_SUFFIX)).write_bytes(b"not a session recording")
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(SessionReplay(str(tmp_path / "missing")).open())
+    with pytest.raises(ValueError):
+        asyncio.run(SessionReplay(str(tmp_path / "invalid")).open())
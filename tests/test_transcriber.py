@@ -0,0 +1,158 @@
+"""
+Transcriber run lifecycle against a fake realtime client that never blocks.
+"""
+import asyncio
+import os
+import time
+import uuid
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+import assemblyai as aai
+import pytest
+
+from app.services.transcribers.transcriber import Transcriber, TranscriberState
+
+CHUNK = bytes(3200)
+
+
+class FakeRealtimeTranscriber:
+    instances = []
+
+    def __init__(self, sample_rate, on_data, on_error, on_open, on_close, **kwargs):
+        self.on_open = on_open
+        self.on_close = on_close
+        self.chunks = 0
+        self.closed = False
+        FakeRealtimeTranscriber.instances.append(self)
+
+    def connect(self, timeout=10.0):
+        self.on_open(aai.RealtimeSessionOpened(session_id=uuid.uuid4(), expires_at="2024-01-01T00:00:00"))
+
+    def stream(self, data):
+        self.chunks += 1
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.on_close()
+
+
+@pytest.fixture(autouse=True)
+def fake_realtime(monkeypatch):
+    FakeRealtimeTranscriber.instances = []
+    monkeypatch.setattr(aai, "RealtimeTranscriber", FakeRealtimeTranscriber)
+
+
+def finite_source(chunks: int, error: Exception = None):
+    def source(sample_rate: int):
+        for _ in range(chunks):
+            time.sleep(0.01)
+            yield CHUNK
+        if error is not None:
+            raise error
+    return source
+
+
+def endless_source(sample_rate: int):
+    while True:
+        time.sleep(0.01)
+        yield CHUNK
+
+
+async def wait_for_thread(transcriber: Transcriber, timeout: float = 5.0):
+    thread = transcriber.transcription_thread
+    deadline = time.monotonic() + timeout
+    while thread.is_alive() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    assert not thread.is_alive()
+
+
+def test_source_error_closes_the_session_and_reports_error():
+    async def run():
+        transcriber = Transcriber(audio_source=finite_source(5, RuntimeError("device unplugged")))
+        await transcriber.start()
+        await wait_for_thread(transcriber)
+        return transcriber
+
+    transcriber = asyncio.run(run())
+
+    assert transcriber.status == TranscriberState.ERROR
+    assert not transcriber.running
+    assert transcriber.transcriber is None
+    [session] = FakeRealtimeTranscriber.instances
+    assert session.closed and session.chunks == 5
+
+
+def test_source_end_closes_the_session_and_reports_stopped():
+    async def run():
+        transcriber = Transcriber(audio_source=finite_source(5))
+        await transcriber.start()
+        await wait_for_thread(transcriber)
+        return transcriber
+
+    transcriber = asyncio.run(run())
+
+    assert transcriber.status == TranscriberState.STOPPED
+    assert not transcriber.running
+    assert transcriber.transcriber is None
+    assert all(session.closed for session in FakeRealtimeTranscriber.instances)
+    # Closing the session on purpose is not a lost session
+    assert transcriber.stats["reconnect_attempts"] == 0
+
+
+def test_restart_after_source_end_does_not_leak_a_session():
+    async def run():
+        transcriber = Transcriber(audio_source=finite_source(3))
+        await transcriber.start()
+        await wait_for_thread(transcriber)
+        transcriber.audio_source = endless_source
+        await transcriber.start()
+        status = transcriber.status
+        await transcriber.stop()
+        return status
+
+    assert asyncio.run(run()) == TranscriberState.RUNNING
+    first, second = FakeRealtimeTranscriber.instances
+    assert first.closed and second.closed
+
+
+def test_no_reconnect_once_the_streaming_thread_is_gone():
+    async def run():
+        transcriber = Transcriber(audio_source=endless_source, reconnect_base_delay=0.01)
+        await transcriber.start()
+        await asyncio.sleep(0.05)
+        # The streaming thread dies without the exit path, then the server closes the idle session
+        transcriber.running = False
+        await wait_for_thread(transcriber)
+        transcriber.running = True
+        FakeRealtimeTranscriber.instances[0].close()
+        await asyncio.sleep(0.1)
+        return transcriber
+
+    transcriber = asyncio.run(run())
+
+    assert len(FakeRealtimeTranscriber.instances) == 1
+    assert transcriber.stats["reconnect_attempts"] == 0
+    assert transcriber.status != TranscriberState.RECONNECTING
+
+
+def test_lost_session_is_reopened_with_unfinalized_audio():
+    async def run():
+        transcriber = Transcriber(audio_source=endless_source, reconnect_base_delay=0.01)
+        await transcriber.start()
+        await asyncio.sleep(0.1)
+        FakeRealtimeTranscriber.instances[0].close()
+        await asyncio.sleep(0.2)
+        status = transcriber.status
+        await transcriber.stop()
+        return transcriber, status
+
+    transcriber, status = asyncio.run(run())
+
+    assert status == TranscriberState.RUNNING
+    assert transcriber.stats["reconnects"] == 1
+    first, second = FakeRealtimeTranscriber.instances
+    # Nothing was finalized, so everything the first session received is sent again
+    assert second.chunks >= first.chunks
+    assert first.closed and second.closed
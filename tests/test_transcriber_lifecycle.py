@@ -0,0 +1,80 @@
+"""
+Starting and stopping a room must not stall the event loop.
+
+The AssemblyAI client is replaced by the blocking fake of ``benchmarks.restart_stall_check``,
+so a connect or close called on the loop thread shows up as loop lag.
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+import assemblyai as aai
+
+from app.services.room_manager import RoomManager
+from app.services.shared_resources import SharedResources
+from app.services.transcribers.transcriber import TranscriberState
+from app.services.transcribers.voice_activity_gate import VoiceActivityGate
+from app.services.translators.translator import TranslatorType
+from app.services.web_socket_broadcast_manager import WebSocketBroadcastManager
+from benchmarks.restart_stall_check import BlockingRealtimeTranscriber, realtime_audio_source
+from benchmarks.rooms_benchmark import FakeTextToSpeech, FakeTranslator, measure_loop_lag
+
+MAX_LOOP_LAG = 0.05
+CYCLES = 2
+RUN_TIME = 0.5
+
+
+class FastBlockingRealtimeTranscriber(BlockingRealtimeTranscriber):
+    connect_delay = 0.3
+    close_delay = 0.3
+
+
+async def restart_room(audio_source) -> tuple:
+    RoomManager._instance = None
+    resources = SharedResources(
+        translator_type=TranslatorType.OPENAI,
+        tts=FakeTextToSpeech(0.05),
+        translator_factory=lambda: FakeTranslator(0.05)
+    )
+    room = RoomManager(resources=resources).create_room("lifecycle-test")
+    room.transcriber.audio_source = audio_source
+
+    lags, states, stop_seconds = [], [], []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(lags, stop))
+    for _ in range(CYCLES):
+        await room.add_language("fr", WebSocketBroadcastManager())
+        await room.start_working_tasks()
+        states.append(room.transcriber.status)
+        await asyncio.sleep(RUN_TIME)
+        started = time.perf_counter()
+        await room.stop_working_tasks()
+        stop_seconds.append(time.perf_counter() - started)
+        states.append(room.transcriber.status)
+    stop.set()
+    await lag_task
+    RoomManager._instance = None
+    return max(lags), states, max(stop_seconds)
+
+
+def test_start_stop_does_not_stall_the_loop(monkeypatch):
+    monkeypatch.setattr(aai, "RealtimeTranscriber", FastBlockingRealtimeTranscriber)
+
+    worst_lag, states, _ = asyncio.run(restart_room(realtime_audio_source))
+
+    assert states == [TranscriberState.RUNNING, TranscriberState.STOPPED] * CYCLES
+    assert worst_lag <= MAX_LOOP_LAG, f"event loop lagged {worst_lag * 1000:.0f} ms during start/stop"
+
+
+def test_stop_during_silence_does_not_wait_for_audio(monkeypatch):
+    monkeypatch.setattr(aai, "RealtimeTranscriber", FastBlockingRealtimeTranscriber)
+
+    # The source is all silence, so the gate never yields a chunk
+    worst_lag, states, slowest_stop = asyncio.run(restart_room(VoiceActivityGate(realtime_audio_source)))
+
+    assert states == [TranscriberState.RUNNING, TranscriberState.STOPPED] * CYCLES
+    assert worst_lag <= MAX_LOOP_LAG, f"event loop lagged {worst_lag * 1000:.0f} ms during start/stop"
+    # Closing the fake session takes close_delay, the streaming thread must not add its stop timeout
+    assert slowest_stop < FastBlockingRealtimeTranscriber.close_delay + 1.0
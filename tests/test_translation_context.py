@@ -0,0 +1,27 @@
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.translators.translation_context import TranslationContext
+
+
+class WordCounter:
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def test_context_is_trimmed_to_half_the_budget_by_default():
+    context = TranslationContext(max_tokens=20, token_counter=WordCounter())
+    for i in range(11):
+        context.add_sentence(f"sentence number {i}")
+
+    assert context.context_tokens == 9
+    assert [sentence.text for sentence in context.sentences][0] == "sentence number 8"
+
+
+def test_cache_floor_is_opt_in():
+    assert TranslationContext(max_tokens=1200, token_counter=WordCounter()).trim_to_tokens == 600
+
+    context = TranslationContext(max_tokens=1200, token_counter=WordCounter(), cache_floor=True)
+
+    assert context.trim_to_tokens + context.system_tokens == TranslationContext.PROMPT_CACHE_MIN_TOKENS
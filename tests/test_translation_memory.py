@@ -0,0 +1,75 @@
+import json
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.translators.translation_memory import TranslationMemory, glossary_segments, read_glossary
+
+SOURCE = "We can start the meeting at ten o'clock this morning"
+TARGET = "Nous pouvons commencer la réunion à dix heures ce matin"
+
+
+def memory() -> TranslationMemory:
+    translation_memory = TranslationMemory(max_entries=100)
+    translation_memory.add(SOURCE, "fr", TARGET)
+    return translation_memory
+
+
+def test_exact_and_filler_variants_reuse_the_translation():
+    translation_memory = memory()
+
+    assert translation_memory.lookup("we can START the meeting at ten o'clock this morning!", "fr") == TARGET
+    assert translation_memory.lookup("So, um, we can start the meeting at ten o'clock this morning", "fr") == TARGET
+
+
+def test_meaning_changes_are_only_offered_as_reference():
+    translation_memory = memory()
+
+    for text in ("We can't start the meeting at ten o'clock this morning",
+                 "We can not start the meeting at ten o'clock this morning",
+                 "We can start the meeting at nine o'clock this morning"):
+        assert translation_memory.lookup(text, "fr") is None
+        assert translation_memory.reference(text, "fr") == (
+            "we can start the meeting at ten o clock this morning", TARGET)
+
+
+def test_languages_do_not_mix_and_oldest_entries_are_evicted():
+    translation_memory = TranslationMemory(max_entries=2)
+    translation_memory.add("first sentence", "fr", "première phrase")
+    translation_memory.add("second sentence", "fr", "deuxième phrase")
+    translation_memory.add("third sentence", "fr", "troisième phrase")
+
+    assert translation_memory.lookup("first sentence", "fr") is None
+    assert translation_memory.lookup("third sentence", "fr") == "troisième phrase"
+    assert translation_memory.lookup("third sentence", "de") is None
+
+
+def test_glossary_only_memory_keeps_the_glossary_and_learns_nothing(tmp_path):
+    path = tmp_path / "glossary.json"
+    path.write_text(json.dumps({"fr": {"terms": {"keynote": "conférence principale"},
+                                       "segments": {SOURCE: TARGET, "As I said earlier,": "Comme je l'ai dit,"}}}),
+                    encoding="utf-8")
+    glossary = read_glossary(str(path))
+    translation_memory = TranslationMemory(max_entries=glossary_segments(glossary))
+    translation_memory.load_glossary(str(path), glossary)
+    translation_memory.add("first sentence", "fr", "première phrase")
+
+    assert translation_memory.lookup(SOURCE, "fr") == TARGET
+    assert translation_memory.lookup("as i said earlier", "fr") == "Comme je l'ai dit,"
+    assert translation_memory.lookup("first sentence", "fr") is None
+    assert translation_memory.terms_in("The keynote starts now", "fr") == {"keynote": "conférence principale"}
+
+
+def test_reference_after_a_missed_lookup_reuses_the_signature(monkeypatch):
+    translation_memory = memory()
+    computed = []
+    compute_signature = translation_memory._compute_signature
+    monkeypatch.setattr(translation_memory, "_compute_signature",
+                        lambda key: computed.append(key) or compute_signature(key))
+    text = "We can't start the meeting at ten o'clock this morning"
+
+    assert translation_memory.lookup(text, "fr") is None
+    assert translation_memory.reference(text, "fr") is not None
+    translation_memory.add(text, "fr", "Nous ne pouvons pas commencer la réunion à dix heures ce matin")
+
+    assert len(computed) == 1
@@ -0,0 +1,59 @@
+import asyncio
+import os
+
+os.environ.setdefault("UVICORN_PORT", "8000")
+
+from app.services.utterance_pipeline import UtterancePipeline
+from app.services.utterance_segmenter import UtteranceSegmenter
+
+# Later utterances finish first
+DELAYS = {0: 0.15, 1: 0.05, 2: 0.1}
+
+
+async def slow_process(lang: str, text: str, seq: int) -> dict:
+    await asyncio.sleep(DELAYS[seq])
+    if text == "fail":
+        raise RuntimeError("provider error")
+    return {"seq": seq, "lang": lang, "translated_text": text}
+
+
+def test_messages_and_completions_are_released_in_speech_order():
+    async def run():
+        pipeline = UtterancePipeline(slow_process)
+        released, completed = [], []
+
+        async def release(message: dict):
+            released.append(message["seq"])
+
+        pipeline.add_language("fr", release)
+        for text in ("one", "fail", "three"):
+            await pipeline.submit(text, on_complete=lambda seq, text: completed.append(seq))
+        await pipeline.drain()
+        return released, completed, pipeline.stats
+
+    released, completed, stats = asyncio.run(run())
+
+    # The failed utterance is skipped for the language but does not hold back the next one
+    assert released == [0, 2]
+    assert completed == [0, 1, 2]
+    assert stats["errors"] == 1
+
+
+def test_segmenter_merges_short_finals_and_splits_long_ones():
+    async def run():
+        segments = []
+
+        async def emit(text: str):
+            segments.append(text)
+
+        segmenter = UtteranceSegmenter(emit, merge_window=10, min_chars=25, max_chars=60)
+        await segmenter.push("Good morning")
+        await segmenter.push("everyone, welcome.")
+        await segmenter.push("This first sentence is long enough. And this second one is as well.")
+        await segmenter.flush()
+        return segments
+
+    segments = asyncio.run(run())
+
+    assert segments[0] == "Good morning everyone, welcome."
+    assert segments[1:] == ["This first sentence is long enough.", "And this second one is as well."]